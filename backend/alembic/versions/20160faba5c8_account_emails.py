@@ -0,0 +1,67 @@
+"""account_emails registry
+
+Revision ID: 20160faba5c8
+Revises: 155b58d12c01
+Create Date: 2026-10-18 09:12:40.118264
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "20160faba5c8"
+down_revision: Union[str, None] = "155b58d12c01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+usertype = postgresql.ENUM(
+    "ADMIN", "USER", "ORGANIZATION", "ORG_MEMBER", name="usertype", create_type=False
+)
+
+
+def upgrade() -> None:
+    account_emails = op.create_table(
+        "account_emails",
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("account_type", usertype, nullable=False),
+        sa.Column("account_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.PrimaryKeyConstraint("email"),
+    )
+
+    # Backfill: users first so linked org members keep their user's claim,
+    # then independent org members once per email.
+    bind = op.get_bind()
+    sources = [
+        ("USER", "SELECT id, email FROM users"),
+        ("ORGANIZATION", "SELECT id, email FROM organizations"),
+        ("ADMIN", "SELECT id, email FROM admin"),
+        (
+            "ORG_MEMBER",
+            "SELECT id, email FROM org_members WHERE user_id IS NULL "
+            "ORDER BY joined_at",
+        ),
+    ]
+    claimed: set[str] = set()
+    rows = []
+    for account_type, query in sources:
+        for account_id, email in bind.execute(sa.text(query)):
+            if email in claimed:
+                continue
+            claimed.add(email)
+            rows.append(
+                {
+                    "email": email,
+                    "account_type": account_type,
+                    "account_id": str(account_id),
+                }
+            )
+    if rows:
+        op.bulk_insert(account_emails, rows)
+
+
+def downgrade() -> None:
+    op.drop_table("account_emails")
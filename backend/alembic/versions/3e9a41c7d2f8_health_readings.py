@@ -0,0 +1,46 @@
+"""health readings time series
+
+Revision ID: 3e9a41c7d2f8
+Revises: 8d3f0a6e41b7
+Create Date: 2026-10-18 16:20:51.904317
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3e9a41c7d2f8"
+down_revision: Union[str, None] = "8d3f0a6e41b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+healthmetric = sa.Enum(
+    "HEART_RATE",
+    "BLOOD_GLUCOSE",
+    "BODY_TEMPERATURE",
+    "RESPIRATORY_RATE",
+    name="healthmetric",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "health_readings",
+        sa.Column("user_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("metric", healthmetric, nullable=False),
+        sa.Column("ts", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "metric", "ts"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("health_readings")
+    healthmetric.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,62 @@
+"""keyset pagination indexes
+
+Revision ID: 5b1e7c9a2d40
+Revises: cc8634d74c04
+Create Date: 2026-10-18 14:12:09.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e7c9a2d40"
+down_revision: Union[str, None] = "cc8634d74c04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_org_members_organization_id_joined_at_id",
+        "org_members",
+        ["organization_id", "joined_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_org_members_organization_id_role_joined_at_id",
+        "org_members",
+        ["organization_id", "role", "joined_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_org_members_user_id_joined_at_id",
+        "org_members",
+        ["user_id", "joined_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_org_members_email_joined_at_id",
+        "org_members",
+        ["email", "joined_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_users_assigned_staff_id_id",
+        "users",
+        ["assigned_staff_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_assigned_staff_id_id", table_name="users")
+    op.drop_index("ix_org_members_email_joined_at_id", table_name="org_members")
+    op.drop_index("ix_org_members_user_id_joined_at_id", table_name="org_members")
+    op.drop_index(
+        "ix_org_members_organization_id_role_joined_at_id", table_name="org_members"
+    )
+    op.drop_index(
+        "ix_org_members_organization_id_joined_at_id", table_name="org_members"
+    )
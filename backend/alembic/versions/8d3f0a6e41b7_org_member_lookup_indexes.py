@@ -0,0 +1,41 @@
+"""org member lookup indexes
+
+Revision ID: 8d3f0a6e41b7
+Revises: 5b1e7c9a2d40
+Create Date: 2026-10-18 15:02:44.730182
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3f0a6e41b7"
+down_revision: Union[str, None] = "5b1e7c9a2d40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_org_members_email_organization_id",
+        "org_members",
+        ["email", "organization_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_org_members_user_id_organization_id",
+        "org_members",
+        ["user_id", "organization_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_users_organization_id"), "users", ["organization_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_users_organization_id"), table_name="users")
+    op.drop_index("ix_org_members_user_id_organization_id", table_name="org_members")
+    op.drop_index("ix_org_members_email_organization_id", table_name="org_members")
@@ -0,0 +1,69 @@
+"""health metric rollups
+
+Revision ID: a47c2e5b9f13
+Revises: 3e9a41c7d2f8
+Create Date: 2026-10-18 17:41:26.118530
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a47c2e5b9f13"
+down_revision: Union[str, None] = "3e9a41c7d2f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+healthmetric = postgresql.ENUM(
+    "HEART_RATE",
+    "BLOOD_GLUCOSE",
+    "BODY_TEMPERATURE",
+    "RESPIRATORY_RATE",
+    name="healthmetric",
+    create_type=False,
+)
+rollupresolution = sa.Enum("MINUTE", "HOUR", "DAY", name="rollupresolution")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "health_rollups",
+        sa.Column("user_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("metric", healthmetric, nullable=False),
+        sa.Column("resolution", rollupresolution, nullable=False),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("sum", sa.Float(), nullable=False),
+        sa.Column("min", sa.Float(), nullable=False),
+        sa.Column("max", sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "metric", "resolution", "bucket"),
+    )
+
+    # Backfill from the readings stored so far
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for resolution in ("MINUTE", "HOUR", "DAY"):
+        op.execute(
+            sa.text(
+                "INSERT INTO health_rollups "
+                "(user_id, metric, resolution, bucket, count, sum, min, max) "
+                f"SELECT user_id, metric, '{resolution}', "
+                f"date_trunc('{resolution.lower()}', ts), "
+                "count(*), sum(value), min(value), max(value) "
+                "FROM health_readings "
+                f"GROUP BY user_id, metric, date_trunc('{resolution.lower()}', ts)"
+            )
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("health_rollups")
+    rollupresolution.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,67 @@
+"""health alerts
+
+Revision ID: c5d81f2e7a64
+Revises: a47c2e5b9f13
+Create Date: 2026-10-18 19:02:47.530114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d81f2e7a64"
+down_revision: Union[str, None] = "a47c2e5b9f13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+healthmetric = postgresql.ENUM(
+    "HEART_RATE",
+    "BLOOD_GLUCOSE",
+    "BODY_TEMPERATURE",
+    "RESPIRATORY_RATE",
+    name="healthmetric",
+    create_type=False,
+)
+alertseverity = sa.Enum("WARNING", "CRITICAL", name="alertseverity")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "health_alerts",
+        sa.Column("id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("user_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("rule", sa.String(length=64), nullable=False),
+        sa.Column("metric", healthmetric, nullable=False),
+        sa.Column("severity", alertseverity, nullable=False),
+        sa.Column("message", sa.String(length=255), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        sa.Column("ts", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_health_alerts_active_user_id_created_at",
+        "health_alerts",
+        ["user_id", "created_at"],
+        unique=False,
+        postgresql_where=sa.text("resolved_at IS NULL"),
+        sqlite_where=sa.text("resolved_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_health_alerts_active_user_id_created_at", table_name="health_alerts"
+    )
+    op.drop_table("health_alerts")
+    alertseverity.drop(op.get_bind(), checkfirst=True)
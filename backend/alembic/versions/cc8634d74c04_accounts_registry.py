@@ -0,0 +1,50 @@
+"""accounts identity registry
+
+Revision ID: cc8634d74c04
+Revises: 20160faba5c8
+Create Date: 2026-10-18 10:03:27.502911
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "cc8634d74c04"
+down_revision: Union[str, None] = "20160faba5c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+usertype = postgresql.ENUM(
+    "ADMIN", "USER", "ORGANIZATION", "ORG_MEMBER", name="usertype", create_type=False
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "accounts",
+        sa.Column("id", sa.UUID(as_uuid=False), autoincrement=False, nullable=False),
+        sa.Column("account_type", usertype, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Backfill every existing account
+    for account_type, table in [
+        ("USER", "users"),
+        ("ORG_MEMBER", "org_members"),
+        ("ORGANIZATION", "organizations"),
+        ("ADMIN", "admin"),
+    ]:
+        op.execute(
+            sa.text(
+                f"INSERT INTO accounts (id, account_type) "
+                f"SELECT id, '{account_type}' FROM {table}"
+            )
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("accounts")
@@ -0,0 +1,40 @@
+"""derived fields due date
+
+Revision ID: e1f4b6a9c3d7
+Revises: c5d81f2e7a64
+Create Date: 2026-10-18 20:41:05.318227
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1f4b6a9c3d7"
+down_revision: Union[str, None] = "c5d81f2e7a64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "user_dashboards", sa.Column("derived_due_on", sa.Date(), nullable=True)
+    )
+    op.create_index(
+        "ix_user_dashboards_derived_due_on_id",
+        "user_dashboards",
+        ["derived_due_on", "id"],
+        unique=False,
+    )
+    # Existing bio data is due at the next nightly recompute
+    op.execute(
+        "UPDATE user_dashboards SET derived_due_on = CURRENT_DATE "
+        "WHERE bio_data IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_dashboards_derived_due_on_id", table_name="user_dashboards")
+    op.drop_column("user_dashboards", "derived_due_on")
@@ -0,0 +1,94 @@
+"""org dashboard counts
+
+Revision ID: f3a7d9b2c8e5
+Revises: e1f4b6a9c3d7
+Create Date: 2026-10-18 22:14:36.902418
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a7d9b2c8e5"
+down_revision: Union[str, None] = "e1f4b6a9c3d7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "org_dashboard_counts",
+        sa.Column("organization_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("name", sa.String(length=64), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["organization_id"],
+            ["organizations.id"],
+        ),
+        sa.PrimaryKeyConstraint("organization_id", "name"),
+    )
+    op.create_table(
+        "org_staff_patient_counts",
+        sa.Column("member_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("organization_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("patients", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["member_id"],
+            ["org_members.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["organization_id"],
+            ["organizations.id"],
+        ),
+        sa.PrimaryKeyConstraint("member_id"),
+    )
+    op.create_index(
+        "ix_org_staff_patient_counts_organization_id_patients_member_id",
+        "org_staff_patient_counts",
+        ["organization_id", "patients", "member_id"],
+        unique=False,
+    )
+    # Count what already exists; enums are stored by name
+    op.execute(
+        "INSERT INTO org_dashboard_counts (organization_id, name, count) "
+        "SELECT organization_id, 'staff:' || role, COUNT(*) FROM org_members "
+        "WHERE organization_id IS NOT NULL GROUP BY organization_id, role"
+    )
+    op.execute(
+        "INSERT INTO org_dashboard_counts (organization_id, name, count) "
+        "SELECT organization_id, 'patients', COUNT(*) FROM users "
+        "WHERE organization_id IS NOT NULL GROUP BY organization_id"
+    )
+    op.execute(
+        "INSERT INTO org_dashboard_counts (organization_id, name, count) "
+        "SELECT organization_id, 'patients:unassigned', COUNT(*) FROM users "
+        "WHERE organization_id IS NOT NULL AND assigned_staff_id IS NULL "
+        "GROUP BY organization_id"
+    )
+    op.execute(
+        "INSERT INTO org_dashboard_counts (organization_id, name, count) "
+        "SELECT users.organization_id, 'alerts:' || health_alerts.severity, "
+        "COUNT(*) FROM health_alerts JOIN users ON users.id = health_alerts.user_id "
+        "WHERE health_alerts.resolved_at IS NULL "
+        "AND users.organization_id IS NOT NULL "
+        "GROUP BY users.organization_id, health_alerts.severity"
+    )
+    op.execute(
+        "INSERT INTO org_staff_patient_counts (member_id, organization_id, patients) "
+        "SELECT org_members.id, org_members.organization_id, COUNT(*) FROM users "
+        "JOIN org_members ON org_members.id = users.assigned_staff_id "
+        "WHERE org_members.organization_id IS NOT NULL "
+        "GROUP BY org_members.id, org_members.organization_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_org_staff_patient_counts_organization_id_patients_member_id",
+        table_name="org_staff_patient_counts",
+    )
+    op.drop_table("org_staff_patient_counts")
+    op.drop_table("org_dashboard_counts")
@@ -1,5 +1,5 @@
-from app.api.v1 import router as v1_router
-from fastapi import APIRouter
+"""API package.
 
-router = APIRouter(prefix="/api")
-router.include_router(v1_router)
+Kept free of imports so `app.api.core.config` can be loaded on its own,
+including from `lib`; the router lives in `app.api.router`.
+"""
@@ -1,5 +1,6 @@
 """Core Configuration Settings"""
 
+import os
 from pathlib import Path
 from typing import ClassVar
 
@@ -15,6 +16,66 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int
     PORT: int = 8000
 
+    # Database connection pool
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Redis: "redis" for a server at REDIS_URL, "memory" for an in-process
+    # stand-in
+    REDIS_BACKEND: str = "redis"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_CONNECT_TIMEOUT: float = 0.5
+    REDIS_BREAKER_FAILURES: int = 5
+    REDIS_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Password hashing pool; no PASSWORD_HASH_MAX_PENDING means 16 per worker
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_MAX_PENDING: int | None = None
+
+    # Verified access token cache (per worker)
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_REVALIDATE_SECONDS: float = 30.0
+
+    # Per-worker bloom filter in front of the Redis token blacklist
+    BLACKLIST_FILTER_ENABLED: bool = True
+    BLACKLIST_FILTER_CAPACITY: int = 100000
+    BLACKLIST_FILTER_ERROR_RATE: float = 0.001
+    BLACKLIST_FILTER_MAX_BYTES: int = 1048576
+    BLACKLIST_FILTER_SYNC_SECONDS: float = 5.0
+    BLACKLIST_FILTER_REBUILD_SECONDS: float = 3600.0
+
+    # Organization member import and export
+    ORG_IMPORT_MAX_ROWS: int = 5000
+    ORG_IMPORT_CHUNK_SIZE: int = 500
+    ORG_EXPORT_BATCH_SIZE: int = 1000
+
+    # Health reading ingestion buffer
+    READINGS_BUFFER_MAX_ROWS: int = 50000
+    READINGS_BUFFER_FLUSH_ROWS: int = 1000
+    READINGS_BUFFER_FLUSH_SECONDS: float = 1.0
+    READINGS_BUFFER_MAX_ATTEMPTS: int = 3
+
+    # Health alerts; a user's EWMA baseline needs ALERT_BASELINE_MIN_READINGS
+    # readings before deviation rules use it
+    ALERT_COOLDOWN_SECONDS: int = 900
+    ALERT_BASELINE_MIN_READINGS: int = 10
+    ALERT_STATE_TTL_SECONDS: int = 86400
+    ALERT_EWMA_ALPHA: float = 0.1
+
+    # Nightly derived bio data fields job
+    DERIVED_FIELDS_CHUNK_SIZE: int = 1000
+    DERIVED_FIELDS_JOB_HOUR: int = 2
+
+    # Organization dashboard
+    ORG_DASHBOARD_BUSIEST_STAFF: int = 10
+
     model_config: ClassVar[SettingsConfigDict] = {
         "env_file": str(Path(__file__).resolve().parents[2] / ".env"),
         "env_file_encoding": "utf-8",
@@ -1,27 +1,50 @@
+from app.api.core.dependencies.security import user_oauth2_scheme
 from app.api.v1.auth.crud import get_user_by_id, get_user_by_id_and_type
 from app.api.v1.auth.models.user import User
+from fastapi import Depends
 from lib.errorlib.auth import TokenException, UserNotAuthorizedException
-from lib.utils.user import get_current_user
-from sqlalchemy.orm import Session
+from lib.utils.user import TokenClaims, get_current_user
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-def get_current_user_from_db(token: str, db: Session) -> tuple[User, str]:
+async def get_current_user_from_db(token: str, db: AsyncSession) -> tuple[User, str]:
     """Fetch the current user from the db using the provided user data."""
     credentials_exception = TokenException(401, "Invalid or expired token.")
     user_exception = UserNotAuthorizedException()
 
     if not isinstance(token, str) or not token:
         raise credentials_exception
-    user_data = get_current_user(token, credentials_exception)
-    user_id = user_data["id"]
-    user_type = user_data.get("user_type")
+    claims = await get_current_user(token, credentials_exception)
 
-    if user_type:
-        db_user = get_user_by_id_and_type(db, user_id, user_type)
+    if claims.user_type:
+        db_user = await get_user_by_id_and_type(db, claims.sub, claims.user_type.value)
     else:
-        db_user = get_user_by_id(db, user_id)
+        db_user = await get_user_by_id(db, claims.sub)
 
     if not db_user:
         raise user_exception
 
     return db_user, str(db_user.email)
+
+
+async def get_token_claims(token: str = Depends(user_oauth2_scheme)) -> TokenClaims:
+    """Verified token claims, without touching the database."""
+    return await get_current_user(
+        token, TokenException(401, "Invalid or expired token.")
+    )
+
+
+def require_roles(*roles: str):
+    """Dependency allowing only tokens whose role claim is one of `roles`.
+
+    Authorization is decided from the token alone, with no database lookup.
+    """
+
+    async def dependency(
+        claims: TokenClaims = Depends(get_token_claims),
+    ) -> TokenClaims:
+        if claims.role not in roles:
+            raise UserNotAuthorizedException()
+        return claims
+
+    return dependency
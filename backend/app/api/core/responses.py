@@ -0,0 +1,22 @@
+"""JSON responses rendered with orjson"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(ORJSONResponse):
+    """orjson response that also accepts an already validated Pydantic model.
+
+    Returning one of these from a route skips FastAPI's `response_model`
+    validation and `jsonable_encoder` pass: the model is dumped once and
+    encoded straight to bytes. `response_model` is still used for the
+    OpenAPI schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = content.model_dump()
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,101 @@
+"""Connection pool configuration and instrumentation"""
+
+import time
+
+from app.api.core.config import settings
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout counters for one connection pool"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.connections_opened = 0
+
+    def record_checkout(self, waited: float, timed_out: bool = False) -> None:
+        """Record how long a caller waited for a connection"""
+        if timed_out:
+            self.checkout_timeouts += 1
+        else:
+            self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def snapshot(self, pool: QueuePool) -> dict:
+        """Current pool state plus accumulated counters"""
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "connections_opened": self.connections_opened,
+            "wait_ms_avg": (
+                self.wait_seconds_total / self.checkouts * 1000
+                if self.checkouts
+                else 0.0
+            ),
+            "wait_ms_max": self.wait_seconds_max * 1000,
+        }
+
+
+class _InstrumentedPoolMixin:
+    """Time every checkout and count checkout timeouts"""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except sa_exc.TimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool for the sync engine"""
+
+    metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """QueuePool for the async engine"""
+
+    metrics = PoolMetrics()
+
+
+def engine_options(poolclass: type[QueuePool]) -> dict:
+    """Keyword arguments for create_engine/create_async_engine from Settings"""
+    return {
+        "echo": settings.DB_ECHO,
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_engine(engine) -> None:
+    """Count new DBAPI connections opened by an engine's pool"""
+    metrics = engine.pool.metrics
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(*_):
+        metrics.connections_opened += 1
+
+
+def pool_stats(engine) -> dict:
+    """Metrics snapshot for an engine's pool"""
+    return engine.pool.metrics.snapshot(engine.pool)
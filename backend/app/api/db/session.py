@@ -2,8 +2,16 @@
 
 import os
 
+from app.api.db.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    engine_options,
+    instrument_engine,
+)
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 load_dotenv()
@@ -12,11 +20,46 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     raise ValueError("DATABASE_URL environment variable is not set")
 
-engine = create_engine(DATABASE_URL, echo=True)
+# asyncio DBAPI driver used for each supported database backend
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a database URL for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    driver = ASYNC_DRIVERS.get(backend)
+    if driver is None:
+        raise ValueError(f"No async driver configured for database '{backend}'")
+    return parsed.set(drivername=f"{backend}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+# Sync engine: migrations, scripts and anything running outside the event loop
+engine = create_engine(DATABASE_URL, **engine_options(InstrumentedQueuePool))
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine: request handlers
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **engine_options(InstrumentedAsyncQueuePool)
+)
+instrument_engine(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
-# For FastAPI routes
 def get_db():
     """get Database method"""
     db = SessionLocal()
@@ -24,3 +67,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# For FastAPI routes
+async def get_async_db():
+    """get async Database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,8 +1,16 @@
 from app.api.v1.auth.routes.auth import router as auth_router
+from app.api.v1.auth.routes.organization.members import router as org_members_router
+from app.api.v1.auth.routes.user.memberships import router as user_memberships_router
 from app.api.v1.auth.routes.user.profile import router as user_profile_router
+from app.api.v1.dashboards.routes.org_dashboard import router as org_dashboard_router
+from app.api.v1.dashboards.routes.user_dashboard import router as user_dashboard_router
 from fastapi import APIRouter
 
 router = APIRouter(prefix="/v1")
 
 router.include_router(auth_router)
+router.include_router(org_members_router)
+router.include_router(user_memberships_router)
 router.include_router(user_profile_router)
+router.include_router(user_dashboard_router)
+router.include_router(org_dashboard_router)
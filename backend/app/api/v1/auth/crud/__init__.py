@@ -2,21 +2,63 @@
 
 from .admin import create_admin as create_admin
 from .admin import get_admin_by_email as get_admin_by_email
+from .auth import commit_new_account as commit_new_account
+from .auth import get_account_email as get_account_email
 from .auth import get_user_by_id as get_user_by_id
 from .auth import get_user_by_id_and_type as get_user_by_id_and_type
+from .auth import move_email_claim as move_email_claim
+from .auth import register_identity as register_identity
+from .auth import remove_identity as remove_identity
+from .org_dashboard import count_active_alerts as count_active_alerts
+from .org_dashboard import count_alerts as count_alerts
+from .org_dashboard import get_busiest_staff as get_busiest_staff
+from .org_dashboard import get_org_counts as get_org_counts
+from .org_dashboard import rebuild_org_counts as rebuild_org_counts
 from .organization import (
     create_organization_with_email as create_organization_with_email,
 )
 from .organization import get_organization_by_email as get_organization_by_email
 from .staff import add_existing_user_to_org as add_existing_user_to_org
+from .staff import assign_patient as assign_patient
+from .staff import bulk_create_org_members as bulk_create_org_members
 from .staff import create_org_member_directly as create_org_member_directly
 from .staff import create_user_and_add_to_org as create_user_and_add_to_org
+from .staff import get_assigned_patients_page as get_assigned_patients_page
+from .staff import get_import_email_owners as get_import_email_owners
+from .staff import get_memberships_page as get_memberships_page
 from .staff import get_org_member_by_email as get_org_member_by_email
+from .staff import get_org_member_ids as get_org_member_ids
+from .staff import get_org_members_page as get_org_members_page
+from .staff import (
+    get_org_member_in_organization as get_org_member_in_organization,
+)
 from .staff import get_org_members_by_organization as get_org_members_by_organization
 from .staff import get_user_organizations as get_user_organizations
 from .staff import remove_user_from_org as remove_user_from_org
+from .staff import stream_org_member_export as stream_org_member_export
 from .staff import update_user_role_in_org as update_user_role_in_org
 from .users.user import create_user as create_user
 from .users.user import delete_user as delete_user
 from .users.user import get_user_by_email as get_user_by_email
 from .users.user import update_user as update_user
+from .users.user_dashboard import add_health_alerts as add_health_alerts
+from .users.user_dashboard import append_health_readings as append_health_readings
+from .users.user_dashboard import create_dashboard as create_dashboard
+from .users.user_dashboard import delete_health_data as delete_health_data
+from .users.user_dashboard import fold_health_alerts as fold_health_alerts
+from .users.user_dashboard import get_active_alert_ids as get_active_alert_ids
+from .users.user_dashboard import get_active_alerts as get_active_alerts
+from .users.user_dashboard import get_derived_fields_due as get_derived_fields_due
+from .users.user_dashboard import get_health_readings as get_health_readings
+from .users.user_dashboard import get_latest_readings as get_latest_readings
+from .users.user_dashboard import get_rollup_series as get_rollup_series
+from .users.user_dashboard import get_user_dashboard_by_id as get_user_dashboard_by_id
+from .users.user_dashboard import (
+    get_user_dashboard_by_user_id as get_user_dashboard_by_user_id,
+)
+from .users.user_dashboard import insert_health_readings as insert_health_readings
+from .users.user_dashboard import resolve_health_alert as resolve_health_alert
+from .users.user_dashboard import save_bio_data as save_bio_data
+from .users.user_dashboard import update_derived_fields as update_derived_fields
+from .users.user_dashboard import update_health_metrics as update_health_metrics
+from .users.user_dashboard import upsert_rollups as upsert_rollups
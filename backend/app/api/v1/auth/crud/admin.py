@@ -1,15 +1,18 @@
 """Admin Crud operations for the application."""
 
+from app.api.v1.auth.crud.auth import commit_new_account, register_identity
 from app.api.v1.auth.models.user import Admin
 from lib.errorlib.auth import UserAlreadyExistsException, UserNotFoundException
-from lib.utils.user import hash_password
-from sqlalchemy.orm import Session
+from lib.utils.enums import UserType
+from lib.utils.user import hash_password_async
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-def create_admin(db: Session, **kwargs) -> Admin:
+async def create_admin(db: AsyncSession, **kwargs) -> Admin:
     """Create a single admin (singleton pattern)"""
     # Check if any admin exists
-    existing_admin = db.query(Admin).first()
+    existing_admin = (await db.execute(select(Admin.id).limit(1))).first()
     if existing_admin:
         raise UserAlreadyExistsException("An admin already exists.")
 
@@ -21,22 +24,25 @@ def create_admin(db: Session, **kwargs) -> Admin:
     if not password:
         raise ValueError("Password is required")
 
-    hashed_pw = hash_password(password)
+    hashed_pw = await hash_password_async(password)
     admin = Admin(**kwargs, hashed_password=hashed_pw)
     db.add(admin)
-    db.commit()
-    db.refresh(admin)
+    await db.flush()
+    register_identity(db, UserType.ADMIN, str(admin.id), email)
+    await commit_new_account(db)
+    await db.refresh(admin)
     return admin
 
 
-def get_admin_by_id(db: Session, admin_id: int) -> Admin:
+async def get_admin_by_id(db: AsyncSession, admin_id: str) -> Admin:
     """Get admin by id"""
-    admin = db.query(Admin).filter(Admin.id == admin_id).first()
+    admin = await db.get(Admin, admin_id)
     if not admin:
         raise UserNotFoundException()
     return admin
 
 
-def get_admin_by_email(db: Session, email: str) -> Admin:
+async def get_admin_by_email(db: AsyncSession, email: str) -> Admin | None:
     """Get admin by email"""
-    return db.query(Admin).filter(Admin.email == email).first()
+    result = await db.execute(select(Admin).where(Admin.email == email))
+    return result.scalars().first()
@@ -2,51 +2,164 @@
 
 from typing import Union
 
-from app.api.v1.auth.models.user import Admin, Organization, OrgMember, User
-from lib.errorlib.auth import UserNotFoundException
-from sqlalchemy.orm import Session
+from app.api.v1.auth.models.user import (
+    Account,
+    AccountEmail,
+    Admin,
+    Organization,
+    OrgMember,
+    User,
+)
+from lib.errorlib.auth import UserAlreadyExistsException, UserNotFoundException
+from lib.utils.enums import UserType
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
+ACCOUNT_MODELS = {
+    "user": User,
+    "org_member": OrgMember,
+    "organization": Organization,
+    "admin": Admin,
+}
 
-def get_user_by_id(
-    db: Session, user_id: str
-) -> Union[User, OrgMember, Organization, Admin]:
-    """Fetch any account type by their ID."""
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        return user
+async def get_account_email(db: AsyncSession, email: str) -> AccountEmail | None:
+    """Find which account owns an email, across all account types."""
+    return await db.get(AccountEmail, email)
+
+
+def register_identity(
+    db: AsyncSession,
+    account_type: UserType,
+    account_id: str,
+    email: str | None = None,
+) -> None:
+    """Stage the identity registry rows for a new account.
+
+    The rows are committed together with the account they belong to; a
+    concurrent registration for the same email fails on the primary key.
+    Pass no email when the account reuses a claim that already exists.
+    """
+    db.add(Account(id=account_id, account_type=account_type))
+    if email is not None:
+        db.add(
+            AccountEmail(email=email, account_type=account_type, account_id=account_id)
+        )
+
 
-    org_member = db.query(OrgMember).filter(OrgMember.id == user_id).first()
-    if org_member:
-        return org_member
+async def move_email_claim(
+    db: AsyncSession,
+    account_type: UserType,
+    account_id: str,
+    old_email: str,
+    new_email: str,
+) -> None:
+    """Stage moving an account's email claim to a new address.
 
-    organization = db.query(Organization).filter(Organization.id == user_id).first()
-    if organization:
-        return organization
+    Commit with `commit_new_account`: a claim of the new address made in
+    the meantime fails on the primary key.
+    """
+    await db.execute(
+        delete(AccountEmail).where(
+            AccountEmail.email == old_email, AccountEmail.account_id == account_id
+        )
+    )
+    db.add(
+        AccountEmail(email=new_email, account_type=account_type, account_id=account_id)
+    )
+
+
+async def remove_identity(db: AsyncSession, account_id: str) -> None:
+    """Stage removal of an account's identity registry rows.
+
+    Independent org members share one email claim across organizations;
+    it passes to another of their memberships while any remains.
+    """
+    await db.execute(delete(Account).where(Account.id == account_id))
+    result = await db.execute(
+        select(AccountEmail.email, AccountEmail.account_type).where(
+            AccountEmail.account_id == account_id
+        )
+    )
+    claim = result.first()
+    if claim is None:
+        return
+    heir = None
+    if claim.account_type == UserType.ORG_MEMBER:
+        heir = await db.scalar(
+            select(OrgMember.id)
+            .where(
+                OrgMember.email == claim.email,
+                OrgMember.user_id.is_(None),
+                OrgMember.id != account_id,
+            )
+            .limit(1)
+        )
+    if heir is None:
+        await db.execute(delete(AccountEmail).where(AccountEmail.email == claim.email))
+    else:
+        await db.execute(
+            update(AccountEmail)
+            .where(AccountEmail.email == claim.email)
+            .values(account_id=heir)
+        )
 
-    admin = db.query(Admin).filter(Admin.id == user_id).first()
-    if admin:
-        return admin
+
+async def commit_new_account(db: AsyncSession) -> None:
+    """Commit a new account and its email claim."""
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        raise UserAlreadyExistsException(
+            "An account with this email already exists"
+        ) from exc
+
+
+async def get_user_by_id(
+    db: AsyncSession, user_id: str
+) -> Union[User, OrgMember, Organization, Admin]:
+    """Fetch any account type by their ID in a single query.
+
+    The accounts registry is joined to every account table on the primary
+    key, so only the table that owns the ID contributes a row. An org
+    member comes with its linked user loaded.
+    """
+    result = await db.execute(
+        select(User, OrgMember, Organization, Admin)
+        .select_from(Account)
+        .outerjoin(User, User.id == Account.id)
+        .outerjoin(OrgMember, OrgMember.id == Account.id)
+        .outerjoin(Organization, Organization.id == Account.id)
+        .outerjoin(Admin, Admin.id == Account.id)
+        .where(Account.id == user_id)
+        .options(joinedload(OrgMember.user))
+    )
+    row = result.first()
+    if row is not None:
+        for account in row:
+            if account is not None:
+                return account
 
     raise UserNotFoundException(f"No account found with ID: {user_id}")
 
 
-def get_user_by_id_and_type(
-    db: Session, user_id: str, user_type: str
+async def get_user_by_id_and_type(
+    db: AsyncSession, user_id: str, user_type: str
 ) -> Union[User, OrgMember, Organization, Admin]:
-    """Fetch account by ID and type (more efficient)."""
-
-    if user_type == "user":
-        user = db.query(User).filter(User.id == user_id).first()
-    elif user_type == "org_member":
-        user = db.query(OrgMember).filter(OrgMember.id == user_id).first()
-    elif user_type == "organization":
-        user = db.query(Organization).filter(Organization.id == user_id).first()
-    elif user_type == "admin":
-        user = db.query(Admin).filter(Admin.id == user_id).first()
-    else:
+    """Fetch account by ID and type (more efficient).
+
+    An org member comes with its linked user loaded.
+    """
+
+    model = ACCOUNT_MODELS.get(user_type)
+    if model is None:
         raise ValueError(f"Invalid user_type: {user_type}")
 
+    options = [joinedload(OrgMember.user)] if model is OrgMember else None
+    user = await db.get(model, user_id, options=options)
     if not user:
         raise UserNotFoundException(f"No {user_type} found with ID: {user_id}")
 
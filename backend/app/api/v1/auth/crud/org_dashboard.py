@@ -0,0 +1,245 @@
+"""Organization dashboard CRUD: incrementally maintained summary counts"""
+
+from collections import Counter
+
+from app.api.v1.auth.crud.users.user_dashboard import merge_insert
+from app.api.v1.auth.models.user import OrgMember, User
+from app.api.v1.dashboards.models.individual_users.user_dashboard import (
+    HealthAlert,
+)
+from app.api.v1.dashboards.models.organization.org_dashboard import (
+    ORG_PATIENTS,
+    ORG_UNASSIGNED_PATIENTS,
+    OrgDashboardCount,
+    OrgStaffPatientCount,
+    alert_count_name,
+    staff_count_name,
+)
+from lib.utils.enums import AlertSeverity, OrgRole
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def add_org_counts(db: AsyncSession, deltas: Counter) -> None:
+    """Stage changes to organizations' counts, without committing.
+
+    `deltas` maps (organization_id, count name) to the amount to add.
+    """
+    rows = [
+        {"organization_id": organization_id, "name": name, "count": delta}
+        for (organization_id, name), delta in deltas.items()
+        if organization_id is not None and delta
+    ]
+    if not rows:
+        return
+    statement = merge_insert(
+        db.get_bind().dialect.name,
+        OrgDashboardCount,
+        ["organization_id", "name"],
+        lambda new: {"count": OrgDashboardCount.count + new.count},
+    )
+    await db.execute(statement, rows)
+
+
+async def add_staff_patient_counts(db: AsyncSession, deltas: Counter) -> None:
+    """Stage changes to staff members' patient counts, without committing.
+
+    `deltas` maps member_id to the number of patients gained or lost.
+    """
+    deltas = {member_id: delta for member_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    result = await db.execute(
+        select(OrgMember.id, OrgMember.organization_id).where(OrgMember.id.in_(deltas))
+    )
+    rows = [
+        {
+            "member_id": member_id,
+            "organization_id": organization_id,
+            "patients": deltas[member_id],
+        }
+        for member_id, organization_id in result.all()
+        if organization_id is not None
+    ]
+    if not rows:
+        return
+    statement = merge_insert(
+        db.get_bind().dialect.name,
+        OrgStaffPatientCount,
+        ["member_id"],
+        lambda new: {"patients": OrgStaffPatientCount.patients + new.patients},
+    )
+    await db.execute(statement, rows)
+
+
+async def count_members(
+    db: AsyncSession, members: list[tuple[str | None, OrgRole | None]], sign: int = 1
+) -> None:
+    """Stage members joining (sign -1: leaving) their organizations.
+
+    Each member is an (organization_id, role) pair; no role means STAFF.
+    """
+    deltas = Counter()
+    for organization_id, role in members:
+        name = staff_count_name(OrgRole(role or OrgRole.STAFF))
+        deltas[(organization_id, name)] += sign
+    await add_org_counts(db, deltas)
+
+
+async def count_patient_move(
+    db: AsyncSession,
+    before: tuple[str | None, str | None] | None,
+    after: tuple[str | None, str | None] | None,
+    patients: int = 1,
+) -> None:
+    """Stage a patient's move between (organization_id, assigned_staff_id).
+
+    None for `before` is a new patient, and for `after` a deleted one.
+    `patients` counts several patients making the same move at once.
+    """
+    if before == after or not patients:
+        return
+    org_deltas = Counter()
+    staff_deltas = Counter()
+    for state, sign in ((before, -patients), (after, patients)):
+        if state is None:
+            continue
+        organization_id, staff_id = state
+        org_deltas[(organization_id, ORG_PATIENTS)] += sign
+        if staff_id is None:
+            org_deltas[(organization_id, ORG_UNASSIGNED_PATIENTS)] += sign
+        else:
+            staff_deltas[staff_id] += sign
+    await add_org_counts(db, org_deltas)
+    await add_staff_patient_counts(db, staff_deltas)
+
+
+async def count_alerts(
+    db: AsyncSession, alerts: list[tuple[str, AlertSeverity]], sign: int = 1
+) -> None:
+    """Stage alerts raised (sign -1: resolved) for (user_id, severity) pairs"""
+    if not alerts:
+        return
+    result = await db.execute(
+        select(User.id, User.organization_id).where(
+            User.id.in_({user_id for user_id, _ in alerts}),
+            User.organization_id.is_not(None),
+        )
+    )
+    organizations = dict(result.all())
+    deltas = Counter()
+    for user_id, severity in alerts:
+        if user_id in organizations:
+            deltas[(organizations[user_id], alert_count_name(severity))] += sign
+    await add_org_counts(db, deltas)
+
+
+async def count_active_alerts(db: AsyncSession, user_id: str, sign: int = 1) -> None:
+    """Stage a user's unresolved alerts joining (sign -1: leaving) the
+    counts of the organization the user belongs to now"""
+    result = await db.execute(
+        select(HealthAlert.severity).where(
+            HealthAlert.user_id == user_id, HealthAlert.resolved_at.is_(None)
+        )
+    )
+    await count_alerts(db, [(user_id, severity) for severity in result.scalars()], sign)
+
+
+async def get_org_counts(db: AsyncSession, organization_id: str) -> dict[str, int]:
+    """Every count kept for an organization, by name"""
+    result = await db.execute(
+        select(OrgDashboardCount.name, OrgDashboardCount.count).where(
+            OrgDashboardCount.organization_id == organization_id
+        )
+    )
+    return dict(result.all())
+
+
+async def get_busiest_staff(
+    db: AsyncSession, organization_id: str, limit: int
+) -> list[Row]:
+    """(member_id, full_name, role, patients) of the most loaded staff"""
+    result = await db.execute(
+        select(
+            OrgStaffPatientCount.member_id,
+            OrgMember.full_name,
+            OrgMember.role,
+            OrgStaffPatientCount.patients,
+        )
+        .join(OrgMember, OrgMember.id == OrgStaffPatientCount.member_id)
+        .where(
+            OrgStaffPatientCount.organization_id == organization_id,
+            OrgStaffPatientCount.patients > 0,
+        )
+        .order_by(
+            OrgStaffPatientCount.patients.desc(), OrgStaffPatientCount.member_id.desc()
+        )
+        .limit(limit)
+    )
+    return list(result.all())
+
+
+async def rebuild_org_counts(db: AsyncSession, organization_id: str) -> None:
+    """Recount an organization's summaries from its rows and commit.
+
+    Linear in the organization's size; repairs counts left behind by
+    writes that bypassed the CRUD layer.
+    """
+    patients = User.organization_id == organization_id
+    staff = await db.execute(
+        select(OrgMember.role, func.count())
+        .where(OrgMember.organization_id == organization_id)
+        .group_by(OrgMember.role)
+    )
+    totals = await db.execute(
+        select(func.count(), func.count().filter(User.assigned_staff_id.is_(None)))
+        .select_from(User)
+        .where(patients)
+    )
+    alerts = await db.execute(
+        select(HealthAlert.severity, func.count())
+        .join(User, User.id == HealthAlert.user_id)
+        .where(patients, HealthAlert.resolved_at.is_(None))
+        .group_by(HealthAlert.severity)
+    )
+    loads = await db.execute(
+        select(User.assigned_staff_id, func.count())
+        .join(OrgMember, OrgMember.id == User.assigned_staff_id)
+        .where(OrgMember.organization_id == organization_id)
+        .group_by(User.assigned_staff_id)
+    )
+    patient_count, unassigned = totals.one()
+    counts = {
+        **{staff_count_name(OrgRole(role)): count for role, count in staff.all()},
+        ORG_PATIENTS: patient_count,
+        ORG_UNASSIGNED_PATIENTS: unassigned,
+        **{
+            alert_count_name(AlertSeverity(severity)): count
+            for severity, count in alerts.all()
+        },
+    }
+    await db.execute(
+        delete(OrgDashboardCount).where(
+            OrgDashboardCount.organization_id == organization_id
+        )
+    )
+    await db.execute(
+        delete(OrgStaffPatientCount).where(
+            OrgStaffPatientCount.organization_id == organization_id
+        )
+    )
+    await db.execute(
+        insert(OrgDashboardCount),
+        [
+            {"organization_id": organization_id, "name": name, "count": count}
+            for name, count in counts.items()
+        ],
+    )
+    staff_rows = [
+        {"member_id": member_id, "organization_id": organization_id, "patients": count}
+        for member_id, count in loads.all()
+    ]
+    if staff_rows:
+        await db.execute(insert(OrgStaffPatientCount), staff_rows)
+    await db.commit()
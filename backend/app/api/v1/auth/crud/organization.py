@@ -1,21 +1,26 @@
 """Organization CRUD operations."""
 
+from app.api.v1.auth.crud.auth import (
+    commit_new_account,
+    get_account_email,
+    register_identity,
+)
 from app.api.v1.auth.models.user import Organization, OrgMember
 from lib.errorlib.auth import UserAlreadyExistsException, UserNotFoundException
-from lib.utils.user import hash_password
-from sqlalchemy.orm import Session, joinedload
+from lib.utils.enums import UserType
+from lib.utils.user import hash_password_async
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 
-def create_organization_with_email(db: Session, **kwargs) -> Organization:
+async def create_organization_with_email(db: AsyncSession, **kwargs) -> Organization:
     """Create organization"""
     email = kwargs.get("email")
     if not email:
         raise ValueError("Email is required")
 
-    existing_organization = (
-        db.query(Organization).filter(Organization.email == email).first()
-    )
-    if existing_organization:
+    if await get_account_email(db, email):
         raise UserAlreadyExistsException(
             f"Organization with email {email} already exists"
         )
@@ -24,28 +29,33 @@ def create_organization_with_email(db: Session, **kwargs) -> Organization:
     if not password:
         raise ValueError("Password is required")
 
-    hashed_pw = hash_password(password)
+    hashed_pw = await hash_password_async(password)
     # Build new_org with kwargs, but override hashed_password
     new_org = Organization(**kwargs, hashed_password=hashed_pw)
     db.add(new_org)
-    db.commit()
-    db.refresh(new_org)
+    await db.flush()
+    register_identity(db, UserType.ORGANIZATION, str(new_org.id), email)
+    await commit_new_account(db)
+    await db.refresh(new_org)
     return new_org
 
 
-def get_organization_by_id(db: Session, organization_id=str) -> Organization:
+async def get_organization_by_id(
+    db: AsyncSession, organization_id: str
+) -> Organization:
     """Get organizations by id"""
-    organization = (
-        db.query(Organization).filter(Organization.id == organization_id).first()
-    )
+    organization = await db.get(Organization, organization_id)
     if not organization:
         raise UserNotFoundException()
     return organization
 
 
-def get_organization_by_email(db: Session, email: str) -> Organization:
+async def get_organization_by_email(
+    db: AsyncSession, email: str
+) -> Organization | None:
     """Get Org by email"""
-    return db.query(Organization).filter(Organization.email == email).first()
+    result = await db.execute(select(Organization).where(Organization.email == email))
+    return result.scalars().first()
 
 
 def add_admin():
@@ -68,14 +78,14 @@ def org_admin_required():
     pass
 
 
-def get_organization_staff(db: Session, organization_id: str):
+async def get_organization_staff(db: AsyncSession, organization_id: str):
     """Get all staff in an organization"""
-    return (
-        db.query(OrgMember)
+    result = await db.execute(
+        select(OrgMember)
         .options(joinedload(OrgMember.user))
-        .filter(OrgMember.organization_id == organization_id)
-        .all()
+        .where(OrgMember.organization_id == organization_id)
     )
+    return result.scalars().all()
 
 
 def delete_organization():
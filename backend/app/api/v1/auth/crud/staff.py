@@ -1,56 +1,183 @@
 """Staff CRUD operations."""
 
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from app.api.v1.auth.crud.auth import (
+    commit_new_account,
+    get_account_email,
+    register_identity,
+    remove_identity,
+)
+from app.api.v1.auth.crud.org_dashboard import count_members, count_patient_move
 from app.api.v1.auth.crud.users.user import create_user
-from app.api.v1.auth.models.user import OrgMember, User
+from app.api.v1.auth.models.user import Account, AccountEmail, OrgMember, User
+from app.api.v1.dashboards.models.organization.org_dashboard import (
+    OrgStaffPatientCount,
+)
 from lib.errorlib.auth import UserAlreadyExistsException, UserNotFoundException
-from lib.utils.enums import OrgRole
-from lib.utils.user import hash_password
-from sqlalchemy.orm import Session, joinedload
+from lib.utils.enums import OrgRole, UserType
+from lib.utils.user import hash_password_async
+from sqlalchemy import and_, delete, func, insert, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased, joinedload
+
+
+async def _refresh_membership(db: AsyncSession, membership: OrgMember) -> OrgMember:
+    """Reload a membership with its linked user so no lazy load is
+    triggered once it leaves the session."""
+    await db.refresh(membership)
+    await db.refresh(membership, ["user"])
+    return membership
 
 
-def create_org_member_directly(db: Session, **kwargs) -> OrgMember:
+async def create_org_member_directly(db: AsyncSession, **kwargs) -> OrgMember:
     """Create org member directly (for org_member account registration)"""
 
     if "password" in kwargs:
-        kwargs["hashed_password"] = hash_password(kwargs.pop("password"))
+        kwargs["hashed_password"] = await hash_password_async(kwargs.pop("password"))
 
     # user_id is None for direct registration
     kwargs["user_id"] = None
 
-    org_member = OrgMember(**kwargs)
+    # Independent members share one email claim across organizations
+    email = kwargs["email"]
+    owner = await get_account_email(db, email)
+    if owner is not None and owner.account_type != UserType.ORG_MEMBER:
+        raise UserAlreadyExistsException("An account with this email already exists")
 
+    org_member = OrgMember(**kwargs)
     db.add(org_member)
-    db.commit()
-    db.refresh(org_member)
-    return org_member
-
-
-def get_org_member_by_email(db: Session, email: str) -> OrgMember | None:
+    await db.flush()
+    register_identity(
+        db,
+        UserType.ORG_MEMBER,
+        str(org_member.id),
+        email=email if owner is None else None,
+    )
+    await count_members(db, [(org_member.organization_id, org_member.role)])
+
+    await commit_new_account(db)
+    return await _refresh_membership(db, org_member)
+
+
+async def get_import_email_owners(
+    db: AsyncSession, organization_id: str, emails: list[str]
+) -> dict[str, tuple[UserType, bool, User | None]]:
+    """Owners of already claimed emails, in one query.
+
+    Maps each claimed email to the owning account type, whether an org
+    member with that email already belongs to `organization_id`, and the
+    owning User when the owner is one, for linking it to the organization.
+    """
+    result = await db.execute(
+        select(AccountEmail.email, AccountEmail.account_type, OrgMember.id, User)
+        .outerjoin(
+            OrgMember,
+            and_(
+                OrgMember.email == AccountEmail.email,
+                OrgMember.organization_id == organization_id,
+            ),
+        )
+        .outerjoin(User, User.id == AccountEmail.account_id)
+        .where(AccountEmail.email.in_(emails))
+    )
+    return {
+        email: (account_type, member_id is not None, user)
+        for email, account_type, member_id, user in result.all()
+    }
+
+
+async def bulk_create_org_members(
+    db: AsyncSession, members: list[dict], claimed_emails: set[str]
+) -> None:
+    """Insert org members and their identity rows in one transaction.
+
+    `members` are OrgMember column dicts with ids already assigned, linked
+    to a user through `user_id` or not; emails in `claimed_emails` already
+    have an owner and get no new claim.
+    Raises IntegrityError (after rolling back) if a claim was taken
+    concurrently.
+    """
+    try:
+        await db.execute(insert(OrgMember), members)
+        await count_members(
+            db, [(member["organization_id"], member.get("role")) for member in members]
+        )
+        await db.execute(
+            insert(Account),
+            [
+                {"id": member["id"], "account_type": UserType.ORG_MEMBER}
+                for member in members
+            ],
+        )
+        new_claims = [
+            {
+                "email": member["email"],
+                "account_type": UserType.ORG_MEMBER,
+                "account_id": member["id"],
+            }
+            for member in members
+            if member["email"] not in claimed_emails
+        ]
+        if new_claims:
+            await db.execute(insert(AccountEmail), new_claims)
+        await db.commit()
+    except IntegrityError:
+        # The failing statement may be any of the inserts, not just the commit
+        await db.rollback()
+        raise
+
+
+async def get_org_member_by_email(db: AsyncSession, email: str) -> OrgMember | None:
     """Get org member by email (for login)"""
-    return (
-        db.query(OrgMember)
-        .filter(OrgMember.email == email)
+    result = await db.execute(
+        select(OrgMember)
+        .where(OrgMember.email == email)
         .options(joinedload(OrgMember.user), joinedload(OrgMember.organization))
-        .first()
     )
+    return result.scalars().first()
 
 
-def add_existing_user_to_org(
-    db: Session, user_id: str, organization_id: str, role: OrgRole = OrgRole.STAFF
+async def get_org_member_in_organization(
+    db: AsyncSession, email: str, organization_id: str
+) -> OrgMember | None:
+    """Get org member by email within a single organization"""
+    result = await db.execute(
+        select(OrgMember).where(
+            OrgMember.email == email, OrgMember.organization_id == organization_id
+        )
+    )
+    return result.scalars().first()
+
+
+async def _get_membership(
+    db: AsyncSession, user_id: str, organization_id: str
+) -> OrgMember | None:
+    """Get a user's membership in an organization"""
+    result = await db.execute(
+        select(OrgMember).where(
+            OrgMember.user_id == user_id, OrgMember.organization_id == organization_id
+        )
+    )
+    return result.scalars().first()
+
+
+async def add_existing_user_to_org(
+    db: AsyncSession,
+    user_id: str,
+    organization_id: str,
+    role: OrgRole = OrgRole.STAFF,
 ) -> OrgMember:
     """Add existing user to an organization"""
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise UserNotFoundException("User not found")
 
-    existing_membership = (
-        db.query(OrgMember)
-        .filter(
-            OrgMember.user_id == user_id, OrgMember.organization_id == organization_id
-        )
-        .first()
-    )
+    existing_membership = await _get_membership(db, user_id, organization_id)
 
     if existing_membership:
         raise UserAlreadyExistsException("User already a member of this organization")
@@ -66,80 +193,234 @@ def add_existing_user_to_org(
     )
 
     db.add(new_membership)
-    db.commit()
-    db.refresh(new_membership)
-    return new_membership
+    await db.flush()
+    # The email stays claimed by the linked user
+    register_identity(db, UserType.ORG_MEMBER, str(new_membership.id))
+    await count_members(db, [(organization_id, role)])
+    await commit_new_account(db)
+    return await _refresh_membership(db, new_membership)
 
 
-def create_user_and_add_to_org(db: Session, **kwargs) -> OrgMember:
+async def create_user_and_add_to_org(db: AsyncSession, **kwargs) -> OrgMember:
     """Create new user and add to organization"""
 
     organization_id = kwargs.pop("organization_id")
     role = kwargs.pop("role", OrgRole.STAFF)
 
-    new_user = create_user(db, **kwargs)
+    new_user = await create_user(db, **kwargs)
 
     user_id = str(new_user.id) if new_user.id is not None else None
     if user_id is None:
         raise ValueError("User creation failed - no ID assigned")
 
-    return add_existing_user_to_org(db, user_id, organization_id, role)
+    return await add_existing_user_to_org(db, user_id, organization_id, role)
 
 
-def get_user_organizations(db: Session, user_id: str):
+async def get_user_organizations(db: AsyncSession, user_id: str):
     """Get all organizations a user belongs to"""
-    return (
-        db.query(OrgMember)
+    result = await db.execute(
+        select(OrgMember)
         .options(joinedload(OrgMember.organization))
-        .filter(OrgMember.user_id == user_id)
-        .all()
+        .where(OrgMember.user_id == user_id)
     )
+    return result.scalars().all()
 
 
-def get_org_members_by_organization(db: Session, organization_id: str):
+async def get_org_members_by_organization(db: AsyncSession, organization_id: str):
     """Get all members of an organization (both linked and independent)"""
-    return (
-        db.query(OrgMember)
-        .filter(OrgMember.organization_id == organization_id)
+    result = await db.execute(
+        select(OrgMember)
+        .where(OrgMember.organization_id == organization_id)
         .options(joinedload(OrgMember.user), joinedload(OrgMember.organization))
-        .all()
     )
+    return result.scalars().all()
+
+
+async def get_org_members_page(
+    db: AsyncSession,
+    organization_id: str,
+    limit: int,
+    after: tuple[datetime, str] | None = None,
+    role: OrgRole | None = None,
+    is_active: bool | None = None,
+) -> list[OrgMember]:
+    """One keyset page of an organization's members, by (joined_at, id).
+
+    Fetches `limit + 1` rows so the caller can tell whether a next page
+    exists. Served by the (organization_id[, role], joined_at, id) indexes.
+    """
+    query = select(OrgMember).where(OrgMember.organization_id == organization_id)
+    if role is not None:
+        query = query.where(OrgMember.role == role)
+    if is_active is not None:
+        query = query.where(OrgMember.is_active == is_active)
+    if after is not None:
+        query = query.where(tuple_(OrgMember.joined_at, OrgMember.id) > after)
+    result = await db.execute(
+        query.options(joinedload(OrgMember.user))
+        .order_by(OrgMember.joined_at, OrgMember.id)
+        .limit(limit + 1)
+    )
+    return list(result.scalars().all())
+
+
+async def get_memberships_page(
+    db: AsyncSession,
+    limit: int,
+    after: tuple[datetime, str] | None = None,
+    user_id: str | None = None,
+    email: str | None = None,
+    is_active: bool | None = None,
+) -> list[OrgMember]:
+    """One keyset page of the memberships of a linked user or an email.
+
+    Pass `user_id` for memberships linked to a User account, `email` for
+    an independent org member's memberships across organizations.
+    """
+    if user_id is not None:
+        query = select(OrgMember).where(OrgMember.user_id == user_id)
+    else:
+        query = select(OrgMember).where(OrgMember.email == email)
+    if is_active is not None:
+        query = query.where(OrgMember.is_active == is_active)
+    if after is not None:
+        query = query.where(tuple_(OrgMember.joined_at, OrgMember.id) > after)
+    result = await db.execute(
+        query.options(joinedload(OrgMember.user))
+        .order_by(OrgMember.joined_at, OrgMember.id)
+        .limit(limit + 1)
+    )
+    return list(result.scalars().all())
 
 
-def remove_user_from_org(db: Session, user_id: str, organization_id: str) -> dict:
-    """Remove a user from an organization"""
-    membership = (
-        db.query(OrgMember)
-        .filter(
-            OrgMember.user_id == user_id, OrgMember.organization_id == organization_id
+async def get_assigned_patients_page(
+    db: AsyncSession, staff_id: str, limit: int, after: str | None = None
+) -> list[User]:
+    """One keyset page of the patients assigned to a staff member, by id"""
+    query = select(User).where(User.assigned_staff_id == staff_id)
+    if after is not None:
+        query = query.where(User.id > after)
+    result = await db.execute(query.order_by(User.id).limit(limit + 1))
+    return list(result.scalars().all())
+
+
+async def get_org_member_ids(db: AsyncSession, organization_id: str) -> list[str]:
+    """IDs of every member of an organization, without loading the rows"""
+    result = await db.execute(
+        select(OrgMember.id).where(OrgMember.organization_id == organization_id)
+    )
+    return [str(member_id) for member_id in result.scalars().all()]
+
+
+async def stream_org_member_export(
+    db: AsyncSession, organization_id: str, batch_size: int = 1000
+) -> AsyncIterator[Row]:
+    """Stream an organization's members with their linked user and patients.
+
+    One flat row per (member, assigned patient), in (joined_at, id) order
+    so each member's rows are adjacent and the organization's listing index
+    supplies the member order. Rows come off a server-side cursor
+    `batch_size` at a time, so memory does not grow with the organization.
+    """
+    linked = aliased(User)
+    patient = aliased(User)
+    result = await db.stream(
+        select(
+            OrgMember.id,
+            OrgMember.username,
+            OrgMember.email,
+            OrgMember.full_name,
+            OrgMember.role,
+            OrgMember.is_active,
+            OrgMember.joined_at,
+            linked.id.label("user_id"),
+            linked.username.label("user_username"),
+            linked.email.label("user_email"),
+            linked.full_name.label("user_full_name"),
+            patient.id.label("patient_id"),
+            patient.username.label("patient_username"),
+            patient.email.label("patient_email"),
+            patient.full_name.label("patient_full_name"),
         )
-        .first()
+        .outerjoin(linked, linked.id == OrgMember.user_id)
+        .outerjoin(patient, patient.assigned_staff_id == OrgMember.id)
+        .where(OrgMember.organization_id == organization_id)
+        .order_by(OrgMember.joined_at, OrgMember.id, patient.id)
+        .execution_options(yield_per=batch_size)
     )
+    async for row in result:
+        yield row
+
+
+async def remove_user_from_org(
+    db: AsyncSession, user_id: str, organization_id: str
+) -> dict:
+    """Remove a user from an organization"""
+    membership = await _get_membership(db, user_id, organization_id)
 
     if not membership:
         raise UserNotFoundException("User is not a member of this organization")
 
-    db.delete(membership)
-    db.commit()
+    await remove_identity(db, str(membership.id))
+    await count_members(db, [(organization_id, membership.role)], sign=-1)
+    # The member's patients become unassigned
+    assigned = await db.execute(
+        select(User.organization_id, func.count())
+        .where(User.assigned_staff_id == membership.id)
+        .group_by(User.organization_id)
+    )
+    for patient_org_id, patients in assigned.all():
+        await count_patient_move(
+            db,
+            (patient_org_id, membership.id),
+            (patient_org_id, None),
+            patients=patients,
+        )
+    await db.execute(
+        update(User)
+        .where(User.assigned_staff_id == membership.id)
+        .values(assigned_staff_id=None)
+    )
+    await db.execute(
+        delete(OrgStaffPatientCount).where(
+            OrgStaffPatientCount.member_id == membership.id
+        )
+    )
+    await db.delete(membership)
+    await db.commit()
     return {"detail": f"User {user_id} removed from organization {organization_id}"}
 
 
-def update_user_role_in_org(
-    db: Session, user_id: str, organization_id: str, new_role: OrgRole
+async def update_user_role_in_org(
+    db: AsyncSession, user_id: str, organization_id: str, new_role: OrgRole
 ) -> OrgMember:
     """Update a user's role in an organization"""
-    membership = (
-        db.query(OrgMember)
-        .filter(
-            OrgMember.user_id == user_id, OrgMember.organization_id == organization_id
-        )
-        .first()
-    )
+    membership = await _get_membership(db, user_id, organization_id)
 
     if not membership:
         raise UserNotFoundException("User is not a member of this organization")
 
+    if OrgRole(membership.role) is not new_role:
+        await count_members(db, [(organization_id, membership.role)], sign=-1)
+        await count_members(db, [(organization_id, new_role)])
     setattr(membership, "role", new_role)
-    db.commit()
-    db.refresh(membership)
-    return membership
+    await db.commit()
+    return await _refresh_membership(db, membership)
+
+
+async def assign_patient(
+    db: AsyncSession, patient_id: str, staff_id: str | None
+) -> User:
+    """Assign a patient to a staff member, or unassign them with None"""
+    patient = await db.get(User, patient_id)
+    if not patient:
+        raise UserNotFoundException("Patient not found")
+    await count_patient_move(
+        db,
+        (patient.organization_id, patient.assigned_staff_id),
+        (patient.organization_id, staff_id),
+    )
+    patient.assigned_staff_id = staff_id
+    await db.commit()
+    await db.refresh(patient)
+    return patient
@@ -1,69 +1,112 @@
 """User CRUD Operations."""
 
+from app.api.v1.auth.crud.auth import (
+    commit_new_account,
+    get_account_email,
+    move_email_claim,
+    register_identity,
+    remove_identity,
+)
+from app.api.v1.auth.crud.org_dashboard import count_active_alerts, count_patient_move
+from app.api.v1.auth.crud.users.user_dashboard import delete_health_data
 from app.api.v1.auth.models.user import User
 from lib.errorlib.auth import UserAlreadyExistsException, UserNotFoundException
-from lib.utils.user import hash_password
-from sqlalchemy.orm import Session
+from lib.utils.enums import UserType
+from lib.utils.user import hash_password_async
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 
-def create_user(db: Session, **kwargs) -> User:
+async def create_user(db: AsyncSession, **kwargs) -> User:
     """Create a new user."""
     email = kwargs.get("email")
     if not email:
         raise ValueError("Email is required")
 
-    existing_user = db.query(User).filter(User.email == email).first()
-    if existing_user:
+    if await get_account_email(db, email):
         raise UserAlreadyExistsException(f"User with email {email} already exists")
 
     password = kwargs.pop("password", None)
     if not password:
         raise ValueError("Password is required")
 
-    hashed_pw = hash_password(password)
+    hashed_pw = await hash_password_async(password)
     # Build new_user with kwargs, but override hashed_password
     new_user = User(**kwargs, hashed_password=hashed_pw)
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.flush()
+    register_identity(db, UserType.USER, str(new_user.id), email)
+    await count_patient_move(
+        db, None, (new_user.organization_id, new_user.assigned_staff_id)
+    )
+    await commit_new_account(db)
+    await db.refresh(new_user)
 
     if new_user.id is None:
         raise ValueError("Failed to create user - ID not assigned")
     return new_user
 
 
-def get_user_by_email(db: Session, email: str) -> User | None:
+async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     """Fetch a user by their email."""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
 
-def update_user(db: Session, user_id: str, **kwargs) -> User:
+async def update_user(db: AsyncSession, user_id: str, **kwargs) -> User:
     """Update an existing user's details."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise UserNotFoundException()
 
     # Handle password hashing separately
     if "password" in kwargs and kwargs["password"] is not None:
-        kwargs["hashed_password"] = hash_password(kwargs.pop("password"))
+        kwargs["hashed_password"] = await hash_password_async(kwargs.pop("password"))
 
+    # The email claim moves with the address, in the same transaction
+    email = kwargs.get("email")
+    if email is not None:
+        email = kwargs["email"] = email.strip().lower()
+    changing_email = email not in (None, user.email)
+    if changing_email:
+        if await get_account_email(db, email):
+            raise UserAlreadyExistsException(f"User with email {email} already exists")
+        await move_email_claim(db, UserType.USER, str(user.id), user.email, email)
+
+    before = (user.organization_id, user.assigned_staff_id)
+    moving = kwargs.get("organization_id") not in (None, user.organization_id)
+    if moving:
+        # Active alerts are counted by the organization the user is in
+        await count_active_alerts(db, user_id, sign=-1)
     # Update other attributes if they are not None
     for key, value in kwargs.items():
         if value is not None:
             setattr(user, key, value)
-
-    db.commit()
-    db.refresh(user)
+    await count_patient_move(db, before, (user.organization_id, user.assigned_staff_id))
+    if moving:
+        # Sessions do not autoflush; the new organization must be visible
+        await db.flush()
+        await count_active_alerts(db, user_id)
+
+    if changing_email:
+        await commit_new_account(db)
+    else:
+        await db.commit()
+    await db.refresh(user)
     return user
 
 
-def delete_user(db: Session, user_id: str) -> dict:
+async def delete_user(db: AsyncSession, user_id: str) -> dict:
     """Delete a user by their ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise UserNotFoundException()
 
-    db.delete(user)
-    db.commit()
+    await remove_identity(db, str(user.id))
+    await count_patient_move(db, (user.organization_id, user.assigned_staff_id), None)
+    await count_active_alerts(db, str(user.id), sign=-1)
+    await delete_health_data(db, str(user.id))
+    await db.delete(user)
+    await db.commit()
     return {"detail": f"User with ID {user_id} deleted successfully"}
@@ -1,17 +1,461 @@
 """User Dashboard Crud"""
 
-# from lib.utils.user_dashboard import
+from collections.abc import Callable
+from datetime import date, datetime, timezone
 
-# from app.api.v1.dashboards.models.individual_users.user_dashboard import UserDashboard
+from app.api.v1.dashboards.models.individual_users.user_dashboard import (
+    HealthAlert,
+    HealthReading,
+    HealthRollup,
+    UserDashboard,
+)
+from lib.utils.enums import HealthMetric, RollupResolution
+from lib.utils.rollups import aggregate_readings
+from sqlalchemy import (
+    bindparam,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 
+# Dialects whose INSERT can skip or merge rows that would violate the primary key
+ON_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
 
-def get_user_dashboard_by_id():
-    pass
+# Dialects whose INSERT merges on a duplicate key, reading the new row as `inserted`
+DUPLICATE_KEY_INSERTS = {"mysql": mysql.insert}
 
+# Two-argument minimum and maximum, per dialect
+SCALAR_MIN_MAX = {
+    "postgresql": (func.least, func.greatest),
+    "mysql": (func.least, func.greatest),
+}
 
-def create_dashboard():
-    pass
 
+def merge_insert(dialect: str, model, index_elements: list[str], merge: Callable):
+    """INSERT that merges each row into the stored row with the same key.
 
-def update_health_metrics():
-    pass
+    `merge` is given the proposed row's columns and returns the updates
+    to apply to the stored row.
+    """
+    make_insert = ON_CONFLICT_INSERTS.get(dialect)
+    if make_insert is not None:
+        statement = make_insert(model)
+        return statement.on_conflict_do_update(
+            index_elements=index_elements, set_=merge(statement.excluded)
+        )
+    make_insert = DUPLICATE_KEY_INSERTS.get(dialect)
+    if make_insert is not None:
+        statement = make_insert(model)
+        return statement.on_duplicate_key_update(merge(statement.inserted))
+    raise NotImplementedError(f"No upsert available on {dialect}")
+
+
+async def get_user_dashboard_by_id(
+    db: AsyncSession, dashboard_id: str
+) -> UserDashboard | None:
+    """Get a dashboard by its id"""
+    return await db.get(UserDashboard, dashboard_id)
+
+
+async def get_user_dashboard_by_user_id(
+    db: AsyncSession, user_id: str
+) -> UserDashboard | None:
+    """Get a user's dashboard"""
+    result = await db.execute(
+        select(UserDashboard).where(UserDashboard.user_id == user_id)
+    )
+    return result.scalars().first()
+
+
+async def create_dashboard(db: AsyncSession, user_id: str, **kwargs) -> UserDashboard:
+    """Create a user's dashboard"""
+    dashboard = UserDashboard(user_id=user_id, **kwargs)
+    db.add(dashboard)
+    await db.commit()
+    await db.refresh(dashboard)
+    return dashboard
+
+
+def _readings_insert(dialect: str):
+    """INSERT into health_readings that drops exact duplicate readings"""
+    make_insert = ON_CONFLICT_INSERTS.get(dialect)
+    if make_insert is not None:
+        return make_insert(HealthReading).on_conflict_do_nothing(
+            index_elements=["user_id", "metric", "ts"]
+        )
+    make_insert = DUPLICATE_KEY_INSERTS.get(dialect)
+    if make_insert is not None:
+        # Keeping the stored value makes the duplicate a no-op
+        return make_insert(HealthReading).on_duplicate_key_update(
+            value=HealthReading.value
+        )
+    return insert(HealthReading)
+
+
+def _reading_key(reading) -> tuple:
+    """(user_id, metric, ts) of a reading, comparable to a stored one"""
+    ts = reading["ts"]
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return str(reading["user_id"]), HealthMetric(reading["metric"]), ts
+
+
+async def _unstored_readings(db: AsyncSession, readings: list[dict]) -> list[dict]:
+    """The readings of a batch that are not stored yet, each once"""
+    unstored = {}
+    for reading in readings:
+        unstored.setdefault(_reading_key(reading), reading)
+    key = tuple_(HealthReading.user_id, HealthReading.metric, HealthReading.ts)
+    result = await db.execute(
+        select(HealthReading.user_id, HealthReading.metric, HealthReading.ts).where(
+            key.in_(list(unstored))
+        )
+    )
+    for row in result.mappings():
+        unstored.pop(_reading_key(row), None)
+    return list(unstored.values())
+
+
+async def append_health_readings(db: AsyncSession, readings: list[dict]) -> list[dict]:
+    """Stage new readings and fold them into rollups, without committing.
+
+    Returns the readings actually inserted. Duplicates skipped by the insert
+    must not be counted twice: where executemany cannot return the inserted
+    rows, the stored ones are looked up first instead.
+    """
+    dialect = db.get_bind().dialect
+    statement = _readings_insert(dialect.name)
+    if dialect.insert_executemany_returning:
+        result = await db.execute(
+            statement.returning(
+                HealthReading.user_id,
+                HealthReading.metric,
+                HealthReading.ts,
+                HealthReading.value,
+            ),
+            readings,
+        )
+        readings = [dict(row) for row in result.mappings()]
+    else:
+        readings = await _unstored_readings(db, readings)
+        if readings:
+            await db.execute(statement, readings)
+    if readings:
+        await upsert_rollups(db, aggregate_readings(readings))
+    return readings
+
+
+async def upsert_rollups(db: AsyncSession, rollups: list[dict]) -> None:
+    """Merge partial aggregates into the stored rollup buckets"""
+    dialect = db.get_bind().dialect.name
+    least, greatest = SCALAR_MIN_MAX.get(dialect, (func.min, func.max))
+    statement = merge_insert(
+        dialect,
+        HealthRollup,
+        ["user_id", "metric", "resolution", "bucket"],
+        lambda new: {
+            "count": HealthRollup.count + new.count,
+            "sum": HealthRollup.sum + new.sum,
+            "min": least(HealthRollup.min, new.min),
+            "max": greatest(HealthRollup.max, new.max),
+        },
+    )
+    await db.execute(statement, rollups)
+
+
+async def insert_health_readings(db: AsyncSession, readings: list[dict]) -> list[dict]:
+    """Append readings in one executemany INSERT, update rollups and commit.
+
+    Each reading is a dict of user_id, metric, ts and value. A reading
+    already stored for the same (user_id, metric, ts) is skipped, so
+    clients can safely resend a batch. Returns the readings inserted.
+    """
+    if not readings:
+        return []
+    inserted = await append_health_readings(db, readings)
+    await db.commit()
+    return inserted
+
+
+async def get_latest_readings(
+    db: AsyncSession,
+    user_id: str,
+    metrics: tuple[HealthMetric, ...] = tuple(HealthMetric),
+) -> dict[HealthMetric, tuple[datetime, float]]:
+    """Latest (ts, value) of each metric, one index seek per metric"""
+    latest = [
+        select(HealthReading.metric, HealthReading.ts, HealthReading.value)
+        .where(HealthReading.user_id == user_id, HealthReading.metric == metric)
+        .order_by(HealthReading.ts.desc())
+        .limit(1)
+        .subquery()
+        for metric in metrics
+    ]
+    result = await db.execute(union_all(*(select(reading) for reading in latest)))
+    return {metric: (ts, value) for metric, ts, value in result.all()}
+
+
+async def get_health_readings(
+    db: AsyncSession,
+    user_id: str,
+    metric: HealthMetric,
+    start: datetime,
+    end: datetime,
+    limit: int = 1000,
+) -> list[tuple[datetime, float]]:
+    """Readings of one metric in [start, end), oldest first"""
+    result = await db.execute(
+        select(HealthReading.ts, HealthReading.value)
+        .where(
+            HealthReading.user_id == user_id,
+            HealthReading.metric == metric,
+            HealthReading.ts >= start,
+            HealthReading.ts < end,
+        )
+        .order_by(HealthReading.ts)
+        .limit(limit)
+    )
+    return [(ts, value) for ts, value in result.all()]
+
+
+async def update_health_metrics(
+    db: AsyncSession,
+    user_id: str,
+    readings: dict[HealthMetric, float],
+    ts: datetime,
+    details: dict | None = None,
+) -> list[dict]:
+    """Record a health metrics snapshot.
+
+    Numeric metrics are appended as readings at `ts`; the remaining,
+    non time-series fields (blood pressure, trackers...) are merged into
+    the dashboard's health_metrics document. Returns the readings inserted.
+    """
+    inserted = []
+    if readings:
+        inserted = await append_health_readings(
+            db,
+            [
+                {"user_id": user_id, "metric": metric, "ts": ts, "value": value}
+                for metric, value in readings.items()
+            ],
+        )
+    if details:
+        dashboard = await get_user_dashboard_by_user_id(db, user_id)
+        if dashboard is None:
+            db.add(UserDashboard(user_id=user_id, health_metrics=details))
+        else:
+            dashboard.health_metrics = {**(dashboard.health_metrics or {}), **details}
+    await db.commit()
+    return inserted
+
+
+async def save_bio_data(
+    db: AsyncSession, user_id: str, bio_data: dict, derived_due_on: date | None
+) -> None:
+    """Replace a user's bio data, creating their dashboard if needed"""
+    dashboard = await get_user_dashboard_by_user_id(db, user_id)
+    if dashboard is None:
+        db.add(
+            UserDashboard(
+                user_id=user_id, bio_data=bio_data, derived_due_on=derived_due_on
+            )
+        )
+    else:
+        dashboard.bio_data = bio_data
+        dashboard.derived_due_on = derived_due_on
+    await db.commit()
+
+
+async def get_derived_fields_due(
+    db: AsyncSession,
+    on: date,
+    limit: int,
+    after: tuple[date, str] | None = None,
+) -> list[tuple[str, dict | None, date]]:
+    """(id, bio_data, derived_due_on) of dashboards due by a day.
+
+    Ordered by due day then id, resuming after the (due day, id) of the
+    last row of the previous page.
+    """
+    statement = select(
+        UserDashboard.id, UserDashboard.bio_data, UserDashboard.derived_due_on
+    ).where(UserDashboard.derived_due_on <= on)
+    if after is not None:
+        statement = statement.where(
+            tuple_(UserDashboard.derived_due_on, UserDashboard.id) > after
+        )
+    result = await db.execute(
+        statement.order_by(UserDashboard.derived_due_on, UserDashboard.id).limit(limit)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def update_derived_fields(db: AsyncSession, updates: list[dict]) -> int:
+    """Write rederived bio data with one bulk UPDATE and commit.
+
+    Each update is a dict of dashboard_id, the `due` day it was read
+    with, its new `bio_data` (None to leave it as is) and `next_due`.
+    A row whose due day has changed since it was read was rewritten in
+    the meantime and is left alone. Returns the rows updated.
+    """
+    if not updates:
+        return 0
+    dashboards = UserDashboard.__table__
+    updated = 0
+    for with_bio_data in (True, False):
+        rows = [
+            {
+                "dashboard_id": item["dashboard_id"],
+                "due": item["due"],
+                "next_due": item["next_due"],
+                **({"new_bio_data": item["bio_data"]} if with_bio_data else {}),
+            }
+            for item in updates
+            if (item["bio_data"] is not None) is with_bio_data
+        ]
+        if not rows:
+            continue
+        values = {"derived_due_on": bindparam("next_due")}
+        if with_bio_data:
+            values["bio_data"] = bindparam("new_bio_data")
+        result = await db.execute(
+            update(dashboards)
+            .where(
+                dashboards.c.id == bindparam("dashboard_id"),
+                dashboards.c.derived_due_on == bindparam("due"),
+            )
+            .values(**values),
+            rows,
+        )
+        updated += max(result.rowcount, 0)
+    await db.commit()
+    return updated
+
+
+async def get_rollup_series(
+    db: AsyncSession,
+    user_id: str,
+    metric: HealthMetric,
+    resolution: RollupResolution,
+    start: datetime,
+    end: datetime,
+) -> list[HealthRollup]:
+    """Rollup buckets of one metric starting in [start, end), oldest first"""
+    result = await db.execute(
+        select(HealthRollup)
+        .where(
+            HealthRollup.user_id == user_id,
+            HealthRollup.metric == metric,
+            HealthRollup.resolution == resolution,
+            HealthRollup.bucket >= start,
+            HealthRollup.bucket < end,
+        )
+        .order_by(HealthRollup.bucket)
+    )
+    return list(result.scalars().all())
+
+
+async def delete_health_data(db: AsyncSession, user_id: str) -> None:
+    """Stage removal of a user's readings, rollups and alerts, without
+    committing; they reference the user and must go before it"""
+    for model in (HealthReading, HealthRollup, HealthAlert):
+        await db.execute(delete(model).where(model.user_id == user_id))
+
+
+async def add_health_alerts(db: AsyncSession, alerts: list[dict]) -> None:
+    """Stage alerts in one executemany INSERT, without committing"""
+    if alerts:
+        await db.execute(insert(HealthAlert), alerts)
+
+
+async def get_active_alert_ids(
+    db: AsyncSession, pairs: list[tuple[str, str]]
+) -> dict[tuple[str, str], str]:
+    """Id of the active alert of each (user_id, rule) that has one"""
+    if not pairs:
+        return {}
+    result = await db.execute(
+        select(HealthAlert.user_id, HealthAlert.rule, HealthAlert.id)
+        .where(
+            HealthAlert.user_id.in_({user_id for user_id, _ in pairs}),
+            HealthAlert.rule.in_({rule for _, rule in pairs}),
+            HealthAlert.resolved_at.is_(None),
+        )
+        .order_by(HealthAlert.created_at)
+    )
+    wanted = set(pairs)
+    # Newest last, so it is the one kept if a pair has several
+    return {
+        (user_id, rule): alert_id
+        for user_id, rule, alert_id in result.all()
+        if (user_id, rule) in wanted
+    }
+
+
+async def fold_health_alerts(db: AsyncSession, folds: list[dict]) -> None:
+    """Fold repeat firings into active alerts, without committing.
+
+    Each fold is a dict of alert_id, the number of readings `added` and
+    the latest reading's `value` and `ts`.
+    """
+    if not folds:
+        return
+    alerts = HealthAlert.__table__
+    await db.execute(
+        update(alerts)
+        .where(alerts.c.id == bindparam("alert_id"))
+        .values(
+            count=alerts.c.count + bindparam("added"),
+            value=bindparam("latest_value"),
+            ts=bindparam("latest_ts"),
+        ),
+        [
+            {
+                "alert_id": fold["alert_id"],
+                "added": fold["added"],
+                "latest_value": fold["value"],
+                "latest_ts": fold["ts"],
+            }
+            for fold in folds
+        ],
+    )
+
+
+async def get_active_alerts(
+    db: AsyncSession, user_id: str, limit: int = 100
+) -> list[HealthAlert]:
+    """A user's unresolved alerts, newest first"""
+    result = await db.execute(
+        select(HealthAlert)
+        .where(HealthAlert.user_id == user_id, HealthAlert.resolved_at.is_(None))
+        .order_by(HealthAlert.created_at.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def resolve_health_alert(
+    db: AsyncSession, user_id: str, alert_id: str
+) -> tuple[HealthAlert | None, bool]:
+    """Stage resolving one of a user's alerts, without committing.
+
+    Returns the alert (None if it is not theirs) and whether this call
+    resolved it: an alert already resolved, before or concurrently, is
+    left as it is.
+    """
+    alert = await db.get(HealthAlert, alert_id)
+    if alert is None or alert.user_id != user_id:
+        return None, False
+    result = await db.execute(
+        update(HealthAlert)
+        .where(HealthAlert.id == alert_id, HealthAlert.resolved_at.is_(None))
+        .values(resolved_at=func.now())
+    )
+    return alert, result.rowcount == 1
@@ -6,7 +6,17 @@ import uuid as uuid_lib
 
 from app.api.core.base import Base
 from lib.utils.enums import Currency, OrgRole, SubscriptionTier, UserType
-from sqlalchemy import UUID, Boolean, Column, DateTime, Enum, ForeignKey, String, func
+from sqlalchemy import (
+    UUID,
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    String,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 
@@ -14,6 +24,11 @@ class User(Base):
     """User model representing a user in the system."""
 
     __tablename__ = "users"
+    # Keyset pages of a staff member's assigned patients; also serves lookups
+    # by assigned_staff_id alone
+    __table_args__ = (
+        Index("ix_users_assigned_staff_id_id", "assigned_staff_id", "id"),
+    )
 
     from app.api.v1.dashboards.models.individual_users.user_dashboard import (
         UserDashboard,
@@ -33,7 +48,7 @@ class User(Base):
     user_type = Column(Enum(UserType), default=UserType.USER, nullable=False)
 
     organization_id = Column(
-        UUID(as_uuid=False), ForeignKey("organizations.id"), nullable=True
+        UUID(as_uuid=False), ForeignKey("organizations.id"), nullable=True, index=True
     )
     organization = relationship("Organization", back_populates="users")
 
@@ -97,6 +112,28 @@ class OrgMember(Base):
     """Organization Member model representing a member of an organization."""
 
     __tablename__ = "org_members"
+    # Lookups by (email|user_id, organization_id), and keyset pagination over
+    # (joined_at, id) within each listing's filter; organization_id alone is
+    # served by the leading column of the listing index
+    __table_args__ = (
+        Index("ix_org_members_email_organization_id", "email", "organization_id"),
+        Index("ix_org_members_user_id_organization_id", "user_id", "organization_id"),
+        Index(
+            "ix_org_members_organization_id_joined_at_id",
+            "organization_id",
+            "joined_at",
+            "id",
+        ),
+        Index(
+            "ix_org_members_organization_id_role_joined_at_id",
+            "organization_id",
+            "role",
+            "joined_at",
+            "id",
+        ),
+        Index("ix_org_members_user_id_joined_at_id", "user_id", "joined_at", "id"),
+        Index("ix_org_members_email_joined_at_id", "email", "joined_at", "id"),
+    )
 
     id = Column(
         UUID(as_uuid=False),
@@ -158,3 +195,42 @@ class Admin(Base):
             f"<Admin(id={self.id}, name={self.name},"
             f"usertype={self.user_type}, is_admin={self.is_admin})>"
         )
+
+
+class Account(Base):
+    """Identity registry mapping every account ID to its account type.
+
+    Lets a token subject be resolved with one indexed lookup whatever the
+    account type, instead of probing each account table in turn.
+    """
+
+    __tablename__ = "accounts"
+
+    id = Column(UUID(as_uuid=False), primary_key=True, autoincrement=False)
+    account_type = Column(Enum(UserType), nullable=False)
+
+    def __repr__(self):
+        """String representation of the Account model."""
+        return f"<Account(id={self.id}, account_type={self.account_type})>"
+
+
+class AccountEmail(Base):
+    """Global email registry.
+
+    One row per email across User, Organization, Admin and independent
+    OrgMember accounts, so cross-entity email uniqueness is enforced by the
+    primary key instead of by probing every account table.
+    """
+
+    __tablename__ = "account_emails"
+
+    email = Column(String, primary_key=True)
+    account_type = Column(Enum(UserType), nullable=False)
+    account_id = Column(UUID(as_uuid=False), nullable=False)
+
+    def __repr__(self):
+        """String representation of the AccountEmail model."""
+        return (
+            f"<AccountEmail(email={self.email}, account_type={self.account_type}, "
+            f"account_id={self.account_id})>"
+        )
@@ -3,14 +3,19 @@ Authorization and authentication APIs
 Token, Logout Route"""
 
 import os
-from datetime import datetime
+from functools import partial
 from typing import cast
 
-from app.api.db.session import get_db
+import redis
+from app.api.core.dependencies.auth import get_token_claims, require_roles
+from app.api.core.responses import ModelResponse
+from app.api.db.session import get_async_db
+from app.api.v1.auth.crud import get_org_member_ids
 from app.api.v1.auth.schemas import RegisterSchema
 from app.api.v1.auth.schemas.auth import (
     AuthenticatedUserOut,
     LogoutResponse,
+    RevokeSessionsResponse,
     TokenRefresh,
     TokenResponse,
 )
@@ -18,20 +23,31 @@ from app.api.v1.auth.schemas.user.user import UserLogin
 from app.api.v1.auth.services.auth_service import (
     login_user_service_with_response as login_user_service,
 )
+from app.api.v1.auth.services.auth_service import reload_token_claims
 from app.api.v1.auth.services.auth_service import (
     register_user_service_with_response as register_user_service,
 )
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from jose import JWTError, jwt
-from lib.errorlib.auth import PasswordException, TokenException, UserNotFoundException
+from lib.errorlib.auth import (
+    PasswordException,
+    PasswordHasherBusyException,
+    SessionStoreUnavailableException,
+    TokenException,
+    UserNotFoundException,
+)
 from lib.utils.clienttype import ClientType
+from lib.utils.enums import OrgRole
 from lib.utils.user import (
-    blacklist_token,
+    TokenClaims,
+    blacklist_tokens,
     delete_auth_cookies,
+    revocation_entry,
+    revoke_all_sessions,
     token_refresh,
     verify_access_token,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
 ALGORITHM = "HS256"
@@ -40,44 +56,32 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/refresh", response_model=TokenResponse)
-async def refresh_token(data: TokenRefresh):
-    """Token refresh"""
-    new_access_token = token_refresh(data.refresh_token, TokenException())
-    return TokenResponse(access_token=new_access_token, token_type="bearer")
-
-
-@router.post(
-    "/register",
-    response_model=AuthenticatedUserOut,
-    status_code=status.HTTP_201_CREATED,
-)
-async def register_user(
-    payload: RegisterSchema,
-    response: Response,
-    request: Request,
-    db: Session = Depends(get_db),
-):
-    """Register All user/usertypes"""
-    client_type_raw = request.headers.get("X-Client-Type", "web")
-
-    user_data = payload.model_dump(exclude_unset=True)
-    account_type = user_data.pop("account_type", "user")
-
-    result = register_user_service(
-        db, user_data, client_type_raw=client_type_raw, account_type=account_type
+async def refresh_token(data: TokenRefresh, db: AsyncSession = Depends(get_async_db)):
+    """Token refresh: rotates the refresh token"""
+    access_token, refresh_token = await token_refresh(
+        data.refresh_token, TokenException(), partial(reload_token_claims, db)
+    )
+    return TokenResponse(
+        access_token=access_token, refresh_token=refresh_token, token_type="bearer"
     )
 
-    auth_out = AuthenticatedUserOut(
-        user=result["user"],
-        access_token=None if result["set_cookies"] else result["access_token"],
-        refresh_token=None if result["set_cookies"] else result["refresh_token"],
-        token_type=result["token_type"],
+
+def auth_response(
+    auth_out: AuthenticatedUserOut, set_cookies: bool, status_code: int
+) -> ModelResponse:
+    """Serialize an auth result once, setting cookies for web clients"""
+    # Web clients get the tokens as cookies only
+    body = (
+        auth_out.model_copy(update={"access_token": None, "refresh_token": None})
+        if set_cookies
+        else auth_out
     )
+    response = ModelResponse(body, status_code=status_code)
 
-    if result["set_cookies"]:
+    if set_cookies:
         response.set_cookie(
             "access_token",
-            result["access_token"],
+            auth_out.access_token,
             httponly=True,
             secure=True,
             samesite="lax",
@@ -85,14 +89,36 @@ async def register_user(
         )
         response.set_cookie(
             "refresh_token",
-            result["refresh_token"],
+            auth_out.refresh_token,
             httponly=True,
             secure=True,
             samesite="lax",
             max_age=7 * 24 * 60 * 60,
         )
 
-    return auth_out
+    return response
+
+
+@router.post(
+    "/register",
+    response_model=AuthenticatedUserOut,
+    status_code=status.HTTP_201_CREATED,
+)
+async def register_user(
+    payload: RegisterSchema,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Register All user/usertypes"""
+    client_type_raw = request.headers.get("X-Client-Type", "web")
+
+    user_data = payload.model_dump(exclude_unset=True)
+    account_type = user_data.pop("account_type", "user")
+
+    auth_out, set_cookies = await register_user_service(
+        db, user_data, client_type_raw=client_type_raw, account_type=account_type
+    )
+    return auth_response(auth_out, set_cookies, status.HTTP_201_CREATED)
 
 
 @router.post(
@@ -100,9 +126,8 @@ async def register_user(
 )
 async def login(
     user_login: UserLogin,
-    response: Response,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Login For all User Types"""
     try:
@@ -112,51 +137,20 @@ async def login(
 
         login_context = user_login.login_context
 
-        result = login_user_service(
+        auth_out, set_cookies = await login_user_service(
             db=db,
             email=user_login.email,
             password=user_login.password,
             client_type_raw=client_type,
             login_context=login_context,
         )
-
-        if result["set_cookies"]:
-            response.set_cookie(
-                "access_token",
-                result["access_token"],
-                httponly=True,
-                secure=True,
-                samesite="lax",
-                max_age=15 * 60,
-            )
-            response.set_cookie(
-                "refresh_token",
-                result["refresh_token"],
-                httponly=True,
-                secure=True,
-                samesite="lax",
-                max_age=7 * 24 * 60 * 60,
-            )
-
-            # Return without tokens in JSON since they are in cookies
-            return {
-                "user": result["user"],
-                "access_token": None,
-                "refresh_token": None,
-                "token_type": result["token_type"],
-            }
-
-        # Return full response with tokens in JSON
-        return {
-            "user": result["user"],
-            "access_token": result["access_token"],
-            "refresh_token": result["refresh_token"],
-            "token_type": result["token_type"],
-        }
+        return auth_response(auth_out, set_cookies, status.HTTP_200_OK)
     except UserNotFoundException as exc:
         raise HTTPException(status_code=401, detail="User not found") from exc
     except PasswordException as exc:
         raise HTTPException(status_code=401, detail="Invalid credentials") from exc
+    except (PasswordHasherBusyException, SessionStoreUnavailableException):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
 
@@ -173,38 +167,86 @@ async def logout(request: Request, response: Response):
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    token_invalidated = False
+    payloads = []
 
-    # Blacklist access token
+    # Access token
     if access_token:
         try:
-            payload = verify_access_token(access_token, credentials_exception)
-            jti = payload.get("jti")
-            exp = payload.get("exp")
-            if jti and exp:
-                expires_in = max(0, int(exp - datetime.now().timestamp()))
-                blacklist_token(jti, expires_in)
-                token_invalidated = True
+            payloads.append(
+                await verify_access_token(access_token, credentials_exception)
+            )
         except HTTPException:
             # Token invalid or blacklisted already, skip blacklisting
             pass
 
-    # Blacklist refresh token
+    # Refresh token
     if refresh_token:
         try:
-            payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
-            jti = payload.get("jti")
-            exp = payload.get("exp")
-            if jti and exp:
-                expires_in = max(0, int(exp - datetime.now().timestamp()))
-                blacklist_token(jti, expires_in)
-                token_invalidated = True
+            payloads.append(
+                jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+            )
         except JWTError:
             pass
 
+    # Revoke both in one round trip
+    entries = [
+        revocation_entry(payload)
+        for payload in payloads
+        if payload.get("jti") and payload.get("exp")
+    ]
+    token_invalidated = bool(entries) and await blacklist_tokens(
+        entries, sub=payloads[0].get("sub")
+    )
+
     # Delete cookies
     delete_auth_cookies(response)
 
     return LogoutResponse(
         message="Logout successful!", token_invalidated=token_invalidated
     )
+
+
+@router.post(
+    "/logout-all",
+    response_model=RevokeSessionsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def logout_all(
+    response: Response, claims: TokenClaims = Depends(get_token_claims)
+):
+    """Log out everywhere: revoke every session of the current account"""
+    try:
+        revoked = await revoke_all_sessions(claims.sub)
+    except redis.RedisError as exc:
+        raise SessionStoreUnavailableException() from exc
+
+    delete_auth_cookies(response)
+
+    return RevokeSessionsResponse(
+        message="All sessions revoked", sessions_revoked=revoked
+    )
+
+
+@router.post(
+    "/organization/sessions/revoke",
+    response_model=RevokeSessionsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def revoke_organization_sessions(
+    claims: TokenClaims = Depends(require_roles(OrgRole.ORG_ADMIN.value)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Revoke every session of every member of the caller's organization"""
+    if not claims.org_id:
+        raise HTTPException(status_code=403, detail="No organization in token")
+
+    member_ids = await get_org_member_ids(db, claims.org_id)
+    try:
+        revoked = await revoke_all_sessions(*member_ids)
+    except redis.RedisError as exc:
+        raise SessionStoreUnavailableException() from exc
+
+    return RevokeSessionsResponse(
+        message=f"Sessions revoked for {len(member_ids)} members",
+        sessions_revoked=revoked,
+    )
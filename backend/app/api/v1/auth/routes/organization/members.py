@@ -0,0 +1,122 @@
+"""Organization member management APIs"""
+
+from typing import Literal
+
+from app.api.core.dependencies.auth import get_token_claims, require_roles
+from app.api.core.responses import ModelResponse
+from app.api.db.session import get_async_db
+from app.api.v1.auth.schemas.org import (
+    AssignedPatientPage,
+    OrgMemberImportReport,
+    OrgMemberPage,
+    PatientAssignment,
+)
+from app.api.v1.auth.schemas.user.user import UserOut
+from app.api.v1.auth.services.org_service import (
+    EXPORT_MEDIA_TYPES,
+    ImportFormatError,
+    assign_patient_to_staff,
+    export_org_members,
+    import_org_members,
+    list_assigned_patients,
+    list_org_members,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from lib.utils.enums import OrgRole
+from lib.utils.pagination import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from lib.utils.user import TokenClaims
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter(prefix="/organization", tags=["Organization"])
+
+
+@router.get("/members", response_model=OrgMemberPage)
+async def list_members(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: str | None = None,
+    role: OrgRole | None = None,
+    is_active: bool | None = None,
+    claims: TokenClaims = Depends(require_roles(OrgRole.ORG_ADMIN.value)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Members of the caller's organization, oldest first, by cursor"""
+    if not claims.org_id:
+        raise HTTPException(status_code=403, detail="No organization in token")
+
+    page = await list_org_members(
+        db, claims.org_id, limit, cursor, role=role, is_active=is_active
+    )
+    return ModelResponse(page)
+
+
+@router.get("/members/{member_id}/patients", response_model=AssignedPatientPage)
+async def list_patients(
+    member_id: str,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: str | None = None,
+    claims: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Patients assigned to a staff member, by cursor"""
+    page = await list_assigned_patients(db, claims, member_id, limit, cursor)
+    return ModelResponse(page)
+
+
+@router.put("/patients/{patient_id}/staff", response_model=UserOut)
+async def assign_patient(
+    patient_id: str,
+    assignment: PatientAssignment,
+    claims: TokenClaims = Depends(require_roles(OrgRole.ORG_ADMIN.value)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Assign a patient of the organization to a member, or unassign them"""
+    if not claims.org_id:
+        raise HTTPException(status_code=403, detail="No organization in token")
+
+    patient = await assign_patient_to_staff(
+        db, claims.org_id, patient_id, assignment.staff_id
+    )
+    return ModelResponse(patient)
+
+
+@router.post(
+    "/members/import",
+    response_model=OrgMemberImportReport,
+    status_code=status.HTTP_200_OK,
+)
+async def import_members(
+    request: Request,
+    claims: TokenClaims = Depends(require_roles(OrgRole.ORG_ADMIN.value)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Bulk import members from a CSV or NDJSON body, reporting per row"""
+    if not claims.org_id:
+        raise HTTPException(status_code=403, detail="No organization in token")
+
+    body = await request.body()
+    try:
+        report = await import_org_members(
+            db, claims.org_id, body, request.headers.get("content-type", "")
+        )
+    except ImportFormatError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return ModelResponse(report)
+
+
+@router.get("/members/export", response_class=StreamingResponse)
+async def export_members(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    claims: TokenClaims = Depends(require_roles(OrgRole.ORG_ADMIN.value)),
+):
+    """Stream every member with their linked user and assigned patients"""
+    if not claims.org_id:
+        raise HTTPException(status_code=403, detail="No organization in token")
+
+    return StreamingResponse(
+        export_org_members(claims.org_id, export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": (f'attachment; filename="members.{export_format}"')
+        },
+    )
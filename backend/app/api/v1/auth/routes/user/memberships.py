@@ -0,0 +1,26 @@
+"""User organization memberships API"""
+
+from app.api.core.dependencies.auth import get_token_claims
+from app.api.core.responses import ModelResponse
+from app.api.db.session import get_async_db
+from app.api.v1.auth.schemas.org import OrgMemberPage
+from app.api.v1.auth.services.org_service import list_memberships
+from fastapi import APIRouter, Depends, Query
+from lib.utils.pagination import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from lib.utils.user import TokenClaims
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter(prefix="/user", tags=["User"])
+
+
+@router.get("/memberships", response_model=OrgMemberPage)
+async def memberships(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: str | None = None,
+    is_active: bool | None = None,
+    claims: TokenClaims = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Organizations the caller belongs to, oldest membership first"""
+    page = await list_memberships(db, claims, limit, cursor, is_active=is_active)
+    return ModelResponse(page)
@@ -1,23 +1,34 @@
 """User profile API"""
 
+from typing import Union
+
 from app.api.core.dependencies.auth import get_current_user_from_db as profile_service
 from app.api.core.dependencies.security import user_oauth2_scheme
-from app.api.db.session import get_db
-from app.api.v1.auth.schemas.auth import AuthenticatedUserOut
+from app.api.core.responses import ModelResponse
+from app.api.db.session import get_async_db
+from app.api.v1.auth.schemas.admin import AdminOut
+from app.api.v1.auth.schemas.org import OrganizationOut, OrgMemberOut
+from app.api.v1.auth.schemas.user.user import UserOut
+from app.api.v1.auth.services.auth_service import to_schema
 from fastapi import APIRouter, Depends, HTTPException, status
 from lib.errorlib.auth import UserNotAuthorizedException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/user", tags=["User"])
 
 
-@router.get("/profile", response_model=AuthenticatedUserOut)
-def profile(db: Session = Depends(get_db), token: str = Depends(user_oauth2_scheme)):
+@router.get(
+    "/profile", response_model=Union[UserOut, OrgMemberOut, AdminOut, OrganizationOut]
+)
+async def profile(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(user_oauth2_scheme),
+):
     """User Profile"""
     try:
-        user, _ = profile_service(token, db)
-        return user
+        user, _ = await profile_service(token, db)
     except UserNotAuthorizedException as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e)
         ) from e
+    return ModelResponse(to_schema(user))
@@ -24,6 +24,13 @@ class LogoutResponse(BaseModel):
     token_invalidated: bool
 
 
+class RevokeSessionsResponse(BaseModel):
+    """Schema for revoking every session of one or more accounts"""
+
+    message: str
+    sessions_revoked: int
+
+
 class TokenRefresh(BaseModel):
     """Schema for refresh token"""
 
@@ -34,4 +41,5 @@ class TokenResponse(BaseModel):
     """Token response Schema"""
 
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: Literal["bearer"]
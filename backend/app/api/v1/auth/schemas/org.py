@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Literal, Optional
 
 from app.api.v1.auth.schemas.user.user import UserOut
-from lib.utils.enums import OrgRole, UserType
+from lib.utils.enums import AlertSeverity, OrgRole, UserType
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -85,9 +85,81 @@ class OrgMembershipList(BaseModel):
     memberships: list[OrgMemberOut]
 
 
+class OrgMemberPage(BaseModel):
+    """One page of organization members; pass next_cursor for the next."""
+
+    items: list[OrgMemberOut]
+    next_cursor: Optional[str] = None
+
+
+class AssignedPatientPage(BaseModel):
+    """One page of a staff member's assigned patients."""
+
+    items: list[UserOut]
+    next_cursor: Optional[str] = None
+
+
 class OrgMemberUpdate(BaseModel):
     """Schema for updating organization member."""
 
     username: Optional[str] = Field(None, min_length=3, max_length=50)
     full_name: Optional[str] = Field(None, max_length=100)
     role: Optional[OrgRole] = None
+
+
+class OrgMemberImportRow(BaseModel):
+    """One row of a bulk org member import."""
+
+    username: str = Field(..., min_length=3, max_length=50)
+    email: EmailStr
+    password: str = Field(..., min_length=8)
+    full_name: str = Field(..., max_length=100)
+    role: OrgRole = Field(default=OrgRole.STAFF, description="Role in organization")
+
+
+class OrgMemberImportResult(BaseModel):
+    """Outcome of one import row; rows are numbered from 1."""
+
+    row: int
+    email: Optional[str] = None
+    status: Literal["created", "error"]
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class OrgMemberImportReport(BaseModel):
+    """Per-row report of a bulk org member import."""
+
+    total: int
+    created: int
+    failed: int
+    results: list[OrgMemberImportResult]
+
+
+class PatientAssignment(BaseModel):
+    """Staff member to assign a patient to; null unassigns them."""
+
+    staff_id: Optional[str] = None
+
+
+class StaffWorkload(BaseModel):
+    """A staff member and how many patients are assigned to them."""
+
+    member_id: str
+    full_name: str
+    role: OrgRole
+    patients: int
+
+    model_config = {"from_attributes": True}
+
+
+class OrgDashboard(BaseModel):
+    """Summary counts on an organization's dashboard."""
+
+    staff: dict[OrgRole, int]
+    staff_total: int
+    patients: int
+    unassigned_patients: int
+    active_alerts: dict[AlertSeverity, int]
+    active_alerts_total: int
+    busiest_staff: list[StaffWorkload]
@@ -1,10 +1,12 @@
 """Schema for Individual User Dashboard"""
 
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, EmailStr
+from lib.utils.enums import AlertSeverity, HealthMetric, RollupResolution, Unit
+from lib.utils.user_dashboard import METRIC_UNITS, UNIT_BASES
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 
 class EmergencyContact(BaseModel):
@@ -36,6 +38,39 @@ class BioData(BaseModel):
     bmi: Optional[float] = None
 
 
+class BioDataUpdate(BaseModel):
+    """Bio data set by the user; age and BMI are derived from it"""
+
+    gender: Optional[str] = None
+    dob: Optional[date] = None
+    weight: Optional[float] = Field(None, gt=0)
+    height: Optional[float] = Field(None, gt=0)
+    blood_type: Optional[str] = None
+    weight_unit: Unit = Unit.KILOGRAM
+    height_unit: Unit = Unit.CENTIMETER
+
+    @model_validator(mode="after")
+    def check_units(self):
+        """Weight and height units must measure mass and length"""
+        if UNIT_BASES[self.weight_unit] is not Unit.KILOGRAM:
+            raise ValueError(f"{self.weight_unit.value} is not a unit of weight")
+        if UNIT_BASES[self.height_unit] is not Unit.CENTIMETER:
+            raise ValueError(f"{self.height_unit.value} is not a unit of height")
+        return self
+
+
+class BioDataOut(BaseModel):
+    """Stored bio data, weight in kg and height in cm"""
+
+    gender: Optional[str] = None
+    age: Optional[int] = None
+    weight: Optional[float] = None
+    height: Optional[float] = None
+    dob: Optional[str] = None
+    blood_type: Optional[str] = None
+    bmi: Optional[float] = None
+
+
 class MenstrualCycleTracker(BaseModel):
     """Menstruation Schema"""
 
@@ -97,3 +132,87 @@ class UserDashboardCreate(BaseModel):
     personal_info: PersonalInfo
     bio_data: BioData
     health_metrics: HealthMetrics
+
+
+class HealthReadingIn(BaseModel):
+    """One wearable or manual reading; ts defaults to the time received.
+
+    Glucose may be sent in mg/dL and temperature in F; values are
+    converted to mmol/L and C when stored.
+    """
+
+    metric: HealthMetric
+    value: float = Field(..., allow_inf_nan=False)
+    ts: Optional[datetime] = None
+    unit: Optional[Unit] = None
+
+    @model_validator(mode="after")
+    def check_unit(self):
+        """The unit must measure the metric"""
+        stored = METRIC_UNITS.get(self.metric)
+        if self.unit is not None and (
+            stored is None or UNIT_BASES[self.unit] is not stored
+        ):
+            raise ValueError(f"{self.unit.value} is not a unit of {self.metric.value}")
+        return self
+
+
+class HealthReadingBatch(BaseModel):
+    """Batch of readings sent in one request"""
+
+    readings: List[HealthReadingIn] = Field(..., min_length=1, max_length=1000)
+
+
+class HealthReadingBatchResult(BaseModel):
+    """Outcome of a reading batch"""
+
+    accepted: int
+
+
+class LatestHealthMetrics(HealthMetrics):
+    """Health metrics with the latest reading of each time-series metric"""
+
+    measured_at: Dict[HealthMetric, datetime] = {}
+
+
+class HealthSeriesPoint(BaseModel):
+    """Aggregate of the readings in one bucket"""
+
+    ts: datetime
+    min: float
+    max: float
+    avg: float
+    count: int
+
+
+class HealthSeries(BaseModel):
+    """Chart series of one metric at the resolution chosen for the window"""
+
+    metric: HealthMetric
+    resolution: RollupResolution
+    start: datetime
+    end: datetime
+    points: List[HealthSeriesPoint]
+
+
+class HealthAlertOut(BaseModel):
+    """An alert raised by a rule on the user's readings"""
+
+    model_config = {"from_attributes": True}
+
+    id: str
+    rule: str
+    metric: HealthMetric
+    severity: AlertSeverity
+    message: str
+    value: float
+    ts: datetime
+    count: int
+    created_at: datetime
+    resolved_at: Optional[datetime] = None
+
+
+class HealthAlertList(BaseModel):
+    """A user's active alerts, newest first"""
+
+    items: List[HealthAlertOut]
@@ -8,10 +8,14 @@ from app.api.v1.auth.crud import (
     create_org_member_directly,
     create_organization_with_email,
     create_user,
+    get_account_email,
     get_admin_by_email,
     get_org_member_by_email,
+    get_org_member_in_organization,
     get_organization_by_email,
     get_user_by_email,
+    get_user_by_id,
+    get_user_by_id_and_type,
 )
 from app.api.v1.auth.models.user import Admin, Organization, OrgMember, User
 from app.api.v1.auth.schemas.admin import AdminOut
@@ -27,32 +31,160 @@ from lib.errorlib.auth import (
 from lib.utils.clienttype import ClientType, validate_client_type
 from lib.utils.enums import OrgRole, UserType
 from lib.utils.user import (
-    create_access_token,
-    create_refresh_token,
+    TokenClaims,
     is_strong_password,
-    verify_password,
+    issue_tokens,
+    verify_password_async,
 )
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 MODEL_TO_SCHEMA = {
-    "User": UserOut,
-    "OrgMember": OrgMemberOut,
-    "Admin": AdminOut,
-    "Organization": OrganizationOut,
+    User: UserOut,
+    OrgMember: OrgMemberOut,
+    Admin: AdminOut,
+    Organization: OrganizationOut,
 }
 
+# Built once: validating plain dicts through a prepared adapter avoids the
+# generic from_attributes walk over ORM instances
+SCHEMA_ADAPTERS = {
+    model: TypeAdapter(schema) for model, schema in MODEL_TO_SCHEMA.items()
+}
+
+# The columns each Out schema reads, in schema field order
+SCHEMA_COLUMNS = {
+    model: tuple(name for name in schema.model_fields if name in inspect(model).columns)
+    for model, schema in MODEL_TO_SCHEMA.items()
+}
+
+
+MODEL_TO_USER_TYPE = {
+    User: UserType.USER,
+    OrgMember: UserType.ORG_MEMBER,
+    Admin: UserType.ADMIN,
+    Organization: UserType.ORGANIZATION,
+}
+
+
+def project_account(user_obj) -> dict:
+    """Read the columns an account's Out schema needs, without lazy loads.
+
+    Loaded values come straight from the instance state. An org member's
+    linked user must be eagerly loaded: it is never fetched here, and
+    reporting it as missing would be wrong.
+    """
+    model = type(user_obj)
+    loaded = user_obj.__dict__
+    data = {
+        name: loaded[name] if name in loaded else getattr(user_obj, name)
+        for name in SCHEMA_COLUMNS[model]
+    }
+    if model is OrgMember:
+        if "user" not in loaded and user_obj.user_id is not None:
+            raise ValueError("The org member's linked user was not loaded")
+        linked_user = loaded.get("user")
+        data["user"] = project_account(linked_user) if linked_user else None
+    return data
+
 
 def to_schema(user_obj):
     """To schema"""
-    model_name = user_obj.__class__.__name__
-    schema_class = MODEL_TO_SCHEMA.get(model_name)
-    if not schema_class:
-        raise ValueError(f"Unknown user model type: {model_name}")
-    return schema_class.model_validate(user_obj)
+    adapter = SCHEMA_ADAPTERS.get(type(user_obj))
+    if adapter is None:
+        raise ValueError(f"Unknown user model type: {type(user_obj).__name__}")
+    return adapter.validate_python(project_account(user_obj))
+
+
+async def load_account_schemas(db: AsyncSession, model, account_ids: list[str]):
+    """Load accounts straight into their Out schemas.
+
+    Selects only the columns the schema reads (plus the linked user's, for
+    org members) so no ORM instances are built and nothing is lazy loaded.
+    """
+    adapter = SCHEMA_ADAPTERS[model]
+    columns = [getattr(model, name) for name in SCHEMA_COLUMNS[model]]
+    if model is not OrgMember:
+        result = await db.execute(select(*columns).where(model.id.in_(account_ids)))
+        return [adapter.validate_python(dict(row)) for row in result.mappings()]
+
+    user_columns = [
+        getattr(User, name).label(f"user__{name}") for name in SCHEMA_COLUMNS[User]
+    ]
+    result = await db.execute(
+        select(*columns, *user_columns)
+        .outerjoin(User, User.id == OrgMember.user_id)
+        .where(OrgMember.id.in_(account_ids))
+    )
+    accounts = []
+    for row in result.mappings():
+        data = {name: row[name] for name in SCHEMA_COLUMNS[OrgMember]}
+        data["user"] = (
+            {name: row[f"user__{name}"] for name in SCHEMA_COLUMNS[User]}
+            if row["user__id"] is not None
+            else None
+        )
+        accounts.append(adapter.validate_python(data))
+    return accounts
+
+
+def account_role(account: Union[User, OrgMember, Organization, Admin]) -> str:
+    """Authorization role of an account"""
+    if isinstance(account, OrgMember):
+        return OrgRole(account.role).value
+    if isinstance(account, Organization):
+        return OrgRole.ORG_ADMIN.value
+    if isinstance(account, Admin) or account.user_type == UserType.ADMIN:
+        return "admin"
+    return "user"
+
+
+def token_claims_for(
+    account: Union[User, OrgMember, Organization, Admin],
+) -> TokenClaims:
+    """Identity claims embedded in tokens issued to an account.
+
+    `user_type` names the table the account lives in, so the token subject
+    can be loaded without probing; `role` and `org_id` let authorization
+    checks run on the token alone.
+    """
+    if isinstance(account, (OrgMember, User)):
+        org_id = account.organization_id
+    elif isinstance(account, Organization):
+        org_id = account.id
+    else:
+        org_id = None
+    return TokenClaims(
+        sub=str(account.id),
+        user_type=MODEL_TO_USER_TYPE[type(account)],
+        role=account_role(account),
+        org_id=str(org_id) if org_id else None,
+    )
+
+
+async def reload_token_claims(
+    db: AsyncSession, claims: TokenClaims
+) -> TokenClaims | None:
+    """Current claims of a token's account, or None if it no longer exists.
+
+    Refresh tokens carry identity only; role and organization are read
+    from the account so a demotion or removal holds at the next refresh.
+    """
+    try:
+        if claims.user_type:
+            account = await get_user_by_id_and_type(
+                db, claims.sub, claims.user_type.value
+            )
+        else:
+            account = await get_user_by_id(db, claims.sub)
+    except UserNotFoundException:
+        return None
+    return token_claims_for(account)
 
 
-def register_account(
-    db: Session,
+async def register_account(
+    db: AsyncSession,
     user_data: dict,
     account_type: Literal["user", "organization", "admin", "org_member"],
 ) -> AuthenticatedUserOut:
@@ -74,21 +206,14 @@ def register_account(
         if not organization_id:
             raise ValueError("organization_id is required for org_member registration")
 
-        # For org_members, check if user exists with this email
-        existing_user = get_user_by_email(db, email)
+        # One primary-key lookup tells us which account type owns this email
+        owner = await get_account_email(db, email)
 
         # Check if org_member already exists in the SAME organization with this email
-        existing_org_member_same_org = (
-            db.query(OrgMember)
-            .filter(
-                OrgMember.email == email, OrgMember.organization_id == organization_id
-            )
-            .first()
+        existing_org_member_same_org = await get_org_member_in_organization(
+            db, email, organization_id
         )
 
-        existing_org = get_organization_by_email(db, email)
-        existing_admin = get_admin_by_email(db, email)
-
         # If org_member already exists in the SAME organization, deny registration
         if existing_org_member_same_org:
             raise UserAlreadyExistsException(
@@ -96,53 +221,46 @@ def register_account(
             )
 
         # If organization or admin exists with this email, deny registration
-        if existing_org or existing_admin:
+        if owner and owner.account_type in (UserType.ORGANIZATION, UserType.ADMIN):
             raise UserAlreadyExistsException(
                 "An account with this email already exists"
             )
 
-        if existing_user:
+        if owner and owner.account_type == UserType.USER:
             # Add existing user to organization
             role = user_data.get("role", OrgRole.STAFF)
             if isinstance(role, str):
                 role = OrgRole(role)
 
-            account = add_existing_user_to_org(
+            account = await add_existing_user_to_org(
                 db,
-                user_id=str(existing_user.id),
+                user_id=str(owner.account_id),
                 organization_id=organization_id,
                 role=role,
             )
         else:
-            account = create_org_member_directly(db, **user_data)
+            account = await create_org_member_directly(db, **user_data)
 
     else:
-        # For non-org_member accounts, check for duplicates across all account types
-        if (
-            get_user_by_email(db, email)
-            or get_organization_by_email(db, email)
-            or get_admin_by_email(db, email)
-            or get_org_member_by_email(db, email)
-        ):
+        # For non-org_member accounts, the email must not be claimed by any account
+        if await get_account_email(db, email):
             raise UserAlreadyExistsException(
                 "An account with this email already exists"
             )
 
         if account_type == "organization":
-            account = create_organization_with_email(db, **user_data)
+            account = await create_organization_with_email(db, **user_data)
         elif account_type == "user":
-            account = create_user(db, **user_data)
+            account = await create_user(db, **user_data)
         elif account_type == "admin":
-            account = create_admin(db, **user_data)
+            account = await create_admin(db, **user_data)
         else:
             raise ValueError(
                 "Invalid account_type. Must be 'user', 'organization', 'org_member' or 'admin'."
             )
 
     # Generate access and refresh tokens
-    token_sub = str(account.id)
-    access_token = create_access_token(data={"sub": token_sub})
-    refresh_token = create_refresh_token(data={"sub": token_sub})
+    access_token, refresh_token = await issue_tokens(token_claims_for(account).to_jwt())
 
     schema_account = to_schema(account)
 
@@ -154,35 +272,23 @@ def register_account(
     )
 
 
-def register_user_service_with_response(
-    db: Session,
+async def register_user_service_with_response(
+    db: AsyncSession,
     user_data: dict,
     client_type_raw: str,
     account_type: Literal["user", "organization", "admin", "org_member"] = "user",
-):
-    """Sign up service for all user type"""
+) -> tuple[AuthenticatedUserOut, bool]:
+    """Sign up service for all user type.
+
+    Returns the response model and whether the tokens go in cookies (web
+    clients) rather than in the body.
+    """
     client_type: ClientType = validate_client_type(client_type_raw)
-    auth_out = register_account(db, user_data, account_type)
-
-    if client_type == "web":
-        return {
-            "user": auth_out.user,
-            "access_token": auth_out.access_token,
-            "refresh_token": auth_out.refresh_token,
-            "token_type": auth_out.token_type,
-            "set_cookies": True,
-        }
-    # For mobile, no cookie setting needed
-    return {
-        "user": auth_out.user,
-        "access_token": auth_out.access_token,
-        "refresh_token": auth_out.refresh_token,
-        "token_type": auth_out.token_type,
-        "set_cookies": False,
-    }
+    auth_out = await register_account(db, user_data, account_type)
+    return auth_out, client_type == "web"
 
 
-def check_auth(
+async def check_auth(
     user_obj: Union[User, OrgMember, Organization, Admin, None],
     password: str,
     context: str,
@@ -190,14 +296,14 @@ def check_auth(
     """Shared authentication user login across user types"""
     if not user_obj:
         raise UserNotFoundException(f"{context.capitalize()} not found")
-    if not isinstance(user_obj.hashed_password, str) or not verify_password(
-        password, user_obj.hashed_password
+    if not isinstance(user_obj.hashed_password, str) or not (
+        await verify_password_async(password, user_obj.hashed_password)
     ):
         raise PasswordException(f"Invalid password for {context}")
 
 
-def authenticate_by_context(
-    db: Session,
+async def authenticate_by_context(
+    db: AsyncSession,
     email: str,
     password: str,
     login_context: Literal["user", "organization", "admin", "org_member"] = "user",
@@ -207,66 +313,59 @@ def authenticate_by_context(
     normalized_email = email.strip().lower()
 
     if login_context == "org_member":
-        org_member = get_org_member_by_email(db, normalized_email)
+        org_member = await get_org_member_by_email(db, normalized_email)
         if not org_member:
             raise UserNotFoundException("Organization member not found")
-        check_auth(org_member, password, context="org_member")
+        await check_auth(org_member, password, context="org_member")
         if org_member.role is None:
             raise UserNotFoundException("Organization member role not found")
-        return (org_member, UserType.ORG_MEMBER, str(org_member.role), "bearer")
+        return (org_member, UserType.ORG_MEMBER, account_role(org_member), "bearer")
 
     if login_context == "organization":
-        org = get_organization_by_email(db, normalized_email)
+        org = await get_organization_by_email(db, normalized_email)
         if not org:
             raise UserNotFoundException("Organization not found")
-        check_auth(org, password, context="organization")
+        await check_auth(org, password, context="organization")
         return org, UserType.ORGANIZATION, "org_admin", "bearer"
 
     if login_context == "admin":
-        admin = get_admin_by_email(db, normalized_email)
+        admin = await get_admin_by_email(db, normalized_email)
         if not admin:
             raise UserNotFoundException("Admin not found")
-        check_auth(admin, password, context="admin")
+        await check_auth(admin, password, context="admin")
         return admin, UserType.ADMIN, "admin", "bearer"
 
-    user = get_user_by_email(db, normalized_email)
-    check_auth(user, password, context="user")
+    user = await get_user_by_email(db, normalized_email)
+    await check_auth(user, password, context="user")
 
-    if user is not None and str(user.user_type) == UserType.ADMIN.value:
+    if user is not None and user.user_type == UserType.ADMIN:
         return user, UserType.ADMIN, "admin", "bearer"
 
     return user, UserType.USER, "user", "bearer"
 
 
-def login_user_service_with_response(
-    db: Session,
+async def login_user_service_with_response(
+    db: AsyncSession,
     email: str,
     password: str,
     client_type_raw: str,
     login_context: Literal["user", "organization", "admin", "org_member"] = "user",
-):
-    """Login service for all user type"""
+) -> tuple[AuthenticatedUserOut, bool]:
+    """Login service for all user type.
+
+    Returns the response model and whether the tokens go in cookies.
+    """
     client_type: ClientType = validate_client_type(client_type_raw)
-    user, user_type, role, token_type = authenticate_by_context(
+    user, _, _, token_type = await authenticate_by_context(
         db, email, password, login_context
     )
 
-    tokens = {
-        "access_token": create_access_token(data={"sub": str(user.id)}),
-        "refresh_token": create_refresh_token(data={"sub": str(user.id)}),
-        "token_type": token_type,
-    }
-
-    response = {
-        "user": to_schema(user),
-        **tokens,
-        "user_type": user_type,
-        "role": role,
-        "set_cookies": client_type == "web",
-    }
-
-    if client_type == "web":
-        response["access_token"] = None
-        response["refresh_token"] = None
+    access_token, refresh_token = await issue_tokens(token_claims_for(user).to_jwt())
 
-    return response
+    auth_out = AuthenticatedUserOut(
+        user=to_schema(user),
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type=token_type,
+    )
+    return auth_out, client_type == "web"
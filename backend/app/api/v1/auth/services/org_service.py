@@ -0,0 +1,448 @@
+"""Organization Service: member listing, bulk onboarding and export"""
+
+import asyncio
+import csv
+import io
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+import orjson
+from app.api.core.config import settings
+from app.api.db.session import AsyncSessionLocal
+from app.api.v1.auth.crud import (
+    assign_patient,
+    bulk_create_org_members,
+    get_assigned_patients_page,
+    get_import_email_owners,
+    get_memberships_page,
+    get_org_members_page,
+    stream_org_member_export,
+)
+from app.api.v1.auth.models.user import OrgMember, User
+from app.api.v1.auth.schemas.org import (
+    AssignedPatientPage,
+    OrgMemberImportReport,
+    OrgMemberImportResult,
+    OrgMemberImportRow,
+    OrgMemberPage,
+)
+from app.api.v1.auth.schemas.user.user import UserOut
+from app.api.v1.auth.services.auth_service import to_schema
+from lib.errorlib.auth import UserNotAuthorizedException, UserNotFoundException
+from lib.utils.enums import OrgRole, UserType
+from lib.utils.pagination import decode_cursor, encode_cursor
+from lib.utils.password_hasher import password_hasher
+from lib.utils.user import TokenClaims, hash_password_async, is_strong_password
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+IMPORT_FORMATS = {"text/csv": "csv", "application/x-ndjson": "ndjson"}
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+EXPORT_CSV_FIELDS = (
+    "id",
+    "username",
+    "email",
+    "full_name",
+    "role",
+    "is_active",
+    "joined_at",
+    "user_id",
+    "user_username",
+    "user_email",
+    "assigned_patient_count",
+    "assigned_patient_ids",
+)
+
+IMPORT_ROW_ADAPTER = TypeAdapter(OrgMemberImportRow)
+
+
+def _member_page(members: list[OrgMember], limit: int) -> OrgMemberPage:
+    """Trim the look-ahead row and point the cursor at the last row kept"""
+    next_cursor = None
+    if len(members) > limit:
+        members = members[:limit]
+        last = members[-1]
+        next_cursor = encode_cursor(last.joined_at.isoformat(), last.id)
+    return OrgMemberPage(
+        items=[to_schema(member) for member in members], next_cursor=next_cursor
+    )
+
+
+async def list_org_members(
+    db: AsyncSession,
+    organization_id: str,
+    limit: int,
+    cursor: str | None = None,
+    role: OrgRole | None = None,
+    is_active: bool | None = None,
+) -> OrgMemberPage:
+    """Page through an organization's members, oldest first"""
+    after = decode_cursor(cursor, datetime, str) if cursor else None
+    members = await get_org_members_page(
+        db, organization_id, limit, after, role=role, is_active=is_active
+    )
+    return _member_page(members, limit)
+
+
+async def list_memberships(
+    db: AsyncSession,
+    claims: TokenClaims,
+    limit: int,
+    cursor: str | None = None,
+    is_active: bool | None = None,
+) -> OrgMemberPage:
+    """Page through the caller's memberships across organizations"""
+    after = decode_cursor(cursor, datetime, str) if cursor else None
+    if claims.user_type == UserType.USER:
+        members = await get_memberships_page(
+            db, limit, after, user_id=claims.sub, is_active=is_active
+        )
+    elif claims.user_type == UserType.ORG_MEMBER:
+        member = await db.get(OrgMember, claims.sub)
+        if member is None:
+            raise UserNotFoundException()
+        members = await get_memberships_page(
+            db, limit, after, email=member.email, is_active=is_active
+        )
+    else:
+        raise UserNotAuthorizedException()
+    return _member_page(members, limit)
+
+
+async def list_assigned_patients(
+    db: AsyncSession,
+    claims: TokenClaims,
+    staff_id: str,
+    limit: int,
+    cursor: str | None = None,
+) -> AssignedPatientPage:
+    """Page through a staff member's patients.
+
+    Visible to the staff member and to admins of their organization.
+    """
+    staff = await db.get(OrgMember, staff_id)
+    if staff is None or staff.organization_id != claims.org_id:
+        raise UserNotFoundException()
+    if claims.sub != staff_id and claims.role != OrgRole.ORG_ADMIN.value:
+        raise UserNotAuthorizedException()
+
+    after = decode_cursor(cursor, str)[0] if cursor else None
+    patients = await get_assigned_patients_page(db, staff_id, limit, after)
+    next_cursor = None
+    if len(patients) > limit:
+        patients = patients[:limit]
+        next_cursor = encode_cursor(patients[-1].id)
+    return AssignedPatientPage(
+        items=[to_schema(patient) for patient in patients], next_cursor=next_cursor
+    )
+
+
+async def assign_patient_to_staff(
+    db: AsyncSession, organization_id: str, patient_id: str, staff_id: str | None
+) -> UserOut:
+    """Assign one of an organization's patients to one of its members"""
+    patient = await db.get(User, patient_id)
+    if patient is None or patient.organization_id != organization_id:
+        raise UserNotFoundException("Patient not found")
+    if staff_id is not None:
+        staff = await db.get(OrgMember, staff_id)
+        if staff is None or staff.organization_id != organization_id:
+            raise UserNotFoundException("Staff member not found")
+    return to_schema(await assign_patient(db, patient_id, staff_id))
+
+
+class ImportFormatError(ValueError):
+    """The import body cannot be read as a whole"""
+
+
+def parse_import_rows(body: bytes, content_type: str) -> list[dict | str]:
+    """Split an import body into raw rows; unreadable rows become messages"""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type not in IMPORT_FORMATS:
+        raise ImportFormatError(
+            "Content-Type must be one of: " + ", ".join(IMPORT_FORMATS)
+        )
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise ImportFormatError("Import must be UTF-8 encoded") from exc
+
+    rows: list[dict | str] = []
+    if IMPORT_FORMATS[media_type] == "csv":
+        for record in csv.DictReader(io.StringIO(text)):
+            # Blank cells are missing values, not empty strings
+            rows.append({key: value for key, value in record.items() if value})
+    else:
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                rows.append("Invalid JSON")
+                continue
+            rows.append(record if isinstance(record, dict) else "Expected an object")
+
+    if len(rows) > settings.ORG_IMPORT_MAX_ROWS:
+        raise ImportFormatError(
+            f"Import is limited to {settings.ORG_IMPORT_MAX_ROWS} rows"
+        )
+    return rows
+
+
+def _validation_message(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+async def hash_passwords(passwords: list[str]) -> list[str]:
+    """Hash passwords concurrently, never queueing more than the pool runs"""
+    semaphore = asyncio.Semaphore(password_hasher.workers)
+
+    async def hash_one(password: str) -> str:
+        async with semaphore:
+            return await hash_password_async(password)
+
+    return await asyncio.gather(*(hash_one(password) for password in passwords))
+
+
+async def _insert_chunk(
+    db: AsyncSession, members: list[dict], claimed_emails: set[str]
+) -> dict[str, str]:
+    """Insert a chunk in one transaction, falling back to one row at a time.
+
+    Returns the errors of rows that could not be inserted, by member id.
+    """
+    try:
+        await bulk_create_org_members(db, members, claimed_emails)
+        return {}
+    except IntegrityError:
+        if len(members) == 1:
+            return {members[0]["id"]: "Email or username already taken"}
+    # Another request claimed something since the collision check
+    errors: dict[str, str] = {}
+    for member in members:
+        errors.update(await _insert_chunk(db, [member], claimed_emails))
+    return errors
+
+
+async def import_org_members(
+    db: AsyncSession, organization_id: str, body: bytes, content_type: str
+) -> OrgMemberImportReport:
+    """Validate, hash and insert a CSV/NDJSON batch of org members"""
+    raw_rows = parse_import_rows(body, content_type)
+    results: list[OrgMemberImportResult | None] = [None] * len(raw_rows)
+
+    def fail(index: int, email: str | None, error: str) -> None:
+        results[index] = OrgMemberImportResult(
+            row=index + 1, email=email, status="error", error=error
+        )
+
+    # Validate every row before touching the database
+    valid: list[tuple[int, OrgMemberImportRow, str]] = []
+    seen: set[str] = set()
+    for index, raw in enumerate(raw_rows):
+        if isinstance(raw, str):
+            fail(index, None, raw)
+            continue
+        raw_email = raw.get("email")
+        raw_email = raw_email if isinstance(raw_email, str) else None
+        try:
+            row = IMPORT_ROW_ADAPTER.validate_python(raw)
+        except ValidationError as exc:
+            fail(index, raw_email, _validation_message(exc))
+            continue
+        email = str(row.email).strip().lower()
+        if not is_strong_password(row.password):
+            fail(index, email, "Password is too weak")
+        elif email in seen:
+            fail(index, email, "Duplicate email in import")
+        else:
+            seen.add(email)
+            valid.append((index, row, email))
+
+    # One set-based query for every email in the file
+    owners = await get_import_email_owners(
+        db, organization_id, [email for _, _, email in valid]
+    )
+    # Same ownership rule as registration: a user's email links that user
+    # to the organization, any other account type's email is taken
+    pending: list[tuple[int, OrgMemberImportRow, str, User | None]] = []
+    for index, row, email in valid:
+        owner = owners.get(email)
+        if owner is None:
+            pending.append((index, row, email, None))
+        elif owner[1]:
+            fail(index, email, "Already a member of this organization")
+        elif owner[0] == UserType.USER:
+            pending.append((index, row, email, owner[2]))
+        elif owner[0] != UserType.ORG_MEMBER:
+            fail(index, email, "An account with this email already exists")
+        else:
+            pending.append((index, row, email, None))
+
+    hashed = iter(
+        await hash_passwords(
+            [row.password for _, row, _, user in pending if user is None]
+        )
+    )
+
+    # One join time for the whole import; keyset pages break the tie by id
+    joined_at = datetime.now()
+    members = []
+    for _, row, email, user in pending:
+        member = {
+            "id": str(uuid.uuid4()),
+            "organization_id": organization_id,
+            "user_id": None,
+            "username": row.username,
+            "email": email,
+            "full_name": row.full_name,
+            "role": row.role,
+            "joined_at": joined_at,
+        }
+        if user is None:
+            member["hashed_password"] = next(hashed)
+        else:
+            # A linked membership carries the user's own identity
+            member.update(
+                user_id=str(user.id),
+                username=user.username,
+                full_name=user.full_name,
+                hashed_password=user.hashed_password,
+            )
+        members.append(member)
+    claimed_emails = set(owners)
+    for start in range(0, len(members), settings.ORG_IMPORT_CHUNK_SIZE):
+        chunk = members[start : start + settings.ORG_IMPORT_CHUNK_SIZE]
+        errors = await _insert_chunk(db, chunk, claimed_emails)
+        for (index, _, email, _), member in zip(
+            pending[start : start + settings.ORG_IMPORT_CHUNK_SIZE], chunk
+        ):
+            if member["id"] in errors:
+                fail(index, email, errors[member["id"]])
+            else:
+                results[index] = OrgMemberImportResult(
+                    row=index + 1, email=email, status="created", id=member["id"]
+                )
+
+    created = sum(1 for result in results if result and result.status == "created")
+    return OrgMemberImportReport(
+        total=len(results),
+        created=created,
+        failed=len(results) - created,
+        results=[result for result in results if result is not None],
+    )
+
+
+def _export_record(rows: list[Row]) -> dict:
+    """Fold one member's export rows into a nested record"""
+    first = rows[0]
+    user = None
+    if first.user_id is not None:
+        user = {
+            "id": first.user_id,
+            "username": first.user_username,
+            "email": first.user_email,
+            "full_name": first.user_full_name,
+        }
+    return {
+        "id": first.id,
+        "username": first.username,
+        "email": first.email,
+        "full_name": first.full_name,
+        "role": first.role.value if first.role else None,
+        "is_active": first.is_active,
+        "joined_at": first.joined_at.isoformat() if first.joined_at else None,
+        "user": user,
+        "assigned_patients": [
+            {
+                "id": row.patient_id,
+                "username": row.patient_username,
+                "email": row.patient_email,
+                "full_name": row.patient_full_name,
+            }
+            for row in rows
+            if row.patient_id is not None
+        ],
+    }
+
+
+async def _stream_member_records(organization_id: str) -> AsyncIterator[dict]:
+    """Member records of an organization, read off a server-side cursor.
+
+    Opens its own session: a streamed response body is sent after the
+    request's dependencies, and their session, have already closed.
+    """
+    async with AsyncSessionLocal() as db:
+        group: list[Row] = []
+        async for row in stream_org_member_export(
+            db, organization_id, settings.ORG_EXPORT_BATCH_SIZE
+        ):
+            if group and row.id != group[0].id:
+                yield _export_record(group)
+                group = []
+            group.append(row)
+        if group:
+            yield _export_record(group)
+
+
+def _csv_row(record: dict) -> list:
+    user = record["user"] or {}
+    patients = record["assigned_patients"]
+    return [
+        record["id"],
+        record["username"],
+        record["email"],
+        record["full_name"],
+        record["role"],
+        record["is_active"],
+        record["joined_at"],
+        user.get("id"),
+        user.get("username"),
+        user.get("email"),
+        len(patients),
+        ";".join(patient["id"] for patient in patients),
+    ]
+
+
+async def export_org_members(
+    organization_id: str, export_format: str
+) -> AsyncIterator[bytes]:
+    """Encode an organization's members as NDJSON or CSV chunks.
+
+    Each chunk holds up to ORG_EXPORT_BATCH_SIZE members, so only one
+    batch is ever held in memory.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if export_format == "csv" else None
+    chunk: list[bytes] = []
+    if writer is not None:
+        writer.writerow(EXPORT_CSV_FIELDS)
+
+    def take_csv() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    count = 0
+    async for record in _stream_member_records(organization_id):
+        if writer is not None:
+            writer.writerow(_csv_row(record))
+        else:
+            chunk.append(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+        count += 1
+        if count % settings.ORG_EXPORT_BATCH_SIZE == 0:
+            yield take_csv() if writer is not None else b"".join(chunk)
+            chunk = []
+
+    tail = take_csv() if writer is not None else b"".join(chunk)
+    if tail:
+        yield tail
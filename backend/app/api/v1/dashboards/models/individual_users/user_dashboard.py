@@ -4,12 +4,32 @@ health metrics"""
 import uuid as uuid_lib
 
 from app.api.core.base import Base
-from sqlalchemy import JSON, UUID, Column, ForeignKey
+from lib.utils.enums import AlertSeverity, HealthMetric, RollupResolution
+from sqlalchemy import (
+    JSON,
+    UUID,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 
 class UserDashboard(Base):
-    """User Dashboard Model"""
+    """User Dashboard Model.
+
+    `derived_due_on` is the day the age and BMI in `bio_data` next go
+    stale: the next birthday once they are derived, today when bio data
+    is written without deriving them, NULL when nothing will change them.
+    The nightly recompute reads only the due rows, from its index.
+    """
 
     __tablename__ = "user_dashboards"
 
@@ -24,9 +44,112 @@ class UserDashboard(Base):
     personal_info = Column(JSON)
     bio_data = Column(JSON)
     health_metrics = Column(JSON)
+    derived_due_on = Column(Date, nullable=True, default=func.current_date())
 
     user = relationship("User", back_populates="dashboard")
 
+    __table_args__ = (
+        Index("ix_user_dashboards_derived_due_on_id", "derived_due_on", "id"),
+    )
+
     def __repr__(self):
         """String representation of Dashboard"""
         return f"<UserDashboard(id={self.id}, user_id={self.user_id})>"
+
+
+class HealthReading(Base):
+    """One timestamped health metric reading.
+
+    Append-only and narrow: a new reading is one row, never a rewrite of
+    the dashboard's JSON. The primary key (user_id, metric, ts) is the only
+    index needed: history is a range scan on it and the latest value is one
+    backward seek.
+    """
+
+    __tablename__ = "health_readings"
+
+    user_id = Column(
+        UUID(as_uuid=False), ForeignKey("users.id"), primary_key=True, nullable=False
+    )
+    metric = Column(Enum(HealthMetric), primary_key=True, nullable=False)
+    ts = Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    value = Column(Float, nullable=False)
+
+    def __repr__(self):
+        """String representation of HealthReading"""
+        return (
+            f"<HealthReading(user_id={self.user_id}, metric={self.metric}, "
+            f"ts={self.ts}, value={self.value})>"
+        )
+
+
+class HealthRollup(Base):
+    """Aggregate of one metric's readings over a minute, hour or day.
+
+    Maintained incrementally as readings are written, so a chart over any
+    window reads at most a few hundred buckets from one primary key range.
+    """
+
+    __tablename__ = "health_rollups"
+
+    user_id = Column(
+        UUID(as_uuid=False), ForeignKey("users.id"), primary_key=True, nullable=False
+    )
+    metric = Column(Enum(HealthMetric), primary_key=True, nullable=False)
+    resolution = Column(Enum(RollupResolution), primary_key=True, nullable=False)
+    bucket = Column(DateTime(timezone=True), primary_key=True, nullable=False)
+    count = Column(Integer, nullable=False)
+    sum = Column(Float, nullable=False)
+    min = Column(Float, nullable=False)
+    max = Column(Float, nullable=False)
+
+    def __repr__(self):
+        """String representation of HealthRollup"""
+        return (
+            f"<HealthRollup(user_id={self.user_id}, metric={self.metric}, "
+            f"resolution={self.resolution}, bucket={self.bucket})>"
+        )
+
+
+class HealthAlert(Base):
+    """An alert raised by a rule on a user's readings.
+
+    Active until resolved; the user's active alerts are one range scan of
+    the partial (user_id, created_at) index.
+    """
+
+    __tablename__ = "health_alerts"
+
+    id = Column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid_lib.uuid4()),
+        autoincrement=False,
+    )
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    rule = Column(String(64), nullable=False)
+    metric = Column(Enum(HealthMetric), nullable=False)
+    severity = Column(Enum(AlertSeverity), nullable=False)
+    message = Column(String(255), nullable=False)
+    value = Column(Float, nullable=False)
+    ts = Column(DateTime(timezone=True), nullable=False)
+    count = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
+    resolved_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_health_alerts_active_user_id_created_at",
+            "user_id",
+            "created_at",
+            postgresql_where=resolved_at.is_(None),
+            sqlite_where=resolved_at.is_(None),
+        ),
+    )
+
+    def __repr__(self):
+        """String representation of HealthAlert"""
+        return (
+            f"<HealthAlert(id={self.id}, user_id={self.user_id}, "
+            f"rule={self.rule}, ts={self.ts})>"
+        )
@@ -0,0 +1,82 @@
+"""Organization dashboard summaries: staff, patient and alert counts"""
+
+from app.api.core.base import Base
+from lib.utils.enums import AlertSeverity, OrgRole
+from sqlalchemy import UUID, Column, ForeignKey, Index, Integer, String
+
+# Names of the counts kept per organization
+ORG_PATIENTS = "patients"
+ORG_UNASSIGNED_PATIENTS = "patients:unassigned"
+
+
+def staff_count_name(role: OrgRole) -> str:
+    """Name of the count of members with a role"""
+    return f"staff:{role.name}"
+
+
+def alert_count_name(severity: AlertSeverity) -> str:
+    """Name of the count of active alerts of a severity"""
+    return f"alerts:{severity.name}"
+
+
+class OrgDashboardCount(Base):
+    """One named count on an organization's dashboard.
+
+    Adjusted by each membership, role, assignment and alert change in
+    that change's own transaction, so the dashboard reads one primary key
+    range instead of counting members, patients and alerts.
+    """
+
+    __tablename__ = "org_dashboard_counts"
+
+    organization_id = Column(
+        UUID(as_uuid=False),
+        ForeignKey("organizations.id"),
+        primary_key=True,
+        nullable=False,
+    )
+    name = Column(String(64), primary_key=True, nullable=False)
+    count = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        """String representation of OrgDashboardCount"""
+        return (
+            f"<OrgDashboardCount(organization_id={self.organization_id}, "
+            f"name={self.name}, count={self.count})>"
+        )
+
+
+class OrgStaffPatientCount(Base):
+    """Number of patients assigned to one staff member.
+
+    The (organization_id, patients) index lists an organization's most
+    loaded staff without scanning its members.
+    """
+
+    __tablename__ = "org_staff_patient_counts"
+    __table_args__ = (
+        Index(
+            "ix_org_staff_patient_counts_organization_id_patients_member_id",
+            "organization_id",
+            "patients",
+            "member_id",
+        ),
+    )
+
+    member_id = Column(
+        UUID(as_uuid=False),
+        ForeignKey("org_members.id"),
+        primary_key=True,
+        nullable=False,
+    )
+    organization_id = Column(
+        UUID(as_uuid=False), ForeignKey("organizations.id"), nullable=False
+    )
+    patients = Column(Integer, nullable=False)
+
+    def __repr__(self):
+        """String representation of OrgStaffPatientCount"""
+        return (
+            f"<OrgStaffPatientCount(member_id={self.member_id}, "
+            f"patients={self.patients})>"
+        )
@@ -0,0 +1,25 @@
+"""Organization dashboard APIs: staff, patient and alert summaries"""
+
+from app.api.core.dependencies.auth import require_roles
+from app.api.core.responses import ModelResponse
+from app.api.db.session import get_async_db
+from app.api.v1.auth.schemas.org import OrgDashboard
+from app.api.v1.dashboards.services.org_dashboard_service import org_dashboard
+from fastapi import APIRouter, Depends, HTTPException
+from lib.utils.enums import OrgRole
+from lib.utils.user import TokenClaims
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter(prefix="/organization", tags=["Organization Dashboard"])
+
+
+@router.get("/dashboard", response_model=OrgDashboard)
+async def read_org_dashboard(
+    claims: TokenClaims = Depends(require_roles(OrgRole.ORG_ADMIN.value)),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Staff by role, patients, staff workloads and active alerts"""
+    if not claims.org_id:
+        raise HTTPException(status_code=403, detail="No organization in token")
+
+    return ModelResponse(await org_dashboard(db, claims.org_id))
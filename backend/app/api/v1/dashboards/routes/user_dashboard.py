@@ -0,0 +1,141 @@
+"""User dashboard APIs: bio data, health metric readings, charts and alerts"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.api.core.dependencies.auth import get_token_claims
+from app.api.core.responses import ModelResponse
+from app.api.db.session import get_async_db
+from app.api.v1.auth.schemas.user.user_dashboard import (
+    BioDataOut,
+    BioDataUpdate,
+    HealthAlertList,
+    HealthAlertOut,
+    HealthMetrics,
+    HealthReadingBatch,
+    HealthReadingBatchResult,
+    HealthSeries,
+    LatestHealthMetrics,
+)
+from app.api.v1.dashboards.services.user_dashboard_service import (
+    active_alerts,
+    as_utc,
+    get_bio_data,
+    health_series,
+    ingest_readings,
+    latest_health_metrics,
+    record_health_metrics,
+    resolve_alert,
+    update_bio_data,
+)
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from lib.errorlib.auth import IngestBufferFullException, UserNotAuthorizedException
+from lib.utils.enums import HealthMetric, UserType
+from lib.utils.user import TokenClaims
+from lib.utils.write_buffer import BufferFullError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+async def get_dashboard_owner(
+    claims: TokenClaims = Depends(get_token_claims),
+) -> TokenClaims:
+    """Only individual users have a health dashboard"""
+    if claims.user_type != UserType.USER:
+        raise UserNotAuthorizedException()
+    return claims
+
+
+@router.get("/bio-data", response_model=BioDataOut)
+async def read_bio_data(
+    claims: TokenClaims = Depends(get_dashboard_owner),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Bio data with derived age and BMI"""
+    return ModelResponse(await get_bio_data(db, claims.sub))
+
+
+@router.patch("/bio-data", response_model=BioDataOut)
+async def patch_bio_data(
+    changes: BioDataUpdate,
+    claims: TokenClaims = Depends(get_dashboard_owner),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Update bio data; age and BMI are recomputed"""
+    return ModelResponse(await update_bio_data(db, claims.sub, changes))
+
+
+@router.post(
+    "/metrics/readings",
+    response_model=HealthReadingBatchResult,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def add_readings(
+    batch: HealthReadingBatch,
+    claims: TokenClaims = Depends(get_dashboard_owner),
+):
+    """Queue a batch of health metric readings; 429 when the buffer is full"""
+    try:
+        accepted = ingest_readings(claims.sub, batch.readings)
+    except BufferFullError as exc:
+        raise IngestBufferFullException() from exc
+    return ModelResponse(
+        HealthReadingBatchResult(accepted=accepted),
+        status_code=status.HTTP_202_ACCEPTED,
+    )
+
+
+@router.put("/metrics", response_model=LatestHealthMetrics)
+async def update_metrics(
+    metrics: HealthMetrics,
+    claims: TokenClaims = Depends(get_dashboard_owner),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Record a health metrics snapshot"""
+    return ModelResponse(await record_health_metrics(db, claims.sub, metrics))
+
+
+@router.get("/metrics", response_model=LatestHealthMetrics)
+async def get_metrics(
+    claims: TokenClaims = Depends(get_dashboard_owner),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Latest health metrics"""
+    return ModelResponse(await latest_health_metrics(db, claims.sub))
+
+
+@router.get("/metrics/{metric}/series", response_model=HealthSeries)
+async def get_metric_series(
+    metric: HealthMetric,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    max_points: int = Query(500, ge=1, le=5000),
+    claims: TokenClaims = Depends(get_dashboard_owner),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Chart points for a metric; defaults to the last 24 hours"""
+    end = as_utc(end, datetime.now(timezone.utc))
+    start = as_utc(start, end - timedelta(days=1))
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    series = await health_series(db, claims.sub, metric, start, end, max_points)
+    return ModelResponse(series)
+
+
+@router.get("/alerts", response_model=HealthAlertList)
+async def get_alerts(
+    claims: TokenClaims = Depends(get_dashboard_owner),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Active health alerts"""
+    return ModelResponse(await active_alerts(db, claims.sub))
+
+
+@router.post("/alerts/{alert_id}/resolve", response_model=HealthAlertOut)
+async def resolve_health_alert(
+    alert_id: str,
+    claims: TokenClaims = Depends(get_dashboard_owner),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Resolve an alert"""
+    return ModelResponse(await resolve_alert(db, claims.sub, alert_id))
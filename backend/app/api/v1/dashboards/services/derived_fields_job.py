@@ -0,0 +1,81 @@
+"""Nightly recompute of derived bio data fields.
+
+Age goes stale on birthdays, and age and BMI go stale whenever bio data
+is written without rederiving them. Each dashboard records the day its
+derived fields next go stale (`derived_due_on`), so a run reads only the
+dashboards due, a chunk at a time from that index, recomputes each chunk
+column-wise and writes it back with one bulk UPDATE.
+"""
+
+import math
+import time
+from datetime import date
+
+from app.api.core.config import settings
+from app.api.db.session import AsyncSessionLocal
+from app.api.v1.auth.crud import get_derived_fields_due, update_derived_fields
+from lib.userlib.user_dashboard import derive_bio_fields
+from lib.utils.daily_job import DailyJob
+from lib.utils.user_dashboard import next_birthday
+
+
+def derived_updates(rows: list[tuple], on: date) -> list[dict]:
+    """Bulk update parameters rederiving a chunk of (id, bio_data, due) rows"""
+    ages, bmis = derive_bio_fields([bio_data for _, bio_data, _ in rows], on)
+    birthdays = next_birthday(
+        [(bio_data or {}).get("dob") for _, bio_data, _ in rows], on
+    )
+    return [
+        {
+            "dashboard_id": dashboard_id,
+            "due": due,
+            "bio_data": (
+                None if bio_data is None else {**bio_data, "age": age, "bmi": bmi}
+            ),
+            "next_due": birthday,
+        }
+        for (dashboard_id, bio_data, due), age, bmi, birthday in zip(
+            rows,
+            [None if math.isnan(age) else int(age) for age in ages.tolist()],
+            [None if math.isnan(bmi) else bmi for bmi in bmis.tolist()],
+            birthdays.tolist(),
+        )
+    ]
+
+
+async def recompute_derived_fields(
+    on: date, chunk_size: int = settings.DERIVED_FIELDS_CHUNK_SIZE
+) -> dict:
+    """Rederive age and BMI on every dashboard due by a day.
+
+    Returns the rows scanned and updated, rows per second and the lag:
+    how many days the most overdue row waited.
+    """
+    start = time.perf_counter()
+    scanned = updated = chunks = 0
+    oldest = None
+    after = None
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows = await get_derived_fields_due(db, on, chunk_size, after)
+            if not rows:
+                break
+            updated += await update_derived_fields(db, derived_updates(rows, on))
+        if oldest is None:
+            oldest = rows[0][2]
+        scanned += len(rows)
+        chunks += 1
+        after = (rows[-1][2], rows[-1][0])
+    seconds = time.perf_counter() - start
+    return {
+        "scanned": scanned,
+        "updated": updated,
+        "chunks": chunks,
+        "rows_per_second": scanned / seconds if seconds > 0 else 0.0,
+        "lag_days": (on - oldest).days if oldest is not None else 0,
+    }
+
+
+derived_fields_job = DailyJob(
+    "derived_fields", recompute_derived_fields, hour=settings.DERIVED_FIELDS_JOB_HOUR
+)
@@ -0,0 +1,39 @@
+"""Organization Dashboard Service: staff, patient and alert summaries"""
+
+from app.api.core.config import settings
+from app.api.v1.auth.crud import get_busiest_staff, get_org_counts
+from app.api.v1.auth.schemas.org import OrgDashboard, StaffWorkload
+from app.api.v1.dashboards.models.organization.org_dashboard import (
+    ORG_PATIENTS,
+    ORG_UNASSIGNED_PATIENTS,
+    alert_count_name,
+    staff_count_name,
+)
+from lib.utils.enums import AlertSeverity, OrgRole
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def org_dashboard(db: AsyncSession, organization_id: str) -> OrgDashboard:
+    """An organization's dashboard, from its maintained counts.
+
+    Two index reads however large the organization: its counts, and its
+    ORG_DASHBOARD_BUSIEST_STAFF most loaded staff members.
+    """
+    counts = await get_org_counts(db, organization_id)
+    busiest = await get_busiest_staff(
+        db, organization_id, settings.ORG_DASHBOARD_BUSIEST_STAFF
+    )
+    staff = {role: counts.get(staff_count_name(role), 0) for role in OrgRole}
+    alerts = {
+        severity: counts.get(alert_count_name(severity), 0)
+        for severity in AlertSeverity
+    }
+    return OrgDashboard(
+        staff=staff,
+        staff_total=sum(staff.values()),
+        patients=counts.get(ORG_PATIENTS, 0),
+        unassigned_patients=counts.get(ORG_UNASSIGNED_PATIENTS, 0),
+        active_alerts=alerts,
+        active_alerts_total=sum(alerts.values()),
+        busiest_staff=[StaffWorkload.model_validate(row) for row in busiest],
+    )
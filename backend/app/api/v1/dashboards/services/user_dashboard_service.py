@@ -1,9 +1,286 @@
-def update_age_on_dob_change():
-    pass
+"""User Dashboard Service: health metric readings, alerts and dashboard views"""
 
+import math
+from datetime import date, datetime, timezone
 
-def generate_alerts():
-    pass
+from app.api.core.config import settings
+from app.api.db.session import AsyncSessionLocal
+from app.api.v1.auth.crud import (
+    add_health_alerts,
+    append_health_readings,
+    count_alerts,
+    fold_health_alerts,
+    get_active_alert_ids,
+    get_active_alerts,
+    get_latest_readings,
+    get_rollup_series,
+    get_user_dashboard_by_user_id,
+    resolve_health_alert,
+    save_bio_data,
+    update_health_metrics,
+)
+from app.api.v1.auth.schemas.user.user_dashboard import (
+    AlertWarnings,
+    BioDataOut,
+    BioDataUpdate,
+    HealthAlertList,
+    HealthAlertOut,
+    HealthMetrics,
+    HealthReadingIn,
+    HealthSeries,
+    HealthSeriesPoint,
+    LatestHealthMetrics,
+)
+from lib.errorlib.auth import AlertNotFoundException
+from lib.userlib.user_dashboard import alert_engine, derive_bio_fields
+from lib.utils.alert_state import alert_state
+from lib.utils.enums import HealthMetric, Unit
+from lib.utils.redis_client import redis_client
+from lib.utils.rollups import bucket_start, pick_resolution
+from lib.utils.user_dashboard import UNIT_BASES, next_birthday, unit_converter
+from lib.utils.write_buffer import WriteBuffer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def as_utc(ts: datetime | None, default: datetime) -> datetime:
+    """Readings are stored in UTC; naive timestamps are taken to be UTC"""
+    if ts is None:
+        return default
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def reading_rows(user_id: str, readings: list[HealthReadingIn]) -> list[dict]:
+    """Insert rows for a batch, stamping readings sent without a time.
+
+    Values sent in another unit are converted, one column per unit.
+    """
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": user_id,
+            "metric": reading.metric,
+            "ts": as_utc(reading.ts, now),
+            "value": reading.value,
+        }
+        for reading in readings
+    ]
+    by_unit: dict[Unit, list[int]] = {}
+    for position, reading in enumerate(readings):
+        if reading.unit is not None and reading.unit is not UNIT_BASES[reading.unit]:
+            by_unit.setdefault(reading.unit, []).append(position)
+    for unit, positions in by_unit.items():
+        converted = unit_converter(
+            [rows[position]["value"] for position in positions], unit, UNIT_BASES[unit]
+        )
+        for position, value in zip(positions, converted.tolist()):
+            rows[position]["value"] = value
+    return rows
+
+
+async def write_readings(rows: list[dict]) -> None:
+    """Flush buffered readings with one bulk insert, raising their alerts"""
+    async with AsyncSessionLocal() as db:
+        inserted = await append_health_readings(db, rows)
+        await generate_alerts(db, inserted)
+
+
+# Per-worker buffer between reading ingestion and the database
+reading_buffer = WriteBuffer(
+    write_readings,
+    max_rows=settings.READINGS_BUFFER_MAX_ROWS,
+    flush_rows=settings.READINGS_BUFFER_FLUSH_ROWS,
+    flush_seconds=settings.READINGS_BUFFER_FLUSH_SECONDS,
+    max_attempts=settings.READINGS_BUFFER_MAX_ATTEMPTS,
+)
+
+
+def ingest_readings(user_id: str, readings: list[HealthReadingIn]) -> int:
+    """Queue a batch of readings for the next bulk insert.
+
+    Raises BufferFullError when the buffer is saturated.
+    """
+    rows = reading_rows(user_id, readings)
+    reading_buffer.add(rows)
+    return len(rows)
+
+
+async def record_health_metrics(
+    db: AsyncSession, user_id: str, metrics: HealthMetrics
+) -> LatestHealthMetrics:
+    """Record a HealthMetrics snapshot: numeric fields become readings"""
+    data = metrics.model_dump(mode="json", exclude_none=True)
+    readings = {
+        metric: data.pop(metric.value)
+        for metric in HealthMetric
+        if metric.value in data
+    }
+    inserted = await update_health_metrics(
+        db, user_id, readings, datetime.now(timezone.utc), details=data
+    )
+    await generate_alerts(db, inserted)
+    return await latest_health_metrics(db, user_id)
+
+
+async def latest_health_metrics(db: AsyncSession, user_id: str) -> LatestHealthMetrics:
+    """Dashboard health metrics with each time series at its latest reading"""
+    dashboard = await get_user_dashboard_by_user_id(db, user_id)
+    details = (dashboard.health_metrics or {}) if dashboard else {}
+    latest = await get_latest_readings(db, user_id)
+    values = {metric.value: value for metric, (_, value) in latest.items()}
+    alerts = await get_active_alerts(db, user_id)
+    return LatestHealthMetrics(
+        **{**details, **values},
+        alert_warnings=AlertWarnings(alerts=[alert.message for alert in alerts]),
+        measured_at={metric: as_utc(ts, ts) for metric, (ts, _) in latest.items()},
+    )
+
+
+async def health_series(
+    db: AsyncSession,
+    user_id: str,
+    metric: HealthMetric,
+    start: datetime,
+    end: datetime,
+    max_points: int,
+) -> HealthSeries:
+    """Chart a metric over a window from rollups, within a point budget"""
+    resolution = pick_resolution(start, end, max_points)
+    rollups = await get_rollup_series(
+        db, user_id, metric, resolution, bucket_start(start, resolution), end
+    )
+    return HealthSeries(
+        metric=metric,
+        resolution=resolution,
+        start=start,
+        end=end,
+        points=[
+            HealthSeriesPoint(
+                ts=as_utc(rollup.bucket, rollup.bucket),
+                min=rollup.min,
+                max=rollup.max,
+                avg=rollup.sum / rollup.count,
+                count=rollup.count,
+            )
+            for rollup in rollups
+        ],
+    )
+
+
+def update_age_on_dob_change(bio_data: dict, on: date | None = None) -> dict:
+    """Bio data with age and BMI recomputed from its dob, weight and height"""
+    ages, bmis = derive_bio_fields([bio_data], on)
+    age, bmi = ages[0], bmis[0]
+    return {
+        **bio_data,
+        "age": None if math.isnan(age) else int(age),
+        "bmi": None if math.isnan(bmi) else float(bmi),
+    }
+
+
+async def get_bio_data(db: AsyncSession, user_id: str) -> BioDataOut:
+    """A user's stored bio data"""
+    dashboard = await get_user_dashboard_by_user_id(db, user_id)
+    return BioDataOut(**((dashboard.bio_data or {}) if dashboard else {}))
+
+
+async def update_bio_data(
+    db: AsyncSession, user_id: str, changes: BioDataUpdate
+) -> BioDataOut:
+    """Merge bio data changes, stored in kg and cm, and rederive age and BMI"""
+    data = changes.model_dump(
+        mode="json", exclude_unset=True, exclude={"weight_unit", "height_unit"}
+    )
+    for field, unit, stored in (
+        ("weight", changes.weight_unit, Unit.KILOGRAM),
+        ("height", changes.height_unit, Unit.CENTIMETER),
+    ):
+        if data.get(field) is not None:
+            data[field] = round(
+                float(unit_converter([data[field]], unit, stored)[0]), 2
+            )
+    dashboard = await get_user_dashboard_by_user_id(db, user_id)
+    current = (dashboard.bio_data or {}) if dashboard else {}
+    bio_data = update_age_on_dob_change({**current, **data})
+    await save_bio_data(
+        db, user_id, bio_data, next_birthday([bio_data.get("dob")])[0].item()
+    )
+    return BioDataOut(**bio_data)
+
+
+async def generate_alerts(db: AsyncSession, readings: list[dict]) -> list[dict]:
+    """Evaluate alert rules over newly stored readings and commit.
+
+    Each user's rolling state carries trends, rates and baselines across
+    batches. A rule firing for a user who already has an active alert of
+    that rule is folded into it; otherwise a new alert is raised unless
+    the rule is cooling down for the user. Anything the caller staged is
+    committed with the alerts; the state and cooldowns are only advanced
+    once that commit succeeds. Returns the alerts raised.
+    """
+    keys = list(dict.fromkeys((row["user_id"], row["metric"]) for row in readings))
+    states = await alert_state.load(redis_client, keys, alert_engine.window_sizes)
+    fired = alert_engine.alerts(readings, states)
+
+    active = await get_active_alert_ids(
+        db, [(alert["user_id"], alert["rule"]) for alert in fired]
+    )
+    folds = [
+        {
+            "alert_id": active[(alert["user_id"], alert["rule"])],
+            "added": alert["count"],
+            "value": alert["value"],
+            "ts": alert["ts"],
+        }
+        for alert in fired
+        if (alert["user_id"], alert["rule"]) in active
+    ]
+    fresh = [
+        alert for alert in fired if (alert["user_id"], alert["rule"]) not in active
+    ]
+    cooling = await alert_state.cooling(
+        redis_client, [(alert["user_id"], alert["rule"]) for alert in fresh]
+    )
+    raised = [
+        alert for alert in fresh if (alert["user_id"], alert["rule"]) not in cooling
+    ]
+    await fold_health_alerts(db, folds)
+    await add_health_alerts(db, raised)
+    await count_alerts(db, [(alert["user_id"], alert["severity"]) for alert in raised])
+    await db.commit()
+
+    await alert_state.save(redis_client, states)
+    await alert_state.start_cooldowns(
+        redis_client,
+        {
+            (alert["user_id"], alert["rule"]): alert_engine.cooldowns[alert["rule"]]
+            for alert in raised
+        },
+    )
+    return raised
+
+
+async def active_alerts(db: AsyncSession, user_id: str) -> HealthAlertList:
+    """A user's unresolved alerts"""
+    alerts = await get_active_alerts(db, user_id)
+    return HealthAlertList(
+        items=[HealthAlertOut.model_validate(alert) for alert in alerts]
+    )
+
+
+async def resolve_alert(
+    db: AsyncSession, user_id: str, alert_id: str
+) -> HealthAlertOut:
+    """Resolve one of a user's alerts"""
+    alert, resolved = await resolve_health_alert(db, user_id, alert_id)
+    if alert is None:
+        raise AlertNotFoundException()
+    if resolved:
+        await count_alerts(db, [(user_id, alert.severity)], sign=-1)
+    await db.commit()
+    await db.refresh(alert)
+    return HealthAlertOut.model_validate(alert)
 
 
 def log_mood():
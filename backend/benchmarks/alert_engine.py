@@ -0,0 +1,195 @@
+"""Alert rule evaluation throughput.
+
+Evaluates 50 alert rules (the defaults plus generated threshold, trend
+and rate variants) over 1M synthetic readings from 10k users, in-process:
+
+- the vectorized `AlertEngine.evaluate` over the whole column set
+- a per-reading Python loop doing the same checks, on a sample, for scale
+- `AlertEngine.alerts` on flush-sized batches of reading dicts, on their
+  own and with each user's rolling state, as the reading buffer calls it
+
+    python -m benchmarks.alert_engine --readings 1000000 --rules 50
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from lib.userlib.user_dashboard import (
+    DEFAULT_ALERT_RULES,
+    METRIC_CODES,
+    AlertEngine,
+    AlertRule,
+)
+from lib.utils.alert_state import MetricState
+from lib.utils.enums import AlertKind, HealthMetric
+
+# Typical value and spread per metric, in the units the default rules use
+METRIC_RANGES = {
+    HealthMetric.HEART_RATE: (80, 20),
+    HealthMetric.BLOOD_GLUCOSE: (6.5, 2.5),
+    HealthMetric.BODY_TEMPERATURE: (37.0, 0.8),
+    HealthMetric.RESPIRATORY_RATE: (16, 5),
+}
+
+
+def sample_rules(count: int) -> list[AlertRule]:
+    """The default rules, topped up with generated variants"""
+    rules = list(DEFAULT_ALERT_RULES)
+    metrics = list(METRIC_RANGES)
+    kinds = [AlertKind.THRESHOLD, AlertKind.TREND, AlertKind.RATE]
+    i = 0
+    while len(rules) < count:
+        metric = metrics[i % len(metrics)]
+        kind = kinds[i % len(kinds)]
+        mean, spread = METRIC_RANGES[metric]
+        if kind is AlertKind.THRESHOLD:
+            bounds = {"above": mean + 2 * spread, "below": mean - 2 * spread}
+        else:
+            bounds = {"above": spread, "below": -spread}
+        rules.append(
+            AlertRule(
+                name=f"generated_{i}",
+                metric=metric,
+                kind=kind,
+                window=2 + i % 4,
+                message=f"Generated rule {i}",
+                **bounds,
+            )
+        )
+        i += 1
+    return rules[:count]
+
+
+def sample_readings(count: int, users: int, seed: int = 1) -> tuple[np.ndarray, ...]:
+    """Columns of readings: user code, metric code, seconds, value"""
+    rng = np.random.default_rng(seed)
+    metrics = rng.integers(0, len(METRIC_CODES), count)
+    means = np.array([METRIC_RANGES[metric][0] for metric in METRIC_CODES])
+    spreads = np.array([METRIC_RANGES[metric][1] for metric in METRIC_CODES])
+    return (
+        rng.integers(0, users, count),
+        metrics,
+        np.sort(rng.uniform(0, 86400, count)),
+        rng.normal(means[metrics], spreads[metrics]),
+    )
+
+
+def loop_evaluate(rules: list[AlertRule], columns: tuple[np.ndarray, ...]) -> int:
+    """Per-reading evaluation, branching on each rule; returns hits"""
+    users, metrics, ts, values = (column.tolist() for column in columns)
+    codes = [METRIC_CODES[rule.metric] for rule in rules]
+    history: dict[tuple[int, int], list[tuple[float, float]]] = {}
+    hits = 0
+    for user, metric, t, value in zip(users, metrics, ts, values):
+        previous = history.setdefault((user, metric), [])
+        for rule, code in zip(rules, codes):
+            # Deviations need a baseline from earlier batches; a single pass has none
+            if code != metric or rule.kind is AlertKind.DEVIATION:
+                continue
+            if rule.kind is AlertKind.THRESHOLD:
+                measure = value
+            elif len(previous) < rule.lag:
+                continue
+            else:
+                then, before = previous[-rule.lag]
+                measure = value - before
+                if rule.kind is AlertKind.RATE:
+                    if t <= then:
+                        continue
+                    measure = measure * 60 / (t - then)
+            if (rule.above is not None and measure > rule.above) or (
+                rule.below is not None and measure < rule.below
+            ):
+                hits += 1
+        previous.append((t, value))
+    return hits
+
+
+def as_dicts(columns: tuple[np.ndarray, ...]) -> list[dict]:
+    """Readings as the reading buffer holds them"""
+    metrics = list(METRIC_CODES)
+    start = datetime(2026, 10, 18, tzinfo=timezone.utc)
+    users, codes, ts, values = (column.tolist() for column in columns)
+    return [
+        {
+            "user_id": f"user-{user}",
+            "metric": metrics[code],
+            "ts": start + timedelta(seconds=t),
+            "value": value,
+        }
+        for user, code, t, value in zip(users, codes, ts, values)
+    ]
+
+
+def best_of(repeat: int, func) -> tuple[float, object]:
+    """Fastest of `repeat` runs and the last result"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(readings: int, rule_count: int, users: int, sample: int, batch: int) -> None:
+    """Time vectorized and per-reading evaluation and print a summary"""
+    rules = sample_rules(rule_count)
+    engine = AlertEngine(rules)
+    columns = sample_readings(readings, users)
+
+    seconds, (fired, _, counts) = best_of(3, lambda: engine.evaluate(*columns))
+    print(f"rules:       {len(rules)}")
+    print(
+        f"vectorized:  {readings} readings in {seconds * 1000:.0f}ms "
+        f"({readings / seconds:,.0f} readings/s, {int(counts.sum())} hits, "
+        f"{len(fired)} alerts)"
+    )
+
+    sample_columns = tuple(column[:sample] for column in columns)
+    seconds, hits = best_of(1, lambda: loop_evaluate(rules, sample_columns))
+    assert hits == int(engine.evaluate(*sample_columns)[2].sum())
+    print(
+        f"loop:        {sample} readings in {seconds * 1000:.0f}ms "
+        f"({sample / seconds:,.0f} readings/s, {hits} hits)"
+    )
+
+    batches = [
+        as_dicts(tuple(column[i : i + batch] for column in columns))
+        for i in range(0, min(readings, 100 * batch), batch)
+    ]
+    total = sum(len(rows) for rows in batches)
+    seconds, _ = best_of(3, lambda: [engine.alerts(rows) for rows in batches])
+    print(
+        f"alerts():    {len(batches)} batches of {batch} reading dicts "
+        f"({seconds / len(batches) * 1000:.2f}ms/batch, {total / seconds:,.0f} "
+        "readings/s)"
+    )
+
+    def streamed():
+        states = {
+            (f"user-{user}", metric): MetricState(engine.window_sizes[metric])
+            for user in range(users)
+            for metric in METRIC_CODES
+        }
+        for rows in batches:
+            engine.alerts(rows, states)
+
+    seconds, _ = best_of(3, streamed)
+    print(
+        f"with state:  {len(batches)} batches of {batch} reading dicts "
+        f"({seconds / len(batches) * 1000:.2f}ms/batch, {total / seconds:,.0f} "
+        "readings/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readings", type=int, default=1000000)
+    parser.add_argument("--rules", type=int, default=50)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--loop-sample", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.readings, args.rules, args.users, args.loop_sample, args.batch)
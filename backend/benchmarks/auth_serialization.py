@@ -0,0 +1,88 @@
+"""Serialization cost per login response.
+
+Compares, in-process, the old login response path (schema conversion, a
+dict rebuilt by the route, `response_model` re-validation, then
+`jsonable_encoder` and `json.dumps`) with the single pass through
+`ModelResponse`. No database or server is needed.
+
+    python -m benchmarks.auth_serialization --iterations 20000
+"""
+
+import argparse
+import json
+import time
+import uuid
+
+from app.api.core.responses import ModelResponse
+from app.api.v1.auth.models.user import User
+from app.api.v1.auth.schemas.auth import AuthenticatedUserOut
+from app.api.v1.auth.schemas.user.user import UserOut
+from fastapi.encoders import jsonable_encoder
+from lib.utils.enums import UserType
+
+TOKEN = "x" * 300
+
+
+def sample_user() -> User:
+    """A transient user row shaped like one loaded at login"""
+    unique = uuid.uuid4().hex
+    return User(
+        id=str(uuid.uuid4()),
+        username=f"bench_{unique}",
+        email=f"bench_{unique}@example.com",
+        full_name="Bench User",
+        user_type=UserType.USER,
+        organization_id=None,
+    )
+
+
+def previous_path(user: User) -> bytes:
+    """Service dict, route dict, response_model validation, then encoding"""
+    result = {
+        "user": UserOut.model_validate(user),
+        "access_token": TOKEN,
+        "refresh_token": TOKEN,
+        "token_type": "bearer",
+    }
+    body = {
+        "user": result["user"],
+        "access_token": result["access_token"],
+        "refresh_token": result["refresh_token"],
+        "token_type": result["token_type"],
+    }
+    validated = AuthenticatedUserOut.model_validate(body)
+    return json.dumps(jsonable_encoder(validated)).encode("utf-8")
+
+
+def model_response_path(user: User) -> bytes:
+    """One validated model rendered straight to bytes"""
+    auth_out = AuthenticatedUserOut(
+        user=UserOut.model_validate(user),
+        access_token=TOKEN,
+        refresh_token=TOKEN,
+        token_type="bearer",
+    )
+    return ModelResponse(auth_out).body
+
+
+def run(iterations: int) -> None:
+    """Time both paths and print the cost per login"""
+    user = sample_user()
+    assert json.loads(previous_path(user)) == json.loads(model_response_path(user))
+
+    for label, path in (
+        ("previous", previous_path),
+        ("model response", model_response_path),
+    ):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            path(user)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<15} {elapsed / iterations * 1e6:8.1f}us per login")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.iterations)
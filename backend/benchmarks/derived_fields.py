@@ -0,0 +1,75 @@
+"""Derived bio data field recompute throughput.
+
+Rederives age and BMI for synthetic bio data records, in-process, the
+way the nightly job does it (one column-wise pass per chunk) and one
+record at a time as a bio data update does, for comparison. Rows per
+second here bound the job's own `rows_per_second` in `/metrics`, which
+adds the reads and bulk UPDATEs.
+
+    python -m benchmarks.derived_fields --rows 1000000 --chunk 1000
+"""
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from app.api.v1.dashboards.services.derived_fields_job import derived_updates
+from app.api.v1.dashboards.services.user_dashboard_service import (
+    update_age_on_dob_change,
+)
+
+
+def sample_rows(count: int, seed: int = 1) -> list[tuple]:
+    """(id, bio_data, due) rows as the job reads them"""
+    rng = np.random.default_rng(seed)
+    start = date(1940, 1, 1)
+    days = rng.integers(0, 30000, count).tolist()
+    weights = rng.normal(75, 15, count).round(1).tolist()
+    heights = rng.normal(170, 10, count).round(1).tolist()
+    due = date(2026, 10, 18)
+    return [
+        (
+            f"dashboard-{i}",
+            {
+                "dob": (start + timedelta(days=day)).isoformat(),
+                "weight": weight,
+                "height": height,
+            },
+            due,
+        )
+        for i, (day, weight, height) in enumerate(zip(days, weights, heights))
+    ]
+
+
+def run(rows: int, chunk: int, sample: int) -> None:
+    """Time chunked and per-record recompute and print a summary"""
+    records = sample_rows(rows)
+    on = date(2026, 10, 18)
+
+    start = time.perf_counter()
+    for i in range(0, rows, chunk):
+        derived_updates(records[i : i + chunk], on)
+    seconds = time.perf_counter() - start
+    print(
+        f"chunked:     {rows} rows in {seconds * 1000:.0f}ms "
+        f"({rows / seconds:,.0f} rows/s, chunks of {chunk})"
+    )
+
+    start = time.perf_counter()
+    for _, bio_data, _ in records[:sample]:
+        update_age_on_dob_change(bio_data, on)
+    seconds = time.perf_counter() - start
+    print(
+        f"per record:  {sample} rows in {seconds * 1000:.0f}ms "
+        f"({sample / seconds:,.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunk", type=int, default=1000)
+    parser.add_argument("--sample", type=int, default=20000)
+    args = parser.parse_args()
+    run(args.rows, args.chunk, args.sample)
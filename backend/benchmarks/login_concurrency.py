@@ -0,0 +1,86 @@
+"""Login latency under concurrency.
+
+Registers one account against a running API, then fires N logins at once
+and reports latency percentiles. Run it against a build before and after a
+change to compare, e.g.
+
+    uvicorn main:app --workers 1 &
+    python -m benchmarks.login_concurrency --concurrency 500
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+PASSWORD = "BenchPassword1$"
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def register(client: httpx.AsyncClient) -> str:
+    """Register a throwaway user and return its email"""
+    unique = uuid.uuid4().hex
+    email = f"bench_{unique}@example.com"
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"bench_{unique}",
+            "email": email,
+            "password": PASSWORD,
+            "full_name": "Bench User",
+        },
+        headers={"X-Client-Type": "mobile"},
+    )
+    response.raise_for_status()
+    return email
+
+
+async def timed_login(client: httpx.AsyncClient, email: str) -> tuple[float, int]:
+    """Run one login and return (latency in ms, status code)"""
+    start = time.perf_counter()
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": email, "password": PASSWORD, "login_context": "user"},
+        headers={"X-Client-Type": "mobile"},
+    )
+    return (time.perf_counter() - start) * 1000, response.status_code
+
+
+async def run(base_url: str, concurrency: int) -> None:
+    """Fire `concurrency` logins at once and print a latency summary"""
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=120
+    ) as client:
+        email = await register(client)
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(timed_login(client, email) for _ in range(concurrency))
+        )
+        wall = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in results]
+    failures = sum(1 for _, code in results if code != 200)
+    print(f"logins:      {concurrency} ({failures} failed)")
+    print(f"wall time:   {wall:.2f}s ({concurrency / wall:.1f} logins/s)")
+    print(f"mean:        {statistics.mean(latencies):.1f}ms")
+    for pct in (50, 95, 99):
+        print(f"p{pct}:         {percentile(latencies, pct):.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.concurrency))
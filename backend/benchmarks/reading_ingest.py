@@ -0,0 +1,129 @@
+"""Sustained health reading ingestion.
+
+Registers one user per client against a running API, then has every
+client post batches of readings back to back for a fixed duration, the
+way a fleet of wearables would. Reports accepted readings per second,
+how many batches were shed with 429, and what the server's reading
+buffer wrote to the database. Run it against a single worker so the
+rate is per worker, e.g.
+
+    uvicorn main:app --workers 1 &
+    python -m benchmarks.reading_ingest --clients 50 --batch 20 --duration 20
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+PASSWORD = "BenchPassword1$"
+METRICS = ("heart_rate", "blood_glucose", "body_temperature", "respiratory_rate")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def user_token(client: httpx.AsyncClient) -> str:
+    """Register a throwaway user and return a mobile access token"""
+    unique = uuid.uuid4().hex
+    email = f"bench_{unique}@example.com"
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"bench_{unique}",
+            "email": email,
+            "password": PASSWORD,
+            "full_name": "Bench User",
+        },
+        headers={"X-Client-Type": "mobile"},
+    )
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def wearable(
+    client: httpx.AsyncClient, token: str, batch: int, deadline: float
+) -> tuple[int, int, list[float]]:
+    """Post batches until the deadline; return (accepted, shed, latencies)"""
+    headers = {"Authorization": f"Bearer {token}"}
+    ts = datetime.now(timezone.utc)
+    accepted = shed = 0
+    latencies = []
+    while time.perf_counter() < deadline:
+        readings = []
+        for _ in range(batch):
+            ts += timedelta(milliseconds=250)
+            readings.append(
+                {
+                    "metric": random.choice(METRICS),
+                    "value": random.uniform(50, 120),
+                    "ts": ts.isoformat(),
+                }
+            )
+        start = time.perf_counter()
+        response = await client.post(
+            "/api/v1/dashboard/metrics/readings",
+            json={"readings": readings},
+            headers=headers,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code == 202:
+            accepted += batch
+        elif response.status_code == 429:
+            shed += 1
+            await asyncio.sleep(float(response.headers.get("Retry-After", "1")))
+        else:
+            response.raise_for_status()
+    return accepted, shed, latencies
+
+
+async def run(base_url: str, clients: int, batch: int, duration: float) -> None:
+    """Drive `clients` wearables for `duration` seconds and print a summary"""
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=60
+    ) as client:
+        tokens = [await user_token(client) for _ in range(clients)]
+        before = (await client.get("/metrics")).json()["reading_buffer"]
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(wearable(client, token, batch, start + duration) for token in tokens)
+        )
+        wall = time.perf_counter() - start
+        # Let the buffer drain what it accepted before reading its counters
+        await asyncio.sleep(2)
+        after = (await client.get("/metrics")).json()["reading_buffer"]
+
+    accepted = sum(result[0] for result in results)
+    shed = sum(result[1] for result in results)
+    latencies = [latency for result in results for latency in result[2]]
+    flushed = after["flushed"] - before["flushed"]
+    flushes = after["flushes"] - before["flushes"]
+    print(f"clients:     {clients} x {batch} readings/batch for {wall:.1f}s")
+    print(f"accepted:    {accepted} readings ({accepted / wall:.0f} readings/s)")
+    print(f"shed (429):  {shed} batches")
+    print(f"written:     {flushed} readings in {flushes} bulk inserts")
+    print(f"pending:     {after['pending']}, dropped: {after['dropped']}")
+    print(f"mean:        {statistics.mean(latencies):.1f}ms")
+    for pct in (50, 95, 99):
+        print(f"p{pct}:         {percentile(latencies, pct):.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.base_url, args.clients, args.batch, args.duration))
@@ -0,0 +1,167 @@
+"""Account-to-schema conversion throughput.
+
+Converts 10k accounts to their Out schemas, in-process:
+
+- from ORM instances: the previous `model_validate(from_attributes=True)`
+  lookup by class name versus the cached adapters in `to_schema`
+- from the database: `select(Model)` plus `to_schema` versus the
+  column-projection loader `load_account_schemas`, on an in-memory SQLite
+  database
+
+    python -m benchmarks.schema_conversion --accounts 10000
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import uuid
+from datetime import datetime
+
+from app.api.core.base import Base
+from app.api.v1.auth.models.user import Admin, Organization, OrgMember, User
+from app.api.v1.auth.schemas.admin import AdminOut
+from app.api.v1.auth.schemas.org import OrganizationOut, OrgMemberOut
+from app.api.v1.auth.schemas.user.user import UserOut
+from app.api.v1.auth.services.auth_service import load_account_schemas, to_schema
+from lib.utils.enums import OrgRole, UserType
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+PREVIOUS_MODEL_TO_SCHEMA = {
+    "User": UserOut,
+    "OrgMember": OrgMemberOut,
+    "Admin": AdminOut,
+    "Organization": OrganizationOut,
+}
+
+
+def previous_to_schema(user_obj):
+    """to_schema before cached adapters"""
+    schema_class = PREVIOUS_MODEL_TO_SCHEMA[user_obj.__class__.__name__]
+    return schema_class.model_validate(user_obj)
+
+
+def sample_accounts(count: int) -> list:
+    """Transient accounts of every type, in equal shares"""
+    org_id = str(uuid.uuid4())
+    accounts = []
+    for i in range(count):
+        common = {"id": str(uuid.uuid4()), "email": f"bench_{i}@example.com"}
+        kind = i % 4
+        if kind == 0:
+            accounts.append(
+                User(
+                    **common,
+                    username=f"bench_{i}",
+                    full_name="Bench User",
+                    user_type=UserType.USER,
+                    hashed_password="x",
+                )
+            )
+        elif kind == 1:
+            accounts.append(
+                OrgMember(
+                    **common,
+                    username=f"bench_{i}",
+                    full_name="Bench Member",
+                    organization_id=org_id,
+                    role=OrgRole.STAFF,
+                    is_active=True,
+                    joined_at=datetime(2025, 1, 1),
+                    hashed_password="x",
+                    user=None,
+                )
+            )
+        elif kind == 2:
+            accounts.append(
+                Admin(
+                    **common,
+                    name="Bench Admin",
+                    user_type=UserType.ADMIN,
+                    is_admin="true",
+                    hashed_password="x",
+                )
+            )
+        else:
+            accounts.append(
+                Organization(
+                    **common,
+                    name="Bench Org",
+                    user_type=UserType.ORGANIZATION,
+                    role=OrgRole.ORG_ADMIN,
+                    hashed_password="x",
+                )
+            )
+    return accounts
+
+
+def timed(label: str, count: int, func, repeat: int = 5) -> None:
+    """Print the best throughput of `repeat` runs, with the GC paused"""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+        gc.enable()
+    print(f"{label:<28} {count / best:>10.0f} accounts/s")
+
+
+async def database_round(count: int) -> None:
+    """Load `count` users from SQLite through the ORM and through projections"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    users = [account for account in sample_accounts(count * 4) if type(account) is User]
+    ids = [user.id for user in users]
+    async with session_factory() as db:
+        db.add_all(users)
+        await db.commit()
+
+    async def orm_load():
+        async with session_factory() as db:
+            result = await db.execute(select(User).where(User.id.in_(ids)))
+            return [to_schema(user) for user in result.scalars()]
+
+    async def projection_load():
+        async with session_factory() as db:
+            return await load_account_schemas(db, User, ids)
+
+    assert len(await orm_load()) == len(await projection_load()) == count
+    for label, load in (
+        ("select(User) + to_schema", orm_load),
+        ("load_account_schemas", projection_load),
+    ):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            await load()
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:<28} {count / best:>10.0f} accounts/s")
+    await engine.dispose()
+
+
+def run(count: int) -> None:
+    """Time conversion from instances and from the database"""
+    accounts = sample_accounts(count)
+    timed(
+        "model_validate by class name",
+        count,
+        lambda: [previous_to_schema(account) for account in accounts],
+    )
+    timed(
+        "cached adapters (to_schema)",
+        count,
+        lambda: [to_schema(account) for account in accounts],
+    )
+    asyncio.run(database_round(count))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=10000)
+    args = parser.parse_args()
+    run(args.accounts)
@@ -129,3 +129,61 @@ class WeakPasswordException(HTTPException):
 
     def __init__(self, detail: str = "Password is too weak"):
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class PasswordHasherBusyException(HTTPException):
+    """Exception raised when the password hashing queue is full"""
+
+    def __init__(
+        self, detail: str = "Server is busy, please retry shortly.", retry_after=1
+    ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class SessionStoreUnavailableException(HTTPException):
+    """Exception raised when sessions cannot be opened, rotated or revoked
+    because Redis is down"""
+
+    def __init__(
+        self,
+        detail: str = "Sessions could not be revoked, please retry shortly.",
+        retry_after=5,
+    ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class InvalidCursorException(HTTPException):
+    """Exception raised for a malformed pagination cursor"""
+
+    def __init__(self, detail: str = "Invalid pagination cursor."):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class IngestBufferFullException(HTTPException):
+    """Exception raised when the ingestion buffer cannot take more rows"""
+
+    def __init__(
+        self,
+        detail: str = "Too many readings queued, please retry shortly.",
+        retry_after=1,
+    ):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class AlertNotFoundException(HTTPException):
+    """Exception raised when a health alert does not exist."""
+
+    def __init__(self, detail: str = "Alert not found."):
+        super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
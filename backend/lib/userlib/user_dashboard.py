@@ -1 +1,413 @@
-"""Dashboard Utils/CRUD library"""
+"""Dashboard Utils/CRUD library
+
+Health alert rules and their evaluation. Readings are evaluated as
+columns (user, metric, time, value) rather than one at a time: they are
+sorted once by (metric, user, time), so each metric is a contiguous slice
+with every user's readings in order, and each rule is then a handful of
+array comparisons over its metric's slice. Trend and rate rules compare a
+reading with an earlier reading of the same user, which after the sort is
+a fixed offset back in the same slice.
+
+With each user's rolling state (lib/utils/alert_state.py) the last few
+readings seen before a batch are evaluated with it as context, so trends
+and rates carry across batches without rereading history.
+"""
+
+from datetime import date, datetime, timezone
+
+import numpy as np
+from app.api.core.config import settings
+from lib.utils.alert_state import MetricState
+from lib.utils.enums import AlertKind, AlertSeverity, HealthMetric
+from lib.utils.user_dashboard import calculate_age, calculate_bmi
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+METRIC_CODES = {metric: code for code, metric in enumerate(HealthMetric)}
+
+
+class AlertRule(BaseModel):
+    """A condition on one metric that raises an alert.
+
+    - threshold: the reading is above `above` or below `below`
+    - trend: the change over the last `window` readings is above `above`
+      or below `below`
+    - rate: the change per minute since the previous reading is above
+      `above` or below `below`
+    - deviation: the reading differs from the user's EWMA baseline by more
+      than `above`, or less than `below`
+
+    Once the rule raises an alert for a user, it raises no new one for
+    `cooldown_seconds`.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    metric: HealthMetric
+    message: str
+    kind: AlertKind = AlertKind.THRESHOLD
+    above: float | None = None
+    below: float | None = None
+    window: int = Field(1, ge=1)
+    severity: AlertSeverity = AlertSeverity.WARNING
+    cooldown_seconds: int = Field(settings.ALERT_COOLDOWN_SECONDS, ge=0)
+
+    @model_validator(mode="after")
+    def check_bounds(self):
+        """A rule must bound the measure on at least one side"""
+        if self.above is None and self.below is None:
+            raise ValueError("An alert rule needs `above` or `below`")
+        return self
+
+    @property
+    def lag(self) -> int:
+        """How many readings back the rule compares with"""
+        if self.kind in (AlertKind.THRESHOLD, AlertKind.DEVIATION):
+            return 0
+        if self.kind is AlertKind.RATE:
+            return 1
+        return self.window
+
+
+# Glucose in mmol/L, temperature in degrees Celsius, rates per minute
+DEFAULT_ALERT_RULES = (
+    AlertRule(
+        name="tachycardia",
+        metric=HealthMetric.HEART_RATE,
+        above=100,
+        message="Heart rate above 100 bpm",
+    ),
+    AlertRule(
+        name="severe_tachycardia",
+        metric=HealthMetric.HEART_RATE,
+        above=130,
+        severity=AlertSeverity.CRITICAL,
+        message="Heart rate above 130 bpm",
+    ),
+    AlertRule(
+        name="bradycardia",
+        metric=HealthMetric.HEART_RATE,
+        below=50,
+        message="Heart rate below 50 bpm",
+    ),
+    AlertRule(
+        name="heart_rate_jump",
+        metric=HealthMetric.HEART_RATE,
+        kind=AlertKind.RATE,
+        above=40,
+        below=-40,
+        message="Heart rate changed by more than 40 bpm in a minute",
+    ),
+    AlertRule(
+        name="heart_rate_above_baseline",
+        metric=HealthMetric.HEART_RATE,
+        kind=AlertKind.DEVIATION,
+        above=35,
+        message="Heart rate more than 35 bpm above the usual",
+    ),
+    AlertRule(
+        name="hypoglycemia",
+        metric=HealthMetric.BLOOD_GLUCOSE,
+        below=3.9,
+        message="Blood glucose below 3.9 mmol/L",
+    ),
+    AlertRule(
+        name="severe_hypoglycemia",
+        metric=HealthMetric.BLOOD_GLUCOSE,
+        below=3.0,
+        severity=AlertSeverity.CRITICAL,
+        message="Blood glucose below 3.0 mmol/L",
+    ),
+    AlertRule(
+        name="hyperglycemia",
+        metric=HealthMetric.BLOOD_GLUCOSE,
+        above=13.9,
+        message="Blood glucose above 13.9 mmol/L",
+    ),
+    AlertRule(
+        name="glucose_falling_fast",
+        metric=HealthMetric.BLOOD_GLUCOSE,
+        kind=AlertKind.RATE,
+        below=-0.17,
+        message="Blood glucose falling faster than 0.17 mmol/L per minute",
+    ),
+    AlertRule(
+        name="glucose_dropping",
+        metric=HealthMetric.BLOOD_GLUCOSE,
+        kind=AlertKind.TREND,
+        window=3,
+        below=-1.5,
+        message="Blood glucose dropped by more than 1.5 mmol/L",
+    ),
+    AlertRule(
+        name="fever",
+        metric=HealthMetric.BODY_TEMPERATURE,
+        above=38.0,
+        message="Body temperature above 38.0 C",
+    ),
+    AlertRule(
+        name="high_fever",
+        metric=HealthMetric.BODY_TEMPERATURE,
+        above=39.5,
+        severity=AlertSeverity.CRITICAL,
+        message="Body temperature above 39.5 C",
+    ),
+    AlertRule(
+        name="hypothermia",
+        metric=HealthMetric.BODY_TEMPERATURE,
+        below=35.0,
+        severity=AlertSeverity.CRITICAL,
+        message="Body temperature below 35.0 C",
+    ),
+    AlertRule(
+        name="temperature_rising",
+        metric=HealthMetric.BODY_TEMPERATURE,
+        kind=AlertKind.TREND,
+        window=4,
+        above=1.0,
+        message="Body temperature rose by more than 1.0 C",
+    ),
+    AlertRule(
+        name="tachypnea",
+        metric=HealthMetric.RESPIRATORY_RATE,
+        above=24,
+        message="Respiratory rate above 24 breaths/min",
+    ),
+    AlertRule(
+        name="severe_tachypnea",
+        metric=HealthMetric.RESPIRATORY_RATE,
+        above=30,
+        severity=AlertSeverity.CRITICAL,
+        message="Respiratory rate above 30 breaths/min",
+    ),
+    AlertRule(
+        name="bradypnea",
+        metric=HealthMetric.RESPIRATORY_RATE,
+        below=10,
+        message="Respiratory rate below 10 breaths/min",
+    ),
+)
+
+
+def _epoch(ts: datetime) -> float:
+    """Seconds since the epoch; naive timestamps are taken to be UTC"""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def _changes(
+    users: np.ndarray, ts: np.ndarray, values: np.ndarray, lag: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Change in value and seconds elapsed since `lag` readings earlier.
+
+    NaN where the earlier reading belongs to another user or does not
+    exist, so comparisons there are false.
+    """
+    delta = np.full(len(values), np.nan)
+    elapsed = np.full(len(values), np.nan)
+    if lag < len(values):
+        same = users[lag:] == users[:-lag]
+        delta[lag:] = np.where(same, values[lag:] - values[:-lag], np.nan)
+        elapsed[lag:] = np.where(same, ts[lag:] - ts[:-lag], np.nan)
+    return delta, elapsed
+
+
+class AlertEngine:
+    """Evaluate a rule set over columns of readings with array operations"""
+
+    def __init__(self, rules=DEFAULT_ALERT_RULES):
+        self.rules = tuple(rules)
+        self._above = np.array(
+            [np.inf if rule.above is None else rule.above for rule in self.rules]
+        )
+        self._below = np.array(
+            [-np.inf if rule.below is None else rule.below for rule in self.rules]
+        )
+        self._by_metric: dict[int, list[int]] = {}
+        for index, rule in enumerate(self.rules):
+            self._by_metric.setdefault(METRIC_CODES[rule.metric], []).append(index)
+        # Readings of each metric the rolling state keeps: the longest lag
+        self.window_sizes = {metric: 1 for metric in HealthMetric}
+        for rule in self.rules:
+            self.window_sizes[rule.metric] = max(
+                self.window_sizes[rule.metric], rule.lag
+            )
+        self.cooldowns = {rule.name: rule.cooldown_seconds for rule in self.rules}
+
+    def evaluate(
+        self,
+        users: np.ndarray,
+        metrics: np.ndarray,
+        ts: np.ndarray,
+        values: np.ndarray,
+        live: np.ndarray | None = None,
+        baseline: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Latest firing of each rule for each user in a batch of readings.
+
+        `users` and `metrics` are integer codes (metrics per METRIC_CODES),
+        `ts` seconds and `values` floats, one entry per reading. Readings
+        where the optional `live` mask is false are context only: earlier
+        readings that trends and rates compare with but that raise nothing.
+        `baseline` is each reading's EWMA baseline for deviation rules
+        (NaN where there is none). Returns (rule, reading, count) arrays:
+        for every user and rule that fired, the rule's index, the index of
+        the latest reading that met it and how many of the user's readings
+        met it.
+        """
+        order = np.lexsort((ts, users, metrics))
+        users, metrics = users[order], metrics[order]
+        ts, values = ts[order], values[order]
+        if live is not None:
+            live = live[order]
+        if baseline is not None:
+            baseline = baseline[order]
+        bounds = np.searchsorted(metrics, np.arange(len(METRIC_CODES) + 1))
+
+        fired_rules, fired_readings, fired_counts = [], [], []
+        for code, indexes in self._by_metric.items():
+            lo, hi = bounds[code], bounds[code + 1]
+            if lo == hi:
+                continue
+            user, value = users[lo:hi], values[lo:hi]
+            changes: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+            for index in indexes:
+                rule = self.rules[index]
+                if rule.kind is AlertKind.THRESHOLD:
+                    measure = value
+                elif rule.kind is AlertKind.DEVIATION:
+                    if baseline is None:
+                        continue
+                    measure = value - baseline[lo:hi]
+                else:
+                    if rule.lag not in changes:
+                        changes[rule.lag] = _changes(user, ts[lo:hi], value, rule.lag)
+                    delta, elapsed = changes[rule.lag]
+                    measure = delta
+                    if rule.kind is AlertKind.RATE:
+                        with np.errstate(divide="ignore", invalid="ignore"):
+                            measure = np.where(
+                                elapsed > 0, delta * 60 / elapsed, np.nan
+                            )
+                hit = (measure > self._above[index]) | (measure < self._below[index])
+                if live is not None:
+                    hit &= live[lo:hi]
+                hits = np.flatnonzero(hit)
+                if not len(hits):
+                    continue
+                # Hits are ordered by user then time: keep the last of each user's run
+                hit_users = user[hits]
+                last = np.flatnonzero(np.append(hit_users[1:] != hit_users[:-1], True))
+                fired_rules.append(np.full(len(last), index))
+                fired_readings.append(order[lo + hits[last]])
+                fired_counts.append(np.diff(last, prepend=-1))
+
+        if not fired_rules:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty, empty
+        return (
+            np.concatenate(fired_rules),
+            np.concatenate(fired_readings),
+            np.concatenate(fired_counts),
+        )
+
+    def alerts(
+        self,
+        readings: list[dict],
+        states: dict[tuple[str, HealthMetric], MetricState] | None = None,
+    ) -> list[dict]:
+        """Alerts raised by readings given as dicts of user_id, metric, ts and value.
+
+        One alert per user and rule that fired, carrying the latest reading
+        that met the rule. With `states`, the rolling state of each
+        (user_id, metric) in the batch, its recent readings are context for
+        trends and rates, its EWMA is the baseline for deviations, and the
+        states are then advanced past the batch's readings.
+        """
+        if not readings:
+            return []
+        states = states or {}
+        keys = [(reading["user_id"], reading["metric"]) for reading in readings]
+        context = [
+            (key, seen)
+            for key in dict.fromkeys(keys)
+            if key in states
+            for seen in states[key].readings
+        ]
+        rows = keys + [key for key, _ in context]
+        user_codes: dict[str, int] = {}
+        users = np.array(
+            [user_codes.setdefault(user_id, len(user_codes)) for user_id, _ in rows],
+            dtype=np.int64,
+        )
+        metrics = np.array([METRIC_CODES[metric] for _, metric in rows], dtype=np.int64)
+        ts = np.array(
+            [_epoch(reading["ts"]) for reading in readings]
+            + [seen_at for _, (seen_at, _) in context],
+            dtype=np.float64,
+        )
+        values = np.array(
+            [reading["value"] for reading in readings]
+            + [value for _, (_, value) in context],
+            dtype=np.float64,
+        )
+        live = baseline = None
+        if states:
+            live = np.arange(len(rows)) < len(readings)
+            baselines = {
+                key: state.ewma
+                for key, state in states.items()
+                if state.count >= settings.ALERT_BASELINE_MIN_READINGS
+            }
+            # Context readings are never checked, so need no baseline
+            baseline = np.array(
+                [baselines.get(key, np.nan) for key in rows], dtype=np.float64
+            )
+
+        fired_rules, fired_readings, counts = self.evaluate(
+            users, metrics, ts, values, live, baseline
+        )
+        alerts = []
+        for index, position, count in zip(
+            fired_rules.tolist(), fired_readings.tolist(), counts.tolist()
+        ):
+            rule, reading = self.rules[index], readings[position]
+            alerts.append(
+                {
+                    "user_id": reading["user_id"],
+                    "rule": rule.name,
+                    "metric": rule.metric,
+                    "severity": rule.severity,
+                    "message": rule.message,
+                    "value": reading["value"],
+                    "ts": reading["ts"],
+                    "count": count,
+                }
+            )
+
+        for position in np.argsort(ts[: len(readings)], kind="stable").tolist():
+            state = states.get(keys[position])
+            if state is not None:
+                state.update(float(ts[position]), readings[position]["value"])
+        return alerts
+
+
+alert_engine = AlertEngine()
+
+
+def derive_bio_fields(
+    bio_data: list[dict | None], on: date | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Age and BMI of each bio data record, computed column-wise.
+
+    Weight is in kg and height in cm, as bio data is stored. NaN where
+    the inputs are missing.
+    """
+    records = [record or {} for record in bio_data]
+    ages = calculate_age([record.get("dob") for record in records], on)
+    bmis = calculate_bmi(
+        [record.get("weight") for record in records],
+        [record.get("height") for record in records],
+    )
+    return ages, bmis
@@ -0,0 +1,186 @@
+"""Rolling per-user alert state, kept in Redis.
+
+Streaming alert rules need a little history: the last few readings of a
+metric (for trends and rates), a running EWMA baseline (for deviations)
+and when each rule last raised an alert (for cooldowns). Rather than
+rereading history from the database for every batch, that state is kept
+per (user, metric) as one small Redis value, loaded for the users in a
+batch, updated in O(1) per reading and written back. It expires after
+`ttl_seconds` without readings.
+
+Redis is an accelerator here, not the source of truth: when it is
+unavailable, batches are evaluated on their own and cooldowns do not
+apply, so alerts may be duplicated but are not missed. Two workers
+flushing readings of the same user at once may each write the state
+back; the later write wins.
+"""
+
+import logging
+from collections import deque
+
+import orjson
+import redis
+from app.api.core.config import settings
+from lib.utils.enums import HealthMetric
+
+logger = logging.getLogger(__name__)
+
+
+class MetricState:
+    """Recent readings, EWMA and reading count of one user's metric"""
+
+    __slots__ = ("readings", "ewma", "count")
+
+    def __init__(
+        self,
+        size: int,
+        readings=(),
+        ewma: float | None = None,
+        count: int = 0,
+    ):
+        self.readings: deque[tuple[float, float]] = deque(
+            (tuple(reading) for reading in readings), maxlen=size
+        )
+        self.ewma = ewma
+        self.count = count
+
+    def update(
+        self, ts: float, value: float, alpha: float = settings.ALERT_EWMA_ALPHA
+    ) -> bool:
+        """Fold in a reading newer than the last one seen; False if it is not"""
+        if self.readings and ts <= self.readings[-1][0]:
+            return False
+        self.readings.append((ts, value))
+        self.ewma = (
+            value if self.ewma is None else alpha * value + (1 - alpha) * self.ewma
+        )
+        self.count += 1
+        return True
+
+    def dumps(self) -> str:
+        """Compact JSON for Redis"""
+        return orjson.dumps(
+            {"r": list(self.readings), "e": self.ewma, "n": self.count}
+        ).decode()
+
+    @classmethod
+    def loads(cls, data: str, size: int) -> "MetricState":
+        """State from its JSON, keeping at most the last `size` readings"""
+        fields = orjson.loads(data)
+        return cls(size, fields["r"], fields["e"], fields["n"])
+
+
+class AlertStateStore:
+    """Load and save rolling alert state and rule cooldowns in Redis"""
+
+    def __init__(self, ttl_seconds: int = 86400, prefix: str = "alerts"):
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.loaded = 0
+        self.missing = 0
+        self.saved = 0
+        self.cooling_down = 0
+        self.failures = 0
+
+    def state_key(self, user_id: str, metric: HealthMetric) -> str:
+        """Redis key of a user's metric state"""
+        return f"{self.prefix}:state:{user_id}:{metric.value}"
+
+    def cooldown_key(self, user_id: str, rule: str) -> str:
+        """Redis key marking a rule cooling down for a user"""
+        return f"{self.prefix}:cooldown:{user_id}:{rule}"
+
+    async def load(
+        self,
+        client,
+        keys: list[tuple[str, HealthMetric]],
+        sizes: dict[HealthMetric, int],
+    ) -> dict[tuple[str, HealthMetric], MetricState]:
+        """State of each (user_id, metric), fresh where none is stored"""
+        states = {key: MetricState(sizes.get(key[1], 1)) for key in keys}
+        if not keys:
+            return states
+        pipe = client.pipeline(transaction=False)
+        for user_id, metric in keys:
+            pipe.get(self.state_key(user_id, metric))
+        try:
+            stored = await pipe.execute()
+        except redis.RedisError:
+            self.failures += 1
+            logger.warning("alert state unavailable; evaluating without history")
+            return states
+        for key, data in zip(keys, stored):
+            if data is None:
+                self.missing += 1
+                continue
+            states[key] = MetricState.loads(data, sizes.get(key[1], 1))
+            self.loaded += 1
+        return states
+
+    async def save(
+        self, client, states: dict[tuple[str, HealthMetric], MetricState]
+    ) -> None:
+        """Write states back, renewing their expiry"""
+        if not states:
+            return
+        pipe = client.pipeline(transaction=False)
+        for (user_id, metric), state in states.items():
+            pipe.set(
+                self.state_key(user_id, metric), state.dumps(), ex=self.ttl_seconds
+            )
+        try:
+            await pipe.execute()
+        except redis.RedisError:
+            self.failures += 1
+            logger.warning("alert state for %d metrics not saved", len(states))
+            return
+        self.saved += len(states)
+
+    async def cooling(
+        self, client, pairs: list[tuple[str, str]]
+    ) -> set[tuple[str, str]]:
+        """The (user_id, rule) pairs still in a cooldown"""
+        if not pairs:
+            return set()
+        pipe = client.pipeline(transaction=False)
+        for user_id, rule in pairs:
+            pipe.exists(self.cooldown_key(user_id, rule))
+        try:
+            found = await pipe.execute()
+        except redis.RedisError:
+            self.failures += 1
+            return set()
+        cooling = {pair for pair, exists in zip(pairs, found) if exists}
+        self.cooling_down += len(cooling)
+        return cooling
+
+    async def start_cooldowns(
+        self, client, cooldowns: dict[tuple[str, str], int]
+    ) -> None:
+        """Start a cooldown of the given seconds for each (user_id, rule)"""
+        pipe = client.pipeline(transaction=False)
+        pending = 0
+        for (user_id, rule), seconds in cooldowns.items():
+            if seconds > 0:
+                pipe.set(self.cooldown_key(user_id, rule), "1", ex=seconds)
+                pending += 1
+        if not pending:
+            return
+        try:
+            await pipe.execute()
+        except redis.RedisError:
+            self.failures += 1
+            logger.warning("%d alert cooldowns not started", pending)
+
+    def stats(self) -> dict:
+        """Load, save and cooldown counters"""
+        return {
+            "loaded": self.loaded,
+            "missing": self.missing,
+            "saved": self.saved,
+            "cooling_down": self.cooling_down,
+            "failures": self.failures,
+        }
+
+
+alert_state = AlertStateStore(ttl_seconds=settings.ALERT_STATE_TTL_SECONDS)
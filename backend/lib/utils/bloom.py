@@ -0,0 +1,62 @@
+"""Bloom filter sized from a target false-positive rate and a memory ceiling."""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Probabilistic set: no false negatives, tunable false positives"""
+
+    def __init__(
+        self, capacity: int, error_rate: float = 0.001, max_bytes: int | None = None
+    ):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        if max_bytes is not None:
+            bits = min(bits, max_bytes * 8)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(bits, 8)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        """Bit positions for an item, by double hashing one digest"""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter"""
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the bit array"""
+        return len(self._bits)
+
+    @property
+    def saturated(self) -> bool:
+        """Whether more items were added than the filter was sized for"""
+        return self.count > self.capacity
+
+    def estimated_error_rate(self) -> float:
+        """False-positive rate expected at the current fill"""
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** (
+            self.hash_count
+        )
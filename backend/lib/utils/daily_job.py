@@ -0,0 +1,118 @@
+"""Background jobs run once a day.
+
+A job runs at a fixed UTC hour on every worker that starts it, but only
+the first worker to take that day's Redis lock does the work. When Redis
+is unavailable every worker runs it, so a job must be safe to run twice.
+Each run's summary (rows processed, throughput, lag) is kept for
+`/metrics`.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta, timezone
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class DailyJob:
+    """Run `run(day)` once a day at `hour` UTC, on one worker"""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[date], Awaitable[dict]],
+        hour: int = 2,
+        prefix: str = "jobs",
+    ):
+        self.name = name
+        self._run = run
+        self.hour = hour
+        self.prefix = prefix
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_run_at: datetime | None = None
+        self.last_run_seconds = 0.0
+        self.last_result: dict = {}
+        self._stop: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def lock_key(self, day: date) -> str:
+        """Redis key claiming a day's run"""
+        return f"{self.prefix}:{self.name}:{day.isoformat()}"
+
+    def next_run_at(self, now: datetime) -> datetime:
+        """The next time the job is due after `now`"""
+        run_at = now.replace(hour=self.hour, minute=0, second=0, microsecond=0)
+        return run_at if run_at > now else run_at + timedelta(days=1)
+
+    async def claim(self, client, day: date) -> bool:
+        """Take a day's run; False if another worker already has"""
+        try:
+            return bool(await client.set(self.lock_key(day), "1", ex=86400, nx=True))
+        except redis.RedisError:
+            logger.warning("%s lock unavailable; running without it", self.name)
+            return True
+
+    async def run_once(self, client, day: date | None = None) -> dict | None:
+        """Run for a day (today UTC) unless already claimed; the summary"""
+        day = day or datetime.now(timezone.utc).date()
+        if not await self.claim(client, day):
+            self.skipped += 1
+            return None
+        start = time.perf_counter()
+        try:
+            result = await self._run(day)
+        except Exception:
+            self.failures += 1
+            logger.exception("%s run for %s failed", self.name, day)
+            return None
+        self.runs += 1
+        self.last_run_at = datetime.now(timezone.utc)
+        self.last_run_seconds = time.perf_counter() - start
+        self.last_result = result
+        return result
+
+    async def _loop(self, client, stop: asyncio.Event) -> None:
+        """Sleep until each run is due, until stopped"""
+        while not stop.is_set():
+            now = datetime.now(timezone.utc)
+            delay = (self.next_run_at(now) - now).total_seconds()
+            try:
+                await asyncio.wait_for(stop.wait(), delay)
+            except asyncio.TimeoutError:
+                await self.run_once(client)
+
+    def start(self, client) -> None:
+        """Schedule the job on the running loop"""
+        if self._task is None:
+            self._stop = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(
+                self._loop(client, self._stop)
+            )
+
+    async def stop(self) -> None:
+        """Stop scheduling, letting a run in progress finish"""
+        if self._task is not None:
+            self._stop.set()
+            await self._task
+            self._task = None
+
+    def stats(self) -> dict:
+        """Run counters, the last run's summary and how long ago it finished"""
+        since = None
+        if self.last_run_at is not None:
+            since = (datetime.now(timezone.utc) - self.last_run_at).total_seconds()
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_run_at": self.last_run_at,
+            "last_run_seconds": self.last_run_seconds,
+            "seconds_since_last_run": since,
+            **self.last_result,
+        }
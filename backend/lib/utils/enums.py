@@ -1,5 +1,5 @@
 """Enums for user types, organization roles,
-subscription tiers, and currencies."""
+subscription tiers, currencies and health metrics."""
 
 from enum import Enum
 
@@ -36,3 +36,49 @@ class Currency(str, Enum):
     USD = "USD"
     NGN = "NGN"
     EUR = "EUR"
+
+
+class HealthMetric(str, Enum):
+    """Enums for numeric health metrics recorded as time series"""
+
+    HEART_RATE = "heart_rate"
+    BLOOD_GLUCOSE = "blood_glucose"
+    BODY_TEMPERATURE = "body_temperature"
+    RESPIRATORY_RATE = "respiratory_rate"
+
+
+class RollupResolution(str, Enum):
+    """Enums for health metric rollup bucket sizes"""
+
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+
+
+class AlertKind(str, Enum):
+    """Enums for how a health alert rule reads a metric"""
+
+    THRESHOLD = "threshold"
+    TREND = "trend"
+    RATE = "rate"
+    DEVIATION = "deviation"
+
+
+class AlertSeverity(str, Enum):
+    """Enums for health alert severities"""
+
+    WARNING = "warning"
+    CRITICAL = "critical"
+
+
+class Unit(str, Enum):
+    """Enums for measurement units accepted on input"""
+
+    KILOGRAM = "kg"
+    POUND = "lb"
+    CENTIMETER = "cm"
+    INCH = "in"
+    MMOL_PER_L = "mmol/L"
+    MG_PER_DL = "mg/dL"
+    CELSIUS = "C"
+    FAHRENHEIT = "F"
@@ -0,0 +1,37 @@
+"""Opaque keyset pagination cursors.
+
+A cursor is the sort key of the last row on a page, so the next page is a
+range seek on an index (`WHERE (a, b) > (:a, :b) ORDER BY a, b LIMIT n`)
+and costs the same however deep it is, unlike OFFSET which scans and
+discards every earlier row.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+import orjson
+from lib.errorlib.auth import InvalidCursorException
+
+PAGE_SIZE_DEFAULT = 50
+PAGE_SIZE_MAX = 200
+
+
+def encode_cursor(*values) -> str:
+    """Encode a row's sort key as an opaque cursor"""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """Decode a cursor into a sort key of the given column types"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor has the wrong shape")
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, values)
+        )
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorException() from exc
@@ -0,0 +1,84 @@
+"""Bounded worker pool for password hashing.
+
+bcrypt is deliberately slow, so hashing and verification run on a
+dedicated executor instead of the event loop. The number of in-flight jobs
+is capped: once the queue is full, callers fail fast with a 503 rather
+than piling up behind a login storm.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Literal, TypeVar
+
+from app.api.core.config import settings
+from lib.errorlib.auth import PasswordHasherBusyException
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """Run password hashing jobs on a bounded executor"""
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"] = "thread",
+        workers: int = 4,
+        max_pending: int = 64,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError("PASSWORD_HASH_EXECUTOR must be 'thread' or 'process'")
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.rejected = 0
+        self._executor: Executor | None = None
+
+    @property
+    def executor(self) -> Executor:
+        """Executor, created on first use so importing never forks"""
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hasher"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run func(*args) on the pool, rejecting work once the queue is full"""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusyException()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    def stats(self) -> dict:
+        """Current queue depth and rejection count"""
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the executor, waiting for running jobs"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    kind=settings.PASSWORD_HASH_EXECUTOR,  # type: ignore[arg-type]
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=(
+        settings.PASSWORD_HASH_MAX_PENDING or settings.PASSWORD_HASH_WORKERS * 16
+    ),
+)
@@ -0,0 +1,357 @@
+"""Async Redis client: connection pool, circuit breaker and in-memory backend"""
+
+import fnmatch
+import inspect
+import time
+
+import redis
+import redis.asyncio
+from app.api.core.config import settings
+
+
+class CircuitOpenError(redis.ConnectionError):
+    """Raised without touching Redis while the circuit is open"""
+
+
+class CircuitBreaker:
+    """Stop calling Redis after repeated failures, then retry after a pause.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls fail fast with CircuitOpenError. Once `reset_seconds` have passed
+    a single trial call is let through; success closes the circuit, failure
+    keeps it open for another `reset_seconds`.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.consecutive_failures = 0
+        self.failures = 0
+        self.rejected = 0
+        self.opened = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        """closed, open or half_open"""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    async def call(self, func, *args, **kwargs):
+        """Run a Redis command through the breaker"""
+        if self._opened_at is not None:
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                self.rejected += 1
+                raise CircuitOpenError("Redis circuit breaker is open")
+            # Half open: re-arm so only this call probes Redis
+            self._opened_at = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+        except redis.RedisError:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    self.opened += 1
+                self._opened_at = time.monotonic()
+            raise
+        self.consecutive_failures = 0
+        self._opened_at = None
+        return result
+
+    def stats(self) -> dict:
+        """Breaker state and counters"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "opened": self.opened,
+        }
+
+
+class _GuardedPipeline:
+    """Pipeline whose execute goes through the circuit breaker"""
+
+    def __init__(self, pipeline, breaker: CircuitBreaker):
+        self._pipeline = pipeline
+        self._breaker = breaker
+
+    def __getattr__(self, name):
+        return getattr(self._pipeline, name)
+
+    async def execute(self):
+        return await self._breaker.call(self._pipeline.execute)
+
+
+class GuardedRedis:
+    """Async Redis client whose commands all go through a circuit breaker"""
+
+    def __init__(self, client, breaker: CircuitBreaker, backend: str):
+        self.client = client
+        self.breaker = breaker
+        self.backend = backend
+
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+
+        async def guarded(*args, **kwargs):
+            return await self.breaker.call(command, *args, **kwargs)
+
+        return guarded
+
+    def pipeline(self, transaction: bool = True) -> _GuardedPipeline:
+        """Buffer commands and send them in one round trip"""
+        return _GuardedPipeline(
+            self.client.pipeline(transaction=transaction), self.breaker
+        )
+
+    async def aclose(self) -> None:
+        """Close the client and its connection pool"""
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        """Backend and circuit breaker state"""
+        return {"backend": self.backend, "breaker": self.breaker.stats()}
+
+
+def _score_bound(value) -> tuple[float, bool]:
+    """Parse a sorted set bound into (score, exclusive)"""
+    if isinstance(value, str):
+        if value.startswith("("):
+            return float(value[1:]), True
+        return float(value), False
+    return float(value), False
+
+
+class _InMemoryPipeline:
+    """Buffered commands for InMemoryRedis, run in order on execute"""
+
+    def __init__(self, client: "InMemoryRedis"):
+        self._client = client
+        self._commands: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name):
+        getattr(self._client, name)
+
+        def buffer(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return buffer
+
+    async def execute(self) -> list:
+        commands, self._commands = self._commands, []
+        return [
+            await getattr(self._client, name)(*args, **kwargs)
+            for name, args, kwargs in commands
+        ]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._commands = []
+
+
+class InMemoryRedis:
+    """In-process stand-in for the subset of Redis the app uses.
+
+    For tests and single-process development only: nothing is shared
+    between workers and nothing survives a restart.
+    """
+
+    def __init__(self):
+        self._data: dict[str, object] = {}
+        self._expires: dict[str, float] = {}
+
+    def _live(self, name: str) -> bool:
+        expires_at = self._expires.get(name)
+        if expires_at is not None and expires_at <= time.time():
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+        return name in self._data
+
+    def _container(self, name: str, kind: type):
+        if not self._live(name):
+            self._data[name] = kind()
+        return self._data[name]
+
+    def pipeline(self, transaction: bool = True) -> _InMemoryPipeline:
+        return _InMemoryPipeline(self)
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, name: str):
+        return self._data.get(name) if self._live(name) else None
+
+    async def set(self, name: str, value, ex: int | None = None, nx: bool = False):
+        if nx and self._live(name):
+            return None
+        self._data[name] = str(value)
+        self._expires.pop(name, None)
+        if ex is not None:
+            self._expires[name] = time.time() + ex
+        return True
+
+    async def setex(self, name: str, time_seconds: int, value) -> bool:
+        return await self.set(name, value, ex=time_seconds)
+
+    async def getdel(self, name: str):
+        value = await self.get(name)
+        await self.delete(name)
+        return value
+
+    async def exists(self, *names: str) -> int:
+        return sum(1 for name in names if self._live(name))
+
+    async def delete(self, *names: str) -> int:
+        removed = 0
+        for name in names:
+            if self._live(name):
+                removed += 1
+            self._data.pop(name, None)
+            self._expires.pop(name, None)
+        return removed
+
+    async def expire(self, name: str, time_seconds: int) -> bool:
+        if not self._live(name):
+            return False
+        self._expires[name] = time.time() + time_seconds
+        return True
+
+    async def ttl(self, name: str) -> int:
+        if not self._live(name):
+            return -2
+        expires_at = self._expires.get(name)
+        return -1 if expires_at is None else int(expires_at - time.time())
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        value = int(await self.get(name) or 0) + amount
+        self._data[name] = str(value)
+        return value
+
+    async def keys(self, pattern: str = "*") -> list[str]:
+        return [
+            name
+            for name in list(self._data)
+            if self._live(name) and fnmatch.fnmatchcase(name, pattern)
+        ]
+
+    async def sadd(self, name: str, *values) -> int:
+        members = self._container(name, set)
+        added = len({str(value) for value in values} - members)
+        members.update(str(value) for value in values)
+        return added
+
+    async def srem(self, name: str, *values) -> int:
+        if not self._live(name):
+            return 0
+        members = self._data[name]
+        removed = len(members & {str(value) for value in values})
+        members.difference_update(str(value) for value in values)
+        return removed
+
+    async def smembers(self, name: str) -> "set[str]":
+        return set(self._data[name]) if self._live(name) else set()
+
+    async def scard(self, name: str) -> int:
+        return len(self._data[name]) if self._live(name) else 0
+
+    async def zadd(self, name: str, mapping: dict) -> int:
+        members = self._container(name, dict)
+        added = sum(1 for member in mapping if str(member) not in members)
+        members.update({str(member): float(score) for member, score in mapping.items()})
+        return added
+
+    def _zrange(self, name: str, low, high) -> list[tuple[str, float]]:
+        if not self._live(name):
+            return []
+        low_score, low_open = _score_bound(low)
+        high_score, high_open = _score_bound(high)
+        return sorted(
+            (
+                (member, score)
+                for member, score in self._data[name].items()
+                if (score > low_score if low_open else score >= low_score)
+                and (score < high_score if high_open else score <= high_score)
+            ),
+            key=lambda item: (item[1], item[0]),
+        )
+
+    async def zrangebyscore(self, name: str, min, max, withscores: bool = False):
+        entries = self._zrange(name, min, max)
+        return entries if withscores else [member for member, _ in entries]
+
+    async def zremrangebyscore(self, name: str, min, max) -> int:
+        entries = self._zrange(name, min, max)
+        for member, _ in entries:
+            del self._data[name][member]
+        return len(entries)
+
+    async def zrem(self, name: str, *values) -> int:
+        if not self._live(name):
+            return 0
+        return sum(
+            1 for value in values if self._data[name].pop(str(value), None) is not None
+        )
+
+    async def zcard(self, name: str) -> int:
+        return len(self._data[name]) if self._live(name) else 0
+
+    async def flushdb(self) -> bool:
+        self._data.clear()
+        self._expires.clear()
+        return True
+
+    async def aclose(self) -> None:
+        return None
+
+
+def create_redis_client(
+    backend: str = "redis",
+    url: str = "redis://localhost:6379/0",
+    max_connections: int = 50,
+    socket_timeout: float = 0.5,
+    connect_timeout: float = 0.5,
+    breaker: CircuitBreaker | None = None,
+) -> GuardedRedis:
+    """Build a Redis backend behind a circuit breaker.
+
+    Connections come from a bounded pool; a caller waits at most
+    `connect_timeout` for one, and every command at most `socket_timeout`.
+    """
+    breaker = breaker or CircuitBreaker()
+    if backend == "memory":
+        return GuardedRedis(InMemoryRedis(), breaker, "memory")
+    if backend != "redis":
+        raise ValueError(f"Unknown REDIS_BACKEND: {backend}")
+
+    pool = redis.asyncio.BlockingConnectionPool.from_url(
+        url,
+        max_connections=max_connections,
+        timeout=connect_timeout,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=connect_timeout,
+        decode_responses=True,
+    )
+    return GuardedRedis(redis.asyncio.Redis.from_pool(pool), breaker, "redis")
+
+
+redis_client = create_redis_client(
+    backend=settings.REDIS_BACKEND,
+    url=settings.REDIS_URL,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.REDIS_BREAKER_FAILURES,
+        reset_seconds=settings.REDIS_BREAKER_RESET_SECONDS,
+    ),
+)
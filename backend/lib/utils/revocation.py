@@ -0,0 +1,165 @@
+"""Per-worker revocation filter in front of the Redis token blacklist.
+
+Almost no tokens are ever revoked, yet every verification used to ask
+Redis. Each worker keeps a bloom filter of revoked jtis instead, kept in
+sync by pulling new entries from a Redis sorted set of revocations (scored
+by revocation time) every `sync_seconds`. A jti the filter has never seen
+is not revoked and needs no network call; only filter hits are confirmed
+against the blacklist itself.
+
+Revocations made by this worker are added locally at once. Revocations
+made elsewhere are picked up on the next pull, and apply to tokens in the
+token cache too: cached tokens are looked up here on every hit. If the
+filter cannot be kept fresh, every lookup falls through to Redis.
+"""
+
+import time
+
+import redis
+from app.api.core.config import settings
+from lib.utils.bloom import BloomFilter
+
+REVOKED_JTIS_KEY = "revoked_jtis"
+
+# Overlap between delta pulls, to tolerate clock skew between workers
+CLOCK_SKEW_SECONDS = 5.0
+
+
+class RevocationFilter:
+    """Bloom filter of revoked jtis, synced from Redis by delta pulls"""
+
+    def __init__(
+        self,
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        max_bytes: int | None = None,
+        sync_seconds: float = 5.0,
+        rebuild_seconds: float = 3600.0,
+        retention_seconds: float = 7 * 24 * 3600,
+        enabled: bool = True,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.max_bytes = max_bytes
+        self.sync_seconds = sync_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self.retention_seconds = retention_seconds
+        self.enabled = enabled
+        self.filter_hits = 0
+        self.filter_misses = 0
+        self.syncs = 0
+        self.sync_failures = 0
+        self._filter: BloomFilter | None = None
+        self._built_at = 0.0
+        self._synced_at = 0.0
+        self._next_sync_at = 0.0
+        self._cursor = 0.0
+        self._syncing = False
+        self._recorded_during_sync: list[str] = []
+
+    def _new_filter(self) -> BloomFilter:
+        return BloomFilter(self.capacity, self.error_rate, self.max_bytes)
+
+    def record(self, pipe, *jtis: str) -> None:
+        """Stage revocations on a Redis pipeline and add them locally"""
+        now = time.time()
+        pipe.zadd(REVOKED_JTIS_KEY, {jti: now for jti in jtis})
+        pipe.zremrangebyscore(REVOKED_JTIS_KEY, "-inf", now - self.retention_seconds)
+        for jti in jtis:
+            self.add(jti)
+
+    def add(self, jti: str) -> None:
+        """Mark a jti as revoked in this worker's filter"""
+        if self._filter is not None:
+            self._filter.add(jti)
+        if self._syncing:
+            # A rebuild in flight may have read the sorted set before this
+            self._recorded_during_sync.append(jti)
+
+    def contains(self, jti: str) -> bool:
+        """Whether the filter has seen a jti, without syncing"""
+        return self._filter is not None and jti in self._filter
+
+    async def sync(self, client) -> None:
+        """Pull revocations recorded since the last sync, or rebuild"""
+        now = time.time()
+        self._next_sync_at = now + self.sync_seconds
+        rebuild = (
+            self._filter is None
+            or self._filter.saturated
+            or now - self._built_at >= self.rebuild_seconds
+        )
+        since = now - self.retention_seconds if rebuild else self._cursor
+        self._syncing = True
+        try:
+            entries = await client.zrangebyscore(
+                REVOKED_JTIS_KEY, since - CLOCK_SKEW_SECONDS, "+inf", withscores=True
+            )
+        except redis.RedisError:
+            self.sync_failures += 1
+            return
+        finally:
+            self._syncing = False
+            recorded, self._recorded_during_sync = self._recorded_during_sync, []
+
+        bloom = self._new_filter() if rebuild else self._filter
+        cursor = self._cursor
+        for member, score in entries:
+            if member not in bloom:
+                bloom.add(member)
+            cursor = max(cursor, score)
+        for jti in recorded:
+            if jti not in bloom:
+                bloom.add(jti)
+        if rebuild:
+            self._filter = bloom
+            self._built_at = now
+        self._cursor = cursor
+        self._synced_at = now
+        self.syncs += 1
+
+    async def might_be_revoked(self, client, jti: str) -> bool:
+        """False only when the jti is certainly not revoked"""
+        if not self.enabled:
+            return True
+        # One caller syncs when due; the others keep using the current filter
+        if time.time() >= self._next_sync_at and not self._syncing:
+            await self.sync(client)
+        now = time.time()
+        bloom = self._filter
+        if bloom is None or now - self._synced_at > 2 * self.sync_seconds:
+            return True
+        if jti in bloom:
+            self.filter_hits += 1
+            return True
+        self.filter_misses += 1
+        return False
+
+    def stats(self) -> dict:
+        """Filter size, fill and sync counters"""
+        bloom = self._filter
+        return {
+            "enabled": self.enabled,
+            "entries": bloom.count if bloom else 0,
+            "capacity": self.capacity,
+            "bytes": bloom.nbytes if bloom else 0,
+            "hash_count": bloom.hash_count if bloom else 0,
+            "estimated_error_rate": bloom.estimated_error_rate() if bloom else 0.0,
+            "filter_hits": self.filter_hits,
+            "filter_misses": self.filter_misses,
+            "syncs": self.syncs,
+            "sync_failures": self.sync_failures,
+            "last_sync_age": time.time() - self._synced_at if self._synced_at else None,
+        }
+
+
+revocation_filter = RevocationFilter(
+    capacity=settings.BLACKLIST_FILTER_CAPACITY,
+    error_rate=settings.BLACKLIST_FILTER_ERROR_RATE,
+    max_bytes=settings.BLACKLIST_FILTER_MAX_BYTES,
+    sync_seconds=settings.BLACKLIST_FILTER_SYNC_SECONDS,
+    rebuild_seconds=settings.BLACKLIST_FILTER_REBUILD_SECONDS,
+    # Revocations outlive every token they could apply to after this long
+    retention_seconds=settings.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600,
+    enabled=settings.BLACKLIST_FILTER_ENABLED,
+)
@@ -0,0 +1,66 @@
+"""Downsampled health metric rollups.
+
+Charts over long windows read pre-aggregated buckets instead of raw
+readings. Every reading lands in one minute, one hour and one day bucket;
+each bucket keeps count, sum, min and max, which merge by addition and
+min/max, so buckets are maintained incrementally from each batch of new
+readings without rereading history.
+"""
+
+from datetime import datetime, timedelta
+
+from lib.utils.enums import RollupResolution
+
+RESOLUTION_STEPS = {
+    RollupResolution.MINUTE: timedelta(minutes=1),
+    RollupResolution.HOUR: timedelta(hours=1),
+    RollupResolution.DAY: timedelta(days=1),
+}
+
+
+def bucket_start(ts: datetime, resolution: RollupResolution) -> datetime:
+    """Start of the bucket a timestamp falls in"""
+    if resolution is RollupResolution.MINUTE:
+        return ts.replace(second=0, microsecond=0)
+    if resolution is RollupResolution.HOUR:
+        return ts.replace(minute=0, second=0, microsecond=0)
+    return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def aggregate_readings(readings: list[dict]) -> list[dict]:
+    """Fold readings into rollup rows, one per (user, metric, resolution, bucket)"""
+    buckets: dict[tuple, dict] = {}
+    for reading in readings:
+        value = reading["value"]
+        for resolution in RollupResolution:
+            bucket = bucket_start(reading["ts"], resolution)
+            key = (reading["user_id"], reading["metric"], resolution, bucket)
+            row = buckets.get(key)
+            if row is None:
+                buckets[key] = {
+                    "user_id": reading["user_id"],
+                    "metric": reading["metric"],
+                    "resolution": resolution,
+                    "bucket": bucket,
+                    "count": 1,
+                    "sum": value,
+                    "min": value,
+                    "max": value,
+                }
+            else:
+                row["count"] += 1
+                row["sum"] += value
+                row["min"] = min(row["min"], value)
+                row["max"] = max(row["max"], value)
+    return list(buckets.values())
+
+
+def pick_resolution(
+    start: datetime, end: datetime, max_points: int
+) -> RollupResolution:
+    """Finest resolution whose bucket count for the window fits max_points"""
+    window = end - start
+    for resolution, step in RESOLUTION_STEPS.items():
+        if window / step <= max_points:
+            return resolution
+    return RollupResolution.DAY
@@ -0,0 +1,87 @@
+"""Per-account session registry and refresh token families.
+
+Every access token and refresh token family issued to an account is
+recorded in one Redis sorted set per account, scored by expiry. Revoking
+all of an account's sessions is then one read of the live members and one
+pipelined batch of writes. Expired members are pruned on every write, so
+each set stays the size of the account's live sessions.
+
+Refresh tokens rotate within a family: each carries the family id (`fam`)
+and its generation (`gen`), and the family's single key holds the current
+generation. Refreshing advances the generation, so the previous token is
+dead; presenting any older token is reuse, and revokes the family by
+deleting its key. Revocation state is one key per live family, never one
+per refresh token issued.
+"""
+
+SESSIONS_KEY_PREFIX = "sessions:"
+FAMILY_KEY_PREFIX = "refresh_family:"
+# Registry members naming a refresh token family rather than an access jti
+FAMILY_MEMBER_PREFIX = "family:"
+
+
+def sessions_key(sub: str) -> str:
+    """Registry key for an account"""
+    return f"{SESSIONS_KEY_PREFIX}{sub}"
+
+
+def stage_track(pipe, sub: str, entries: list[tuple[str, float]], now: float) -> None:
+    """Stage recording issued (jti, exp) pairs for an account"""
+    key = sessions_key(sub)
+    pipe.zadd(key, dict(entries))
+    pipe.zremrangebyscore(key, "-inf", now)
+    pipe.expire(key, max(1, int(max(exp for _, exp in entries) - now)))
+
+
+def stage_forget(pipe, sub: str, jtis: list[str]) -> None:
+    """Stage removal of revoked jtis from an account's registry"""
+    pipe.zrem(sessions_key(sub), *jtis)
+
+
+async def live_sessions(
+    client, subs: list[str], now: float
+) -> dict[str, list[tuple[str, float]]]:
+    """Unexpired (jti, exp) pairs of several accounts, in one round trip"""
+    pipe = client.pipeline(transaction=False)
+    for sub in subs:
+        pipe.zrangebyscore(sessions_key(sub), f"({now}", "+inf", withscores=True)
+    results = await pipe.execute()
+    return {sub: list(entries) for sub, entries in zip(subs, results)}
+
+
+def family_key(family: str) -> str:
+    """Key holding a refresh token family's current generation"""
+    return f"{FAMILY_KEY_PREFIX}{family}"
+
+
+def family_member(family: str) -> str:
+    """Registry member standing for a refresh token family"""
+    return f"{FAMILY_MEMBER_PREFIX}{family}"
+
+
+def stage_open_family(pipe, family: str, ttl_seconds: int) -> None:
+    """Stage a new family at generation 1"""
+    pipe.set(family_key(family), 1, ex=ttl_seconds)
+
+
+def stage_revoke_family(pipe, family: str) -> None:
+    """Stage revocation of every refresh token in a family"""
+    pipe.delete(family_key(family))
+
+
+async def rotate_family(client, family: str, generation: int, ttl_seconds: int) -> bool:
+    """Advance a family past `generation`, or revoke it on reuse.
+
+    INCR makes concurrent refreshes race safely: only the caller presenting
+    the current generation sees it advance by exactly one. Anything else
+    (an already rotated token, or a revoked or expired family) deletes the
+    family and returns False.
+    """
+    pipe = client.pipeline()
+    pipe.incr(family_key(family))
+    pipe.expire(family_key(family), ttl_seconds)
+    current, _ = await pipe.execute()
+    if int(current) == generation + 1:
+        return True
+    await client.delete(family_key(family))
+    return False
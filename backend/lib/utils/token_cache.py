@@ -0,0 +1,157 @@
+"""In-process cache of verified access tokens.
+
+Verifying a token means a signature check plus a blacklist lookup in
+Redis. Protected routes see the same token many times before it expires,
+so verified payloads are cached per process, keyed by the token's digest,
+until the token's own `exp`.
+
+Revocation is honoured without a network call on cache hits: tokens
+revoked by this process are recorded in a local revocation set, and
+verification consults the worker's revocation filter
+(`lib/utils/revocation.py`) on every hit for revocations made elsewhere.
+With the filter disabled, entries are instead re-checked against the
+shared blacklist at most once every `revalidate_seconds`.
+"""
+
+import hashlib
+import heapq
+import threading
+import time
+from collections import OrderedDict
+
+from app.api.core.config import settings
+
+
+class _Entry:
+    """Cached payload with its expiry and last blacklist check"""
+
+    __slots__ = ("payload", "expires_at", "checked_at")
+
+    def __init__(self, payload: dict, expires_at: float, checked_at: float):
+        self.payload = payload
+        self.expires_at = expires_at
+        self.checked_at = checked_at
+
+
+class TokenCache:
+    """Bounded, TTL-aware LRU of verified token payloads"""
+
+    def __init__(self, max_entries: int = 10000, revalidate_seconds: float = 30.0):
+        self.max_entries = max_entries
+        self.revalidate_seconds = revalidate_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._revoked: dict[str, float] = {}
+        # (expires_at, jti) of local revocations, soonest expiry first
+        self._revoked_expiries: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        """Cache key: the token's SHA-256 digest, never the token itself"""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> tuple[dict, bool] | None:
+        """Return (payload, needs_revalidation) for a live cached token"""
+        now = time.time()
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            jti = entry.payload.get("jti")
+            if jti is not None and jti in self._revoked:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            stale = now - entry.checked_at >= self.revalidate_seconds
+            return entry.payload, stale
+
+    def put(self, token: str, payload: dict) -> None:
+        """Cache a verified payload until the token expires"""
+        expires_at = payload.get("exp")
+        if expires_at is None or self.max_entries <= 0:
+            return
+        key = self.key(token)
+        now = time.time()
+        with self._lock:
+            self._entries[key] = _Entry(payload, float(expires_at), now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def mark_checked(self, token: str) -> None:
+        """Record that a cached token was just re-checked against the blacklist"""
+        with self._lock:
+            entry = self._entries.get(self.key(token))
+            if entry is not None:
+                entry.checked_at = time.time()
+
+    def revoke(self, jti: str, expires_at: float) -> None:
+        """Reject a jti locally until its token would have expired anyway.
+
+        At most `max_entries` revocations are kept; past that the one that
+        expires soonest is forgotten locally, and only the shared blacklist
+        rejects its token. Each call is O(log n).
+        """
+        now = time.time()
+        with self._lock:
+            self._revoked[jti] = expires_at
+            heapq.heappush(self._revoked_expiries, (expires_at, jti))
+            while self._revoked_expiries and (
+                self._revoked_expiries[0][0] <= now
+                or len(self._revoked) > max(self.max_entries, 1)
+            ):
+                self._forget_soonest()
+
+    def _forget_soonest(self) -> None:
+        """Drop the revocation that expires soonest; call with the lock held"""
+        exp, jti = heapq.heappop(self._revoked_expiries)
+        # Skip heap entries left behind by a jti revoked again or pruned
+        if self._revoked.get(jti) == exp:
+            del self._revoked[jti]
+
+    def is_revoked(self, jti: str) -> bool:
+        """Whether this process has revoked a jti"""
+        with self._lock:
+            expires_at = self._revoked.get(jti)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                del self._revoked[jti]
+                return False
+            return True
+
+    def clear(self) -> None:
+        """Drop every cached payload and local revocation"""
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+            self._revoked_expiries.clear()
+
+    def stats(self) -> dict:
+        """Size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "revoked_local": len(self._revoked),
+        }
+
+
+token_cache = TokenCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    revalidate_seconds=settings.TOKEN_CACHE_REVALIDATE_SECONDS,
+)
@@ -1,21 +1,79 @@
 """Utility functions for handling JWT tokens."""
 
 import os
+import time
 import uuid
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
 
 import bcrypt
 import redis
 from fastapi import Response
 from jose import JWTError, jwt
+from lib.errorlib.auth import SessionStoreUnavailableException
+from lib.utils.enums import UserType
+from lib.utils.password_hasher import password_hasher
+from lib.utils.redis_client import redis_client
+from lib.utils.revocation import revocation_filter
+from lib.utils.sessions import (
+    FAMILY_MEMBER_PREFIX,
+    family_member,
+    live_sessions,
+    rotate_family,
+    sessions_key,
+    stage_forget,
+    stage_open_family,
+    stage_revoke_family,
+    stage_track,
+)
+from lib.utils.token_cache import token_cache
+from pydantic import BaseModel, ValidationError
 
 SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
+REFRESH_TOKEN_TTL_SECONDS = REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
 
+# Bump when the claim layout changes; tokens carrying another version are rejected
+TOKEN_CLAIMS_VERSION = 1
+# Claims a refresh token carries: who it was issued to, never what they may do
+REFRESH_TOKEN_CLAIMS = ("sub", "user_type", "ver")
+# `typ` claim values; each token is only accepted where its type is expected
+ACCESS_TOKEN_TYPE = "access"
+REFRESH_TOKEN_TYPE = "refresh"
 
-redis_client = redis.Redis(host="localhost", port=6379, db=0)
+
+class TokenClaims(BaseModel):
+    """Identity claims carried by access and refresh tokens.
+
+    `user_type` may be unset, in which case the subject is looked up across
+    every account table. Refresh tokens carry no `role` or `org_id`: those
+    are reloaded from the account on every rotation.
+    """
+
+    sub: str
+    user_type: UserType | None = None
+    role: str | None = None
+    org_id: str | None = None
+    ver: int | None = None
+
+    def to_jwt(self) -> dict:
+        """Claims to encode, with the current version stamped"""
+        data = self.model_dump(mode="json", exclude_none=True)
+        data["ver"] = TOKEN_CLAIMS_VERSION
+        return data
+
+
+def decode_token_claims(payload: dict, credentials_exception: Exception) -> TokenClaims:
+    """Validate the identity claims of a decoded token payload."""
+    try:
+        claims = TokenClaims.model_validate(payload)
+    except ValidationError as exc:
+        raise credentials_exception from exc
+    if claims.ver is not None and claims.ver != TOKEN_CLAIMS_VERSION:
+        raise credentials_exception
+    return claims
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -26,7 +84,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     else:
         expire = datetime.now() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     jti = str(uuid.uuid4())
-    to_encode.update({"exp": expire.timestamp(), "jti": jti})
+    to_encode.update({"exp": expire.timestamp(), "jti": jti, "typ": ACCESS_TOKEN_TYPE})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -39,32 +97,170 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None) ->
     else:
         expire = datetime.now() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     jti = str(uuid.uuid4())
-    to_encode.update({"exp": expire.timestamp(), "jti": jti})
+    to_encode.update({"exp": expire.timestamp(), "jti": jti, "typ": REFRESH_TOKEN_TYPE})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def blacklist_token(jti: str, expires_in_seconds: int):
-    """Blacklist token"""
-    redis_client.setex(jti, expires_in_seconds, "true")
+def revocation_entry(payload: dict) -> tuple[str, float]:
+    """Registry member and expiry of a decoded token.
 
+    Rotating refresh tokens are revoked through their family; any other
+    token through its jti.
+    """
+    family = payload.get("fam")
+    member = family_member(family) if family else payload["jti"]
+    return member, float(payload["exp"])
+
+
+def token_entry(token: str) -> tuple[str, float]:
+    """Registry member and expiry of a token this service signed"""
+    return revocation_entry(jwt.get_unverified_claims(token))
+
+
+async def issue_tokens(
+    claims: dict, family: str | None = None, generation: int = 1
+) -> tuple[str, str]:
+    """Create an access token and a rotating refresh token.
+
+    Without `family` a new refresh token family is opened; if Redis cannot
+    record it, SessionStoreUnavailableException is raised, since the refresh
+    token could never rotate. A rotated session is recorded in the account's
+    registry on a best-effort basis: if Redis is unavailable the tokens still
+    work, they just cannot be revoked in bulk.
+    """
+    new_family = family is None
+    family = family or uuid.uuid4().hex
+    access_token = create_access_token(data=claims)
+    refresh_claims = {key: claims[key] for key in REFRESH_TOKEN_CLAIMS if key in claims}
+    refresh_token = create_refresh_token(
+        data={**refresh_claims, "fam": family, "gen": generation}
+    )
+
+    pipe = redis_client.pipeline()
+    if new_family:
+        stage_open_family(pipe, family, REFRESH_TOKEN_TTL_SECONDS)
+    stage_track(
+        pipe,
+        claims["sub"],
+        [token_entry(access_token), token_entry(refresh_token)],
+        time.time(),
+    )
+    try:
+        await pipe.execute()
+    except redis.RedisError as exc:
+        if new_family:
+            raise SessionStoreUnavailableException(
+                "Sessions cannot be opened right now, please retry shortly."
+            ) from exc
+    return access_token, refresh_token
+
+
+def _stage_revocations(pipe, entries: list[tuple[str, float]], now: float) -> None:
+    """Stage revocation of unexpired registry entries"""
+    jtis = []
+    for member, exp in entries:
+        if exp <= now:
+            continue
+        if member.startswith(FAMILY_MEMBER_PREFIX):
+            stage_revoke_family(pipe, member.removeprefix(FAMILY_MEMBER_PREFIX))
+            continue
+        token_cache.revoke(member, exp)
+        pipe.setex(member, max(1, int(exp - now)), "true")
+        jtis.append(member)
+    if jtis:
+        revocation_filter.record(pipe, *jtis)
 
-def is_token_blacklisted(jti: str) -> bool:
-    """Check if token is blacklisted"""
-    return redis_client.exists(jti) == 1
 
+async def blacklist_tokens(
+    entries: list[tuple[str, float]], sub: str | None = None
+) -> bool:
+    """Revoke registry entries (see `revocation_entry`) in one round trip.
 
-def verify_access_token(token: str, credentials_exception: Exception) -> dict:
-    """Verify the JWT access token, reject it if
-    blacklisted and return the payload."""
+    When `sub` is given the entries are also dropped from that account's
+    session registry. Returns False when Redis could not record them; the
+    tokens are then only revoked in this worker.
+    """
+    now = time.time()
+    pipe = redis_client.pipeline()
+    _stage_revocations(pipe, entries, now)
+    if sub is not None and entries:
+        stage_forget(pipe, sub, [jti for jti, _ in entries])
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        await pipe.execute()
+    except redis.RedisError:
+        return False
+    return True
+
+
+async def revoke_all_sessions(*subs: str) -> int:
+    """Revoke every live token of the given accounts.
+
+    One round trip reads the registries and one pipelined batch blacklists
+    every token and clears them, however many accounts and tokens there
+    are. Raises redis.RedisError when Redis is unavailable.
+    """
+    if not subs:
+        return 0
+    now = time.time()
+    sessions = await live_sessions(redis_client, list(subs), now)
+    entries = [entry for live in sessions.values() for entry in live]
+    pipe = redis_client.pipeline()
+    _stage_revocations(pipe, entries, now)
+    pipe.delete(*(sessions_key(sub) for sub in subs))
+    await pipe.execute()
+    return len(entries)
+
+
+async def _confirm_blacklisted(jti: str) -> bool:
+    """Look a jti up in the Redis blacklist itself"""
+    try:
+        return await redis_client.exists(jti) == 1
+    except redis.RedisError:
+        # Redis is unavailable: fall back to the revocations this worker knows
+        return token_cache.is_revoked(jti) or revocation_filter.contains(jti)
+
+
+async def is_token_blacklisted(jti: str) -> bool:
+    """Check if token is blacklisted"""
+    if not await revocation_filter.might_be_revoked(redis_client, jti):
+        return False
+    return await _confirm_blacklisted(jti)
+
+
+async def verify_access_token(token: str, credentials_exception: Exception) -> dict:
+    """Verify the JWT access token, reject it if blacklisted or
+    not an access token, and return the payload."""
+    cached = token_cache.get(token)
+    if cached is not None:
+        payload, stale = cached
         jti = payload.get("jti")
-        if jti is not None and is_token_blacklisted(jti):
-            raise credentials_exception
+        # The revocation filter carries other workers' revocations, so it is
+        # consulted on every hit; without it, entries revalidate when stale
+        if jti is not None:
+            if revocation_filter.enabled:
+                suspect = await revocation_filter.might_be_revoked(redis_client, jti)
+            else:
+                suspect = stale
+            if suspect:
+                if await _confirm_blacklisted(jti):
+                    token_cache.revoke(jti, payload["exp"])
+                    raise credentials_exception
+                token_cache.mark_checked(token)
         return payload
+
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError as exc:
         raise credentials_exception from exc
+    # A refresh token is never a bearer credential, revoked or not
+    if payload.get("typ") != ACCESS_TOKEN_TYPE:
+        raise credentials_exception
+    jti = payload.get("jti")
+    if jti is not None and await is_token_blacklisted(jti):
+        raise credentials_exception
+    token_cache.put(token, payload)
+    return payload
 
 
 def delete_auth_cookies(response: Response):
@@ -73,33 +269,50 @@ def delete_auth_cookies(response: Response):
     response.delete_cookie("reefresh_token")
 
 
-def get_current_user(token: str, credentials_exception: Exception) -> dict:
-    """Get the current user from the JWT token."""
-    payload = verify_access_token(token, credentials_exception)
-    user_id = payload.get("sub")
-    if user_id is None:
-        raise credentials_exception
-    return {"user_id": user_id}
+async def get_current_user(token: str, credentials_exception: Exception) -> TokenClaims:
+    """Get the current user's claims from the JWT token."""
+    payload = await verify_access_token(token, credentials_exception)
+    return decode_token_claims(payload, credentials_exception)
+
 
+async def token_refresh(
+    refresh_token: str,
+    credentials_exception: Exception,
+    reload_claims: Callable[[TokenClaims], Awaitable[TokenClaims | None]],
+) -> tuple[str, str]:
+    """Rotate a refresh token into a new access and refresh token.
 
-def token_refresh(refresh_token: str, credentials_exception: Exception) -> str:
-    """Refresh the JWT access token if the refresh token is valid."""
+    The presented refresh token is spent; presenting it again revokes its
+    whole family. `reload_claims` returns the account's current claims, or
+    None once it no longer exists, so a changed role or organization takes
+    effect at the next rotation.
+    """
     try:
         payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
-        jti = payload.get("jti")
-        if jti is not None and is_token_blacklisted(jti):
-            raise credentials_exception
-        if payload.get("exp") is None:
-            raise credentials_exception
     except JWTError as exc:
         raise credentials_exception from exc
+    family = payload.get("fam")
+    if payload.get("typ") != REFRESH_TOKEN_TYPE or not family:
+        raise credentials_exception
 
-    user_id = payload.get("sub")
-    if not user_id:
+    claims = decode_token_claims(payload, credentials_exception)
+    if not claims.sub:
+        raise credentials_exception
+    claims = await reload_claims(claims)
+    if claims is None:
         raise credentials_exception
 
-    new_access_token = create_access_token(data={"sub": user_id})
-    return new_access_token
+    generation = int(payload.get("gen", 0))
+    try:
+        if not await rotate_family(
+            redis_client, family, generation, REFRESH_TOKEN_TTL_SECONDS
+        ):
+            raise credentials_exception
+        return await issue_tokens(
+            claims.to_jwt(), family=family, generation=generation + 1
+        )
+    except redis.RedisError as exc:
+        raise SessionStoreUnavailableException() from exc
 
 
 def hash_password(password: str) -> str:
@@ -114,6 +327,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the password hashing pool."""
+    return await password_hasher.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password hashing pool."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
 def is_strong_password(password: str) -> bool:
     """Check if the password is strong enough."""
     if len(password) < 8:
@@ -1,13 +1,146 @@
-"""Utility Function For User Dashboard"""
+"""Utility Function For User Dashboard
 
+Derived fields and unit conversions over whole columns at once: each
+function takes array-likes (lists, NumPy arrays) and returns a NumPy
+array, so a nightly job or an organization view converts or recomputes
+every patient's values in one vectorized pass. Missing or invalid inputs
+give NaN (NaT for dates) rather than raising.
+"""
 
-def unit_converter():
-    pass
+from datetime import date, datetime
 
+import numpy as np
+from lib.utils.enums import HealthMetric, Unit
 
-def calculate_bmi():
-    pass
+# Each unit as (scale, offset) from the unit values are stored in:
+# kg, cm, mmol/L (glucose) and degrees Celsius
+UNIT_FACTORS = {
+    Unit.KILOGRAM: (1.0, 0.0),
+    Unit.POUND: (0.45359237, 0.0),
+    Unit.CENTIMETER: (1.0, 0.0),
+    Unit.INCH: (2.54, 0.0),
+    Unit.MMOL_PER_L: (1.0, 0.0),
+    # Glucose, at the clinical convention of 18 mg/dL per mmol/L
+    Unit.MG_PER_DL: (1 / 18.0, 0.0),
+    Unit.CELSIUS: (1.0, 0.0),
+    Unit.FAHRENHEIT: (5 / 9, -32 * 5 / 9),
+}
+UNIT_BASES = {
+    Unit.KILOGRAM: Unit.KILOGRAM,
+    Unit.POUND: Unit.KILOGRAM,
+    Unit.CENTIMETER: Unit.CENTIMETER,
+    Unit.INCH: Unit.CENTIMETER,
+    Unit.MMOL_PER_L: Unit.MMOL_PER_L,
+    Unit.MG_PER_DL: Unit.MMOL_PER_L,
+    Unit.CELSIUS: Unit.CELSIUS,
+    Unit.FAHRENHEIT: Unit.CELSIUS,
+}
 
+# Unit each metric with a choice of units is stored in
+METRIC_UNITS = {
+    HealthMetric.BLOOD_GLUCOSE: Unit.MMOL_PER_L,
+    HealthMetric.BODY_TEMPERATURE: Unit.CELSIUS,
+}
 
-def parse_date():
-    pass
+
+def _floats(values) -> np.ndarray:
+    """Values as a float array; None becomes NaN"""
+    return np.asarray(
+        (
+            [np.nan if value is None else value for value in values]
+            if isinstance(values, (list, tuple))
+            else values
+        ),
+        dtype=np.float64,
+    )
+
+
+def unit_converter(values, from_unit: Unit, to_unit: Unit) -> np.ndarray:
+    """Convert a column of values between units of the same quantity"""
+    if UNIT_BASES[from_unit] is not UNIT_BASES[to_unit]:
+        raise ValueError(f"Cannot convert {from_unit.value} to {to_unit.value}")
+    values = _floats(values)
+    if from_unit is to_unit:
+        return values
+    scale, offset = UNIT_FACTORS[from_unit]
+    to_scale, to_offset = UNIT_FACTORS[to_unit]
+    return (values * scale + offset - to_offset) / to_scale
+
+
+def calculate_bmi(
+    weights,
+    heights,
+    weight_unit: Unit = Unit.KILOGRAM,
+    height_unit: Unit = Unit.CENTIMETER,
+) -> np.ndarray:
+    """Body mass index (kg/m2, one decimal) per weight and height"""
+    kilograms = unit_converter(weights, weight_unit, Unit.KILOGRAM)
+    meters = unit_converter(heights, height_unit, Unit.CENTIMETER) / 100
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bmi = np.where((kilograms > 0) & (meters > 0), kilograms / meters**2, np.nan)
+    return np.round(bmi, 1)
+
+
+def _day(value) -> str:
+    """ISO day of one date-like value, or NaT"""
+    if value is None:
+        return "NaT"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()[:10]
+    try:
+        return str(np.datetime64(str(value)[:10], "D"))
+    except ValueError:
+        return "NaT"
+
+
+def parse_date(values) -> np.ndarray:
+    """Dates (ISO strings, dates or datetimes) as datetime64[D]; NaT if invalid"""
+    values = list(values)
+    try:
+        # Parsed in C when every value is a clean ISO date
+        return np.array(values, dtype="datetime64[D]")
+    except (TypeError, ValueError):
+        return np.array([_day(value) for value in values], dtype="datetime64[D]")
+
+
+def calculate_age(dobs, on: date | None = None) -> np.ndarray:
+    """Age in whole years on a day (today by default); NaN if unknown"""
+    dobs = parse_date(dobs)
+    on = np.datetime64(on or date.today(), "D")
+    months = dobs.astype("datetime64[M]")
+    years = on.astype("datetime64[Y]").astype(np.int64) - dobs.astype(
+        "datetime64[Y]"
+    ).astype(np.int64)
+    on_months = on.astype("datetime64[M]")
+    # Not yet had this year's birthday: month and day compared as one number
+    birthday = (months.astype(np.int64) % 12) * 32 + (dobs - months).astype(np.int64)
+    today = (on_months.astype(np.int64) % 12) * 32 + (on - on_months).astype(np.int64)
+    ages = (years - (today < birthday)).astype(np.float64)
+    return np.where(np.isnat(dobs) | (dobs > on), np.nan, ages)
+
+
+def next_birthday(dobs, on: date | None = None) -> np.ndarray:
+    """First day after `on` (today by default) on which each age goes up.
+
+    A 29 February birthday falls on 1 March in other years, as
+    `calculate_age` counts it. NaT if the date of birth is unknown.
+    """
+    dobs = parse_date(dobs)
+    on = np.datetime64(on or date.today(), "D")
+    months = dobs.astype("datetime64[M]")
+    month_of_year = months.astype(np.int64) % 12
+    day_of_month = (dobs - months).astype(np.int64)
+    year = on.astype("datetime64[Y]").astype(np.int64)
+
+    def birthday(years: np.ndarray) -> np.ndarray:
+        start = (years * 12 + month_of_year).astype("datetime64[M]")
+        # Overflowing February rolls over into March
+        return start.astype("datetime64[D]") + day_of_month
+
+    this_year = birthday(np.full(dobs.shape, year))
+    upcoming = np.where(
+        this_year > on, this_year, birthday(np.full(dobs.shape, year + 1))
+    )
+    # Not born yet: the age is unknown until then, so recheck on the day
+    upcoming = np.where(dobs > on, dobs, upcoming)
+    return np.where(np.isnat(dobs), np.datetime64("NaT", "D"), upcoming)
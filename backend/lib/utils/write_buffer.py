@@ -0,0 +1,175 @@
+"""Bounded in-process write buffer flushed in bulk.
+
+High-frequency writers (wearables sending readings every few seconds)
+would otherwise cost one transaction per request. Rows are queued in
+memory instead and written by a background task in batches, when
+`flush_rows` are waiting or `flush_seconds` after the oldest one arrived,
+whichever comes first.
+
+The buffer is bounded: once `max_rows` are queued or being written, new
+rows are refused so callers can shed load (HTTP 429) rather than grow
+memory without limit. Rows still queued when a worker dies are lost; the
+buffer trades that window for throughput.
+
+A failed batch is retried ahead of newer rows, at most `max_attempts`
+times. After that it is written in halves, so one row the sink always
+refuses (a reading for a deleted user) is dropped on its own instead of
+blocking every row behind it.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class BufferFullError(Exception):
+    """Raised when a write buffer cannot take more rows"""
+
+
+class WriteBuffer:
+    """Queue rows in memory and hand them to `flush` in batches"""
+
+    def __init__(
+        self,
+        flush: Callable[[list[dict]], Awaitable[None]],
+        max_rows: int = 50000,
+        flush_rows: int = 1000,
+        flush_seconds: float = 1.0,
+        max_attempts: int = 3,
+    ):
+        self._flush = flush
+        self.max_rows = max_rows
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.max_attempts = max_attempts
+        self.accepted = 0
+        self.rejected = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.flush_failures = 0
+        self.dropped = 0
+        self.last_flush_seconds = 0.0
+        self._rows: list[dict] = []
+        self._oldest_at = 0.0
+        self._inflight = 0
+        self._attempts = 0
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    @property
+    def pending(self) -> int:
+        """Rows queued or being written"""
+        return len(self._rows) + self._inflight
+
+    def add(self, rows: list[dict]) -> None:
+        """Queue rows, or raise BufferFullError if they do not fit"""
+        if self._stopping or self.pending + len(rows) > self.max_rows:
+            self.rejected += len(rows)
+            raise BufferFullError()
+        if not self._rows:
+            self._oldest_at = time.monotonic()
+        self._rows.extend(rows)
+        self.accepted += len(rows)
+        if len(self._rows) >= self.flush_rows and self._wake is not None:
+            self._wake.set()
+
+    async def flush(self) -> None:
+        """Write every queued row now, one batch of flush_rows at a time"""
+        while self._rows:
+            batch = self._rows[: self.flush_rows]
+            del self._rows[: self.flush_rows]
+            if self._rows:
+                self._oldest_at = time.monotonic()
+            self._inflight += len(batch)
+            start = time.perf_counter()
+            try:
+                await self._flush(batch)
+            except Exception:
+                self.flush_failures += 1
+                self._attempts += 1
+                logger.exception("write buffer flush of %d rows failed", len(batch))
+                if self._stopping or len(self._rows) + len(batch) > self.max_rows:
+                    self.dropped += len(batch)
+                elif self._attempts < self.max_attempts:
+                    # Retried one interval later, ahead of newer rows
+                    self._rows[:0] = batch
+                    self._oldest_at = time.monotonic()
+                    return
+                else:
+                    await self._split(batch)
+                self._attempts = 0
+                return
+            finally:
+                self._inflight -= len(batch)
+            self._attempts = 0
+            self.flushed += len(batch)
+            self.flushes += 1
+            self.last_flush_seconds = time.perf_counter() - start
+
+    async def _split(self, rows: list[dict]) -> None:
+        """Write a failing batch in halves, dropping single rows that still fail"""
+        if len(rows) == 1:
+            self.dropped += 1
+            logger.error("write buffer dropped a row that cannot be written")
+            return
+        middle = len(rows) // 2
+        for half in (rows[:middle], rows[middle:]):
+            try:
+                await self._flush(half)
+            except Exception:
+                self.flush_failures += 1
+                await self._split(half)
+            else:
+                self.flushed += len(half)
+                self.flushes += 1
+
+    async def _run(self, wake: asyncio.Event) -> None:
+        """Flush on size or age, until stopped"""
+        while not self._stopping:
+            timeout = self.flush_seconds
+            if self._rows:
+                timeout = max(
+                    0.0, self._oldest_at + self.flush_seconds - time.monotonic()
+                )
+            try:
+                await asyncio.wait_for(wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            if self._rows:
+                await self.flush()
+
+    def start(self) -> None:
+        """Start the background flusher on the running loop"""
+        if self._task is None:
+            self._stopping = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run(self._wake))
+
+    async def stop(self) -> None:
+        """Stop taking rows, write what is queued and stop the flusher"""
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        """Queue depth and throughput counters"""
+        return {
+            "pending": self.pending,
+            "max_rows": self.max_rows,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+            "flush_failures": self.flush_failures,
+            "dropped": self.dropped,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
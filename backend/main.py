@@ -1,10 +1,36 @@
 """Main FastAPI Entry point"""
 
-from app.api import router as api_router
+from contextlib import asynccontextmanager
+
+from app.api.router import router as api_router
+from app.api.core.responses import ModelResponse
+from app.api.db.pool import pool_stats
+from app.api.db.session import async_engine, engine
+from app.api.v1.dashboards.services.derived_fields_job import derived_fields_job
+from app.api.v1.dashboards.services.user_dashboard_service import reading_buffer
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from lib.utils.alert_state import alert_state
+from lib.utils.password_hasher import password_hasher
+from lib.utils.redis_client import redis_client
+from lib.utils.revocation import revocation_filter
+from lib.utils.token_cache import token_cache
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Start up and shut down shared resources"""
+    reading_buffer.start()
+    derived_fields_job.start(redis_client)
+    yield
+    await derived_fields_job.stop()
+    await reading_buffer.stop()
+    password_hasher.shutdown()
+    await redis_client.aclose()
+    await async_engine.dispose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ModelResponse)
 # CORS configuration
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +57,24 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics"""
+    return {
+        "db_pool": {
+            "async": pool_stats(async_engine.sync_engine),
+            "sync": pool_stats(engine),
+        },
+        "alert_state": alert_state.stats(),
+        "derived_fields_job": derived_fields_job.stats(),
+        "password_hasher": password_hasher.stats(),
+        "reading_buffer": reading_buffer.stats(),
+        "redis": redis_client.stats(),
+        "token_cache": token_cache.stats(),
+        "revocation_filter": revocation_filter.stats(),
+    }
+
+
 @app.get("/version")
 async def version():
     """Version Check"""
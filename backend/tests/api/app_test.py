@@ -5,6 +5,14 @@ from main import app
 _base_client = TestClient(app)
 
 
+def run_async(func, *args):
+    """Run a coroutine function on the app's event loop.
+
+    The loop belongs to the session-wide client entered in conftest.py.
+    """
+    return _base_client.portal.call(func, *args)
+
+
 class APIV1Client:
     @property
     def cookies(self):
@@ -19,6 +27,9 @@ class APIV1Client:
     def put(self, url, **kwargs):
         return _base_client.put(f"/api/v1{url}", **kwargs)
 
+    def patch(self, url, **kwargs):
+        return _base_client.patch(f"/api/v1{url}", **kwargs)
+
     def delete(self, url, **kwargs):
         return _base_client.delete(f"/api/v1{url}", **kwargs)
 
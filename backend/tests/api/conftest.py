@@ -0,0 +1,14 @@
+import pytest
+
+from tests.api.app_test import _base_client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def app_client():
+    """Serve every request of the session from one event loop.
+
+    Pooled async DB connections are bound to the loop that opened them, and
+    TestClient outside a context manager starts a new loop per request.
+    """
+    with _base_client:
+        yield _base_client
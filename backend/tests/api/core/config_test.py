@@ -2,7 +2,8 @@
 
 import pytest
 
-from app.api.core.config import settings
+from app.api.core.config import Settings, settings
+from lib.utils.redis_client import redis_client
 
 
 @pytest.fixture(scope="module")
@@ -15,3 +16,25 @@ def test_settings_loaded():
     """Test settings"""
     assert settings.DATABASE_URL != "", "DATABASE_URL should not be empty"
     assert settings.SECRET_KEY != "", "SECRET_KEY should not be empty"
+
+
+def test_redis_settings_from_environment(monkeypatch):
+    """Redis pool and breaker settings are read from the environment"""
+    monkeypatch.setenv("REDIS_URL", "redis://cache:6380/2")
+    monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("REDIS_BREAKER_RESET_SECONDS", "2.5")
+
+    configured = Settings()
+
+    assert configured.REDIS_URL == "redis://cache:6380/2"
+    assert configured.REDIS_MAX_CONNECTIONS == 7
+    assert configured.REDIS_BREAKER_RESET_SECONDS == 2.5
+    assert configured.REDIS_SOCKET_TIMEOUT == 0.5
+
+
+def test_redis_client_follows_settings():
+    """The shared Redis client is built from Settings"""
+    assert redis_client.backend == settings.REDIS_BACKEND
+    breaker = redis_client.breaker
+    assert breaker.failure_threshold == settings.REDIS_BREAKER_FAILURES
+    assert breaker.reset_seconds == settings.REDIS_BREAKER_RESET_SECONDS
@@ -0,0 +1,52 @@
+"""Connection Pool Tests"""
+
+from app.api.core.config import settings
+from app.api.db.pool import InstrumentedQueuePool, engine_options
+from tests.api.app_test import client
+
+POOL_FIELDS = {
+    "size",
+    "checked_out",
+    "checked_in",
+    "overflow",
+    "checkouts",
+    "checkout_timeouts",
+    "connections_opened",
+    "wait_ms_avg",
+    "wait_ms_max",
+}
+
+
+def test_engine_options_follow_settings():
+    """Pool sizing and health checks come from Settings"""
+    options = engine_options(InstrumentedQueuePool)
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert options["pool_timeout"] == settings.DB_POOL_TIMEOUT
+    assert options["pool_recycle"] == settings.DB_POOL_RECYCLE
+    assert options["pool_pre_ping"] == settings.DB_POOL_PRE_PING
+
+
+def test_metrics_reports_pool_checkouts(app_client):
+    """/metrics exposes both pools, and a DB-backed request checks out"""
+    before = app_client.get("/metrics").json()["db_pool"]
+    assert set(before) == {"async", "sync"}
+    assert set(before["async"]) == POOL_FIELDS
+    assert set(before["sync"]) == POOL_FIELDS
+
+    response = client.post(
+        "/auth/login",
+        json={
+            "email": "no_such_account@example.com",
+            "password": "TestPassword1$",
+            "login_context": "user",
+        },
+    )
+    assert response.status_code == 401
+
+    after = app_client.get("/metrics").json()["db_pool"]["async"]
+    assert after["checkouts"] > before["async"]["checkouts"]
+    assert after["checked_out"] == 0
+    assert after["connections_opened"] >= 1
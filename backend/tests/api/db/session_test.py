@@ -0,0 +1,66 @@
+"""Async DB Session Tests"""
+
+import asyncio
+import uuid
+
+import pytest
+from app.api.db.session import AsyncSessionLocal, to_async_url
+from app.api.v1.auth.crud import (
+    create_user,
+    delete_user,
+    get_user_by_email,
+    update_user,
+)
+from lib.errorlib.auth import UserNotFoundException
+from tests.api.app_test import run_async
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("postgresql://u:p@db/healthaid", "postgresql+asyncpg://u:p@db/healthaid"),
+        ("mysql+pymysql://u:p@db/healthaid", "mysql+aiomysql://u:p@db/healthaid"),
+        ("sqlite:///./healthaid.db", "sqlite+aiosqlite:///./healthaid.db"),
+    ],
+)
+def test_to_async_url_swaps_driver(url, expected):
+    """Each backend gets its asyncio driver and keeps its credentials"""
+    assert to_async_url(url) == expected
+
+
+def test_to_async_url_rejects_unknown_backend():
+    """A backend without an async driver fails loudly"""
+    with pytest.raises(ValueError):
+        to_async_url("oracle://u:p@db/healthaid")
+
+
+def test_async_user_crud_round_trip():
+    """Users round-trip through the async CRUD, created concurrently"""
+    unique = uuid.uuid4().hex
+    emails = [f"async_{i}_{unique}@example.com" for i in range(3)]
+
+    async def create(email):
+        async with AsyncSessionLocal() as db:
+            user = await create_user(
+                db,
+                username=email.split("@")[0],
+                email=email,
+                password="TestPassword1$",
+                full_name="Async User",
+            )
+            return user.id
+
+    async def round_trip():
+        user_ids = await asyncio.gather(*(create(email) for email in emails))
+        async with AsyncSessionLocal() as db:
+            found = [await get_user_by_email(db, email) for email in emails]
+            assert [user.id for user in found] == user_ids
+            updated = await update_user(db, user_ids[0], full_name="Renamed")
+            assert updated.full_name == "Renamed"
+            for user_id in user_ids:
+                await delete_user(db, user_id)
+            assert await get_user_by_email(db, emails[0]) is None
+            with pytest.raises(UserNotFoundException):
+                await delete_user(db, user_ids[0])
+
+    run_async(round_trip)
@@ -0,0 +1,284 @@
+"""Accounts Registry Tests"""
+
+import importlib.util
+import pathlib
+import uuid
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from app.api.core.base import Base
+from app.api.db.session import AsyncSessionLocal
+from app.api.v1.auth.crud import (
+    delete_user,
+    get_user_by_id,
+    register_identity,
+    remove_identity,
+    update_user,
+)
+from app.api.v1.auth.models.user import (
+    Account,
+    AccountEmail,
+    Admin,
+    Organization,
+    OrgMember,
+    User,
+)
+from lib.errorlib.auth import UserAlreadyExistsException
+from lib.utils.enums import UserType
+from sqlalchemy import create_engine, insert, select
+from tests.api.app_test import client, run_async
+
+PASSWORD = "TestPassword1$"
+MIGRATION = (
+    pathlib.Path(__file__).parents[4]
+    / "alembic"
+    / "versions"
+    / "cc8634d74c04_accounts_registry.py"
+)
+
+
+def _register(payload: dict) -> dict:
+    """Register an account and return it"""
+    response = client.post("/auth/register", json={"password": PASSWORD, **payload})
+    assert response.status_code == 201, response.text
+    return response.json()["user"]
+
+
+def _register_org(unique: str) -> str:
+    """Register an organization and return its id"""
+    return _register(
+        {
+            "account_type": "organization",
+            "name": f"AccountsOrg_{unique}",
+            "email": f"accounts_org_{unique}@example.com",
+        }
+    )["id"]
+
+
+def _register_member(org_id: str, email: str) -> str:
+    """Register an independent org member and return its id"""
+    return _register(
+        {
+            "account_type": "org_member",
+            "username": f"m_{uuid.uuid4().hex}",
+            "email": email,
+            "full_name": "Accounts Member",
+            "organization_id": org_id,
+        }
+    )["id"]
+
+
+def _register_user(email: str) -> dict:
+    """POST a user registration and return the response"""
+    return client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": email.split("@")[0],
+            "email": email,
+            "password": PASSWORD,
+            "full_name": "Accounts User",
+        },
+    )
+
+
+async def _identity(email: str, account_id: str):
+    """The email's claim and whether the account is registered"""
+    async with AsyncSessionLocal() as db:
+        claim = await db.get(AccountEmail, email)
+        return claim, await db.get(Account, account_id) is not None
+
+
+def test_get_user_by_id_resolves_every_account_type():
+    """The registry resolves an ID to the table of its account type"""
+    unique = uuid.uuid4().hex
+    org_id = _register_org(unique)
+    ids = {
+        User: _register(
+            {
+                "account_type": "user",
+                "username": f"accounts_user_{unique}",
+                "email": f"accounts_user_{unique}@example.com",
+                "full_name": "Accounts User",
+            }
+        )["id"],
+        OrgMember: _register_member(org_id, f"accounts_member_{unique}@example.com"),
+        Organization: org_id,
+    }
+
+    async def resolve():
+        async with AsyncSessionLocal() as db:
+            # The admin is a singleton: add one only for the lookup
+            admin = Admin(
+                name="Accounts Admin",
+                email=f"accounts_admin_{unique}@example.com",
+                hashed_password="x",
+            )
+            db.add(admin)
+            await db.flush()
+            register_identity(db, UserType.ADMIN, admin.id, admin.email)
+            await db.commit()
+            ids[Admin] = admin.id
+            try:
+                return {
+                    model: await get_user_by_id(db, account_id)
+                    for model, account_id in ids.items()
+                }
+            finally:
+                await remove_identity(db, admin.id)
+                await db.delete(admin)
+                await db.commit()
+
+    for model, account in run_async(resolve).items():
+        assert type(account) is model
+        assert str(account.id) == ids[model]
+
+
+def test_delete_user_releases_identity():
+    """A deleted user's ID and email leave the registry"""
+    email = f"accounts_deleted_{uuid.uuid4().hex}@example.com"
+    response = _register_user(email)
+    assert response.status_code == 201, response.text
+    user_id = response.json()["user"]["id"]
+
+    async def delete():
+        async with AsyncSessionLocal() as db:
+            await delete_user(db, user_id)
+
+    run_async(delete)
+    assert run_async(_identity, email, user_id) == (None, False)
+    assert _register_user(email).status_code == 201
+
+
+def test_email_change_moves_the_claim():
+    """A user's new email is claimed and the old one released"""
+    unique = uuid.uuid4().hex
+    old_email = f"accounts_old_{unique}@example.com"
+    new_email = f"accounts_new_{unique}@example.com"
+    response = _register_user(old_email)
+    assert response.status_code == 201, response.text
+    user_id = response.json()["user"]["id"]
+    taken_email = f"accounts_taken_{unique}@example.com"
+    _register(
+        {
+            "account_type": "organization",
+            "name": f"AccountsTaken_{unique}",
+            "email": taken_email,
+        }
+    )
+
+    async def change(email):
+        async with AsyncSessionLocal() as db:
+            try:
+                await update_user(db, user_id, email=email)
+            except UserAlreadyExistsException:
+                return False
+            return True
+
+    assert run_async(change, taken_email) is False
+    assert run_async(change, new_email) is True
+    claim, _ = run_async(_identity, new_email, user_id)
+    assert (claim.account_type, claim.account_id) == (UserType.USER, user_id)
+    assert run_async(_identity, old_email, user_id)[0] is None
+
+    # The new address is taken for every account type, the old one is free
+    organization = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"AccountsNew_{unique}",
+            "email": new_email,
+            "password": PASSWORD,
+        },
+    )
+    assert organization.status_code == 400
+    _register(
+        {
+            "account_type": "organization",
+            "name": f"AccountsOld_{unique}",
+            "email": old_email,
+        }
+    )
+
+
+def test_shared_member_claim_outlives_first_membership():
+    """The email stays claimed while another independent membership uses it"""
+    unique = uuid.uuid4().hex
+    email = f"accounts_shared_{unique}@example.com"
+    first = _register_member(_register_org(f"a_{unique}"), email)
+    second = _register_member(_register_org(f"b_{unique}"), email)
+
+    async def remove(member_id):
+        async with AsyncSessionLocal() as db:
+            await remove_identity(db, member_id)
+            await db.delete(await db.get(OrgMember, member_id))
+            await db.commit()
+
+    run_async(remove, first)
+    claim, _ = run_async(_identity, email, second)
+    assert claim.account_id == second
+    assert _register_user(email).status_code == 400
+
+    run_async(remove, second)
+    assert run_async(_identity, email, second) == (None, False)
+
+
+def test_accounts_migration_backfills_existing_accounts(tmp_path):
+    """Upgrading registers every account that predates the registry"""
+    spec = importlib.util.spec_from_file_location("accounts_registry", MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'accounts.db'}")
+    tables = [Base.metadata.tables[name] for name in ("organizations", "admin")]
+    tables += [User.__table__, OrgMember.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    org_id, user_id, member_id, admin_id = (str(uuid.uuid4()) for _ in range(4))
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Organization).values(
+                id=org_id,
+                name="Backfill Org",
+                email="backfill_org@example.com",
+                hashed_password="x",
+            )
+        )
+        connection.execute(
+            insert(User).values(
+                id=user_id,
+                username="backfill_user",
+                email="backfill_user@example.com",
+                full_name="Backfill User",
+                hashed_password="x",
+            )
+        )
+        connection.execute(
+            insert(OrgMember).values(
+                id=member_id,
+                username="backfill_member",
+                email="backfill_member@example.com",
+                full_name="Backfill Member",
+                hashed_password="x",
+                organization_id=org_id,
+            )
+        )
+        connection.execute(
+            insert(Admin).values(
+                id=admin_id,
+                name="Backfill Admin",
+                email="backfill_admin@example.com",
+                hashed_password="x",
+            )
+        )
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+        accounts = dict(
+            connection.execute(select(Account.id, Account.account_type)).all()
+        )
+
+    assert {account_id: kind.value for account_id, kind in accounts.items()} == {
+        user_id: "user",
+        member_id: "org_member",
+        org_id: "organization",
+        admin_id: "admin",
+    }
@@ -0,0 +1,94 @@
+"""Auth Service Tests"""
+
+import uuid
+
+import pytest
+from app.api.db.session import AsyncSessionLocal
+from app.api.v1.auth.models.user import OrgMember, User
+from app.api.v1.auth.services.auth_service import load_account_schemas, to_schema
+from lib.utils.enums import UserType
+from tests.api.app_test import client, run_async
+
+
+def test_to_schema_rejects_unloaded_linked_user():
+    """Converting an org member never lazy loads its linked user, nor
+    reports an unloaded one as missing"""
+    member = OrgMember(
+        id=str(uuid.uuid4()),
+        user_id=str(uuid.uuid4()),
+        username="member",
+        email="member@example.com",
+        full_name="Member",
+        organization_id=str(uuid.uuid4()),
+        role="nurse",
+        is_active=True,
+        joined_at="2025-01-01T00:00:00",
+    )
+
+    with pytest.raises(ValueError):
+        to_schema(member)
+
+    member.user_id = None
+    schema = to_schema(member)
+    assert schema.user is None
+    assert schema.role.value == "nurse"
+
+
+def test_to_schema_projects_loaded_user():
+    """An eagerly loaded linked user is converted with the member"""
+    user = User(
+        id=str(uuid.uuid4()),
+        username="patient",
+        email="patient@example.com",
+        full_name="Patient",
+        user_type=UserType.USER,
+    )
+    member = OrgMember(
+        id=str(uuid.uuid4()),
+        user_id=user.id,
+        user=user,
+        username="patient",
+        email="patient@example.com",
+        full_name="Patient",
+        organization_id=str(uuid.uuid4()),
+        role="staff",
+        is_active=True,
+        joined_at="2025-01-01T00:00:00",
+    )
+
+    assert to_schema(member).user.email == "patient@example.com"
+
+
+def test_load_account_schemas_matches_to_schema():
+    """Column projections load the same schemas as full ORM rows"""
+    unique = uuid.uuid4().hex
+    org_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"ProjectionOrg_{unique}",
+            "email": f"projection_org_{unique}@example.com",
+            "password": "TestPassword1$",
+        },
+    )
+    assert org_response.status_code == 201
+    member_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "org_member",
+            "username": f"projection_member_{unique}",
+            "email": f"projection_member_{unique}@example.com",
+            "password": "TestPassword1$",
+            "full_name": "Projection Member",
+            "organization_id": org_response.json()["user"]["id"],
+        },
+    )
+    assert member_response.status_code == 201
+    member_id = member_response.json()["user"]["id"]
+
+    async def load():
+        async with AsyncSessionLocal() as db:
+            return await load_account_schemas(db, OrgMember, [member_id])
+
+    (projected,) = run_async(load)
+    assert projected.model_dump(mode="json") == member_response.json()["user"]
@@ -1,9 +1,19 @@
 """Auth Tests"""
 
+import time
 import uuid
 
 import pytest
-from tests.api.app_test import client
+import redis
+from app.api.db.session import AsyncSessionLocal
+from app.api.v1.auth.models.user import OrgMember
+from jose import jwt
+from lib.utils import user as user_utils
+from lib.utils.enums import OrgRole
+from lib.utils.redis_client import CircuitBreaker, GuardedRedis, redis_client
+from lib.utils.revocation import REVOKED_JTIS_KEY, revocation_filter
+from lib.utils.user import ALGORITHM, SECRET_KEY
+from tests.api.app_test import client, run_async
 
 
 @pytest.mark.parametrize(
@@ -231,7 +241,9 @@ def test_register_org_member_existing_user():
         "full_name": "Member Role",
         "organization_id": org_id,
     }
-    member_response = client.post("/auth/register", json=member_payload)
+    member_response = client.post(
+        "/auth/register", json=member_payload, headers={"X-Client-Type": "mobile"}
+    )
     assert (
         member_response.status_code == 201
     ), f"Registration failed: {member_response.text}"
@@ -240,6 +252,14 @@ def test_register_org_member_existing_user():
     assert "user" in member_data
     assert member_data["user"]["organization_id"] == org_id
 
+    # The membership's profile carries the linked user account
+    profile_response = client.get(
+        "/user/profile",
+        headers={"Authorization": f"Bearer {member_data['access_token']}"},
+    )
+    assert profile_response.status_code == 200, profile_response.text
+    assert profile_response.json()["user"]["email"] == user_payload["email"]
+
 
 def test_org_member_login():
     """Test org_member login"""
@@ -721,3 +741,460 @@ def test_org_member_missing_organization_id():
     }
     response = client.post("/auth/register", json=member_payload)
     assert response.status_code == 422  # Validation error
+
+
+def test_org_member_email_blocks_other_account_types():
+    """Email of an independent org member cannot be reused by another account type"""
+    unique = uuid.uuid4().hex
+    org_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"ClaimOrg_{unique}",
+            "email": f"claimorg_{unique}@example.com",
+            "password": "TestPassword1$",
+        },
+    )
+    assert org_response.status_code == 201
+    org_id = org_response.json()["user"]["id"]
+
+    email = f"claimed_member_{unique}@example.com"
+    member_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "org_member",
+            "username": f"claimed_member_{unique}",
+            "email": email,
+            "password": "TestPassword1$",
+            "full_name": "Claimed Member",
+            "organization_id": org_id,
+        },
+    )
+    assert member_response.status_code == 201
+
+    user_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"claimed_user_{unique}",
+            "email": email,
+            "password": "TestPassword1$",
+            "full_name": "Claimed User",
+        },
+    )
+    assert user_response.status_code == 400
+    assert user_response.json()["detail"] == "An account with this email already exists"
+
+
+def test_login_tokens_carry_identity_claims():
+    """Access tokens embed account type, role and organization"""
+    unique = uuid.uuid4().hex
+    org_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"ClaimsOrg_{unique}",
+            "email": f"claimsorg_{unique}@example.com",
+            "password": "TestPassword1$",
+        },
+    )
+    assert org_response.status_code == 201
+    org_id = org_response.json()["user"]["id"]
+
+    member_payload = {
+        "account_type": "org_member",
+        "username": f"claims_member_{unique}",
+        "email": f"claims_member_{unique}@example.com",
+        "password": "TestPassword1$",
+        "full_name": "Claims Member",
+        "organization_id": org_id,
+        "role": "nurse",
+    }
+    assert client.post("/auth/register", json=member_payload).status_code == 201
+
+    login_response = client.post(
+        "/auth/login",
+        json={
+            "email": member_payload["email"],
+            "password": member_payload["password"],
+            "login_context": "org_member",
+        },
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert login_response.status_code == 200, login_response.text
+
+    claims = jwt.decode(
+        login_response.json()["access_token"], SECRET_KEY, algorithms=[ALGORITHM]
+    )
+    assert claims["user_type"] == "org_member"
+    assert claims["role"] == "nurse"
+    assert claims["org_id"] == org_id
+    assert claims["ver"] == 1
+
+
+def test_logout_all_revokes_every_session():
+    """Logging out everywhere invalidates tokens from every login"""
+    unique = uuid.uuid4().hex
+    email = f"logout_all_{unique}@example.com"
+    password = "TestPassword1$"
+    register_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"logout_all_{unique}",
+            "email": email,
+            "password": password,
+            "full_name": "Logout All",
+        },
+    )
+    assert register_response.status_code == 201
+
+    sessions = []
+    for _ in range(2):
+        login_response = client.post(
+            "/auth/login",
+            json={"email": email, "password": password, "login_context": "user"},
+            headers={"X-Client-Type": "mobile"},
+        )
+        assert login_response.status_code == 200, login_response.text
+        sessions.append(login_response.json())
+
+    first, second = sessions
+    logout_response = client.post(
+        "/auth/logout-all",
+        headers={"Authorization": f"Bearer {first['access_token']}"},
+    )
+    assert logout_response.status_code == 200, logout_response.text
+    assert logout_response.json()["sessions_revoked"] >= 4
+
+    # Tokens from the other login are revoked too
+    refresh_response = client.post(
+        "/auth/refresh", json={"refresh_token": second["refresh_token"]}
+    )
+    assert refresh_response.status_code == 401
+    repeat_response = client.post(
+        "/auth/logout-all",
+        headers={"Authorization": f"Bearer {second['access_token']}"},
+    )
+    assert repeat_response.status_code == 401
+
+
+def test_org_admin_revokes_member_sessions():
+    """An organization can revoke every session of its members at once"""
+    unique = uuid.uuid4().hex
+    password = "TestPassword1$"
+    org_email = f"revoke_org_{unique}@example.com"
+    org_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"RevokeOrg_{unique}",
+            "email": org_email,
+            "password": password,
+        },
+    )
+    assert org_response.status_code == 201
+    org_id = org_response.json()["user"]["id"]
+
+    member_email = f"revoke_member_{unique}@example.com"
+    member_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "org_member",
+            "username": f"revoke_member_{unique}",
+            "email": member_email,
+            "password": password,
+            "full_name": "Revoke Member",
+            "organization_id": org_id,
+        },
+    )
+    assert member_response.status_code == 201
+
+    def mobile_login(email, context):
+        response = client.post(
+            "/auth/login",
+            json={"email": email, "password": password, "login_context": context},
+            headers={"X-Client-Type": "mobile"},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    member = mobile_login(member_email, "org_member")
+    org = mobile_login(org_email, "organization")
+
+    # Members cannot revoke their colleagues' sessions
+    forbidden = client.post(
+        "/auth/organization/sessions/revoke",
+        headers={"Authorization": f"Bearer {member['access_token']}"},
+    )
+    assert forbidden.status_code == 403
+
+    revoke_response = client.post(
+        "/auth/organization/sessions/revoke",
+        headers={"Authorization": f"Bearer {org['access_token']}"},
+    )
+    assert revoke_response.status_code == 200, revoke_response.text
+    assert revoke_response.json()["sessions_revoked"] >= 2
+
+    refresh_response = client.post(
+        "/auth/refresh", json={"refresh_token": member["refresh_token"]}
+    )
+    assert refresh_response.status_code == 401
+
+
+def test_refresh_rotation_detects_reuse():
+    """Each refresh spends the token; replaying one revokes the family"""
+    unique = uuid.uuid4().hex
+    email = f"rotate_{unique}@example.com"
+    password = "TestPassword1$"
+    register_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"rotate_{unique}",
+            "email": email,
+            "password": password,
+            "full_name": "Rotate User",
+        },
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert register_response.status_code == 201
+    original = register_response.json()["refresh_token"]
+
+    first = client.post("/auth/refresh", json={"refresh_token": original})
+    assert first.status_code == 200, first.text
+    rotated = first.json()["refresh_token"]
+    assert rotated and rotated != original
+
+    # Replaying the spent token is reuse: the whole family is revoked
+    replay = client.post("/auth/refresh", json={"refresh_token": original})
+    assert replay.status_code == 401
+    after_reuse = client.post("/auth/refresh", json={"refresh_token": rotated})
+    assert after_reuse.status_code == 401
+
+
+def test_profile_returns_account():
+    """The profile route serializes the token's account"""
+    unique = uuid.uuid4().hex
+    email = f"profile_{unique}@example.com"
+    register_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"profile_{unique}",
+            "email": email,
+            "password": "TestPassword1$",
+            "full_name": "Profile User",
+        },
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert register_response.status_code == 201
+    access_token = register_response.json()["access_token"]
+
+    profile_response = client.get(
+        "/user/profile", headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert profile_response.status_code == 200, profile_response.text
+    assert profile_response.json()["email"] == email
+
+
+def test_web_login_sets_token_cookies():
+    """Web clients get tokens as cookies, not in the body"""
+    unique = uuid.uuid4().hex
+    email = f"web_{unique}@example.com"
+    password = "TestPassword1$"
+    register_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"web_{unique}",
+            "email": email,
+            "password": password,
+            "full_name": "Web User",
+        },
+    )
+    assert register_response.status_code == 201
+    assert register_response.json()["refresh_token"] is None
+    assert "refresh_token=ey" in register_response.headers["set-cookie"]
+
+    login_response = client.post(
+        "/auth/login",
+        json={"email": email, "password": password, "login_context": "user"},
+    )
+    assert login_response.status_code == 200
+    assert login_response.json()["access_token"] is None
+    cookie = login_response.headers["set-cookie"]
+    assert "access_token=ey" in cookie
+    assert "refresh_token=ey" in cookie
+
+
+def test_refresh_reloads_role_and_organization():
+    """Refresh tokens carry identity only; rotation reads the current role"""
+    unique = uuid.uuid4().hex
+    password = "TestPassword1$"
+    org_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"DemoteOrg_{unique}",
+            "email": f"demote_org_{unique}@example.com",
+            "password": password,
+        },
+    )
+    assert org_response.status_code == 201
+    member_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "org_member",
+            "username": f"demote_member_{unique}",
+            "email": f"demote_member_{unique}@example.com",
+            "password": password,
+            "full_name": "Demoted Admin",
+            "organization_id": org_response.json()["user"]["id"],
+            "role": "org_admin",
+        },
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert member_response.status_code == 201, member_response.text
+    member_id = member_response.json()["user"]["id"]
+    refresh_token = member_response.json()["refresh_token"]
+
+    refresh_claims = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+    assert "role" not in refresh_claims and "org_id" not in refresh_claims
+
+    async def set_role(role):
+        async with AsyncSessionLocal() as db:
+            member = await db.get(OrgMember, member_id)
+            member.role = role
+            await db.commit()
+
+    run_async(set_role, OrgRole.NURSE)
+    rotated = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert rotated.status_code == 200, rotated.text
+    access_claims = jwt.decode(
+        rotated.json()["access_token"], SECRET_KEY, algorithms=[ALGORITHM]
+    )
+    assert access_claims["role"] == "nurse"
+
+    async def remove():
+        async with AsyncSessionLocal() as db:
+            await db.delete(await db.get(OrgMember, member_id))
+            await db.commit()
+
+    run_async(remove)
+    removed = client.post(
+        "/auth/refresh", json={"refresh_token": rotated.json()["refresh_token"]}
+    )
+    assert removed.status_code == 401
+
+
+def test_cached_token_honours_revocation_from_another_worker():
+    """A cached access token stops working once another worker revokes it"""
+    unique = uuid.uuid4().hex
+    register_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"cached_{unique}",
+            "email": f"cached_{unique}@example.com",
+            "password": "TestPassword1$",
+            "full_name": "Cached User",
+        },
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert register_response.status_code == 201
+    access_token = register_response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert client.get("/user/profile", headers=headers).status_code == 200
+
+    # Another worker revokes the token: Redis learns of it, this worker's
+    # token cache does not
+    jti = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])["jti"]
+
+    async def revoke_elsewhere():
+        pipe = redis_client.pipeline()
+        pipe.setex(jti, 60, "true")
+        pipe.zadd(REVOKED_JTIS_KEY, {jti: time.time()})
+        await pipe.execute()
+        await revocation_filter.sync(redis_client)
+
+    run_async(revoke_elsewhere)
+    assert client.get("/user/profile", headers=headers).status_code == 401
+
+
+def test_refresh_token_is_not_a_bearer_credential():
+    """Refresh tokens cannot call protected routes, nor access tokens refresh"""
+    unique = uuid.uuid4().hex
+    register_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"TypOrg_{unique}",
+            "email": f"typ_org_{unique}@example.com",
+            "password": "TestPassword1$",
+        },
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert register_response.status_code == 201
+    tokens = register_response.json()
+    assert jwt.get_unverified_claims(tokens["access_token"])["typ"] == "access"
+    assert jwt.get_unverified_claims(tokens["refresh_token"])["typ"] == "refresh"
+
+    as_bearer = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    assert client.get("/user/profile", headers=as_bearer).status_code == 401
+    revoke_response = client.post(
+        "/auth/organization/sessions/revoke", headers=as_bearer
+    )
+    assert revoke_response.status_code == 401
+
+    refresh_response = client.post(
+        "/auth/refresh", json={"refresh_token": tokens["access_token"]}
+    )
+    assert refresh_response.status_code == 401
+
+
+class _DownPipeline:
+    """Pipeline that stages anything and fails like a dead server"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    async def execute(self):
+        raise redis.ConnectionError("connection refused")
+
+
+class _DownRedis:
+    """Client whose pipelines never reach Redis"""
+
+    def pipeline(self, transaction: bool = True):
+        return _DownPipeline()
+
+
+def test_login_fails_when_the_session_cannot_be_opened(monkeypatch):
+    """No refresh token is issued whose family Redis never recorded"""
+    unique = uuid.uuid4().hex
+    email = f"down_{unique}@example.com"
+    register_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"down_{unique}",
+            "email": email,
+            "password": "TestPassword1$",
+            "full_name": "Down User",
+        },
+    )
+    assert register_response.status_code == 201
+
+    monkeypatch.setattr(
+        user_utils,
+        "redis_client",
+        GuardedRedis(_DownRedis(), CircuitBreaker(), "redis"),
+    )
+    login = client.post(
+        "/auth/login",
+        json={"email": email, "password": "TestPassword1$", "login_context": "user"},
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert login.status_code == 503
+    assert login.headers["Retry-After"] == "5"
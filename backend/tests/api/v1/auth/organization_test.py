@@ -0,0 +1,362 @@
+"""Organization Member Import and Export Tests"""
+
+import csv
+import io
+import uuid
+from datetime import datetime
+
+import orjson
+from app.api.db.session import AsyncSessionLocal
+from app.api.v1.auth.models.user import OrgMember, User
+from app.api.v1.auth.services.org_service import _insert_chunk
+from lib.utils.user import hash_password
+from sqlalchemy import select, update
+from tests.api.app_test import client, run_async
+
+PASSWORD = "TestPassword1$"
+
+
+def _register_org(unique: str) -> tuple[str, str]:
+    """Register an organization and return (org_id, access_token)"""
+    email = f"import_org_{unique}@example.com"
+    response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"ImportOrg_{unique}",
+            "email": email,
+            "password": PASSWORD,
+        },
+    )
+    assert response.status_code == 201, response.text
+    login = client.post(
+        "/auth/login",
+        json={"email": email, "password": PASSWORD, "login_context": "organization"},
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert login.status_code == 200, login.text
+    return response.json()["user"]["id"], login.json()["access_token"]
+
+
+def test_import_members_reports_each_row():
+    """Valid rows are created; invalid and colliding rows are reported"""
+    unique = uuid.uuid4().hex
+    _, token = _register_org(unique)
+
+    taken_email = f"import_taken_{unique}@example.com"
+    taken = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"import_taken_{unique}",
+            "email": taken_email,
+            "password": PASSWORD,
+            "full_name": "Taken User",
+        },
+    )
+    assert taken.status_code == 201
+
+    new_email = f"import_new_{unique}@example.com"
+    body = "\n".join(
+        [
+            "username,email,password,full_name,role",
+            f"new_{unique},{new_email},{PASSWORD},New Member,doctor",
+            f"dup_{unique},{new_email},{PASSWORD},Duplicate,staff",
+            f"weak_{unique},import_weak_{unique}@example.com,password,Weak,staff",
+            f"taken_{unique},{taken_email},{PASSWORD},Taken,staff",
+            f"bad_{unique},not-an-email,{PASSWORD},Bad Email,staff",
+            f"org_{unique},import_org_{unique}@example.com,{PASSWORD},Org,staff",
+        ]
+    )
+    response = client.post(
+        "/organization/members/import",
+        content=body,
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"},
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["total"], report["created"], report["failed"]) == (6, 2, 4)
+    statuses = [(result["row"], result["status"]) for result in report["results"]]
+    assert statuses == [
+        (1, "created"),
+        (2, "error"),
+        (3, "error"),
+        (4, "created"),
+        (5, "error"),
+        (6, "error"),
+    ]
+    assert "already exists" in report["results"][5]["error"]
+
+    # A user's email links that user, as registration does
+    async def linked_user(member_id):
+        async with AsyncSessionLocal() as db:
+            member = await db.get(OrgMember, member_id)
+            return member.user_id, member.username
+
+    assert run_async(linked_user, report["results"][3]["id"]) == (
+        taken.json()["user"]["id"],
+        f"import_taken_{unique}",
+    )
+
+    login = client.post(
+        "/auth/login",
+        json={"email": new_email, "password": PASSWORD, "login_context": "org_member"},
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert login.status_code == 200, login.text
+
+    # Importing the same file again finds the member already in the org
+    repeat = client.post(
+        "/organization/members/import",
+        content=body,
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"},
+    )
+    assert repeat.json()["created"] == 0
+    assert "Already a member" in repeat.json()["results"][0]["error"]
+    assert "Already a member" in repeat.json()["results"][3]["error"]
+
+
+def test_import_chunk_isolates_a_row_claimed_since_the_check():
+    """A chunk that collides falls back per row and keeps the good rows"""
+    unique = uuid.uuid4().hex
+    org_id, _ = _register_org(unique)
+    taken_email = f"chunk_taken_{unique}@example.com"
+    taken = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"chunk_taken_{unique}",
+            "email": taken_email,
+            "password": PASSWORD,
+            "full_name": "Taken User",
+        },
+    )
+    assert taken.status_code == 201
+
+    hashed = hash_password(PASSWORD)
+    members = [
+        {
+            "id": str(uuid.uuid4()),
+            "organization_id": org_id,
+            "username": f"chunk_{name}_{unique}",
+            "email": email,
+            "full_name": name.capitalize(),
+            "role": "staff",
+            "hashed_password": hashed,
+            "joined_at": datetime.now(),
+        }
+        for name, email in (
+            ("new", f"chunk_new_{unique}@example.com"),
+            ("taken", taken_email),
+        )
+    ]
+
+    async def insert_chunk():
+        # The taken email was claimed after the import checked its owners
+        async with AsyncSessionLocal() as db:
+            errors = await _insert_chunk(db, members, set())
+            saved = await db.scalars(
+                select(OrgMember.email).where(OrgMember.organization_id == org_id)
+            )
+            return errors, saved.all()
+
+    errors, saved = run_async(insert_chunk)
+    assert list(errors) == [members[1]["id"]]
+    assert saved == [members[0]["email"]]
+
+
+def test_import_members_accepts_ndjson():
+    """NDJSON imports are parsed line by line"""
+    unique = uuid.uuid4().hex
+    _, token = _register_org(unique)
+
+    body = "\n".join(
+        [
+            '{"username": "nd_%s", "email": "nd_%s@example.com", '
+            '"password": "%s", "full_name": "Nd Member"}' % (unique, unique, PASSWORD),
+            "{not json",
+        ]
+    )
+    response = client.post(
+        "/organization/members/import",
+        content=body,
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/x-ndjson",
+        },
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["created"] == 1
+    assert report["results"][1]["error"] == "Invalid JSON"
+
+    unsupported = client.post(
+        "/organization/members/import",
+        content=body,
+        headers={"Authorization": f"Bearer {token}", "Content-Type": "text/plain"},
+    )
+    assert unsupported.status_code == 400
+
+
+def test_export_members_streams_members_and_patients():
+    """Exports carry each member once, with their assigned patients"""
+    unique = uuid.uuid4().hex
+    _, token = _register_org(unique)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    body = "\n".join(
+        ["username,email,password,full_name"]
+        + [
+            f"exp{i}_{unique},exp{i}_{unique}@example.com,{PASSWORD},Member {i}"
+            for i in range(3)
+        ]
+    )
+    report = client.post(
+        "/organization/members/import",
+        content=body,
+        headers={**headers, "Content-Type": "text/csv"},
+    ).json()
+    staff_id = report["results"][0]["id"]
+
+    patient_ids = []
+    for i in range(2):
+        patient = client.post(
+            "/auth/register",
+            json={
+                "account_type": "user",
+                "username": f"patient{i}_{unique}",
+                "email": f"patient{i}_{unique}@example.com",
+                "password": PASSWORD,
+                "full_name": f"Patient {i}",
+            },
+        )
+        patient_ids.append(patient.json()["user"]["id"])
+
+    async def assign():
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(User)
+                .where(User.id.in_(patient_ids))
+                .values(assigned_staff_id=staff_id)
+            )
+            await db.commit()
+
+    run_async(assign)
+
+    response = client.get("/organization/members/export", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [orjson.loads(line) for line in response.text.splitlines()]
+    assert len(records) == 3
+    by_id = {record["id"]: record for record in records}
+    assert sorted(p["id"] for p in by_id[staff_id]["assigned_patients"]) == sorted(
+        patient_ids
+    )
+    assert by_id[staff_id]["role"] == "staff"
+
+    csv_response = client.get(
+        "/organization/members/export", params={"format": "csv"}, headers=headers
+    )
+    assert csv_response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(csv_response.text)))
+    assert len(rows) == 3
+    staff_row = next(row for row in rows if row["id"] == staff_id)
+    assert staff_row["assigned_patient_count"] == "2"
+
+
+def test_member_listings_paginate_by_cursor():
+    """Keyset pages cover every member once, with filters and patients"""
+    unique = uuid.uuid4().hex
+    _, token = _register_org(unique)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    roles = ["doctor", "nurse", "doctor", "staff", "doctor"]
+    body = "\n".join(
+        ["username,email,password,full_name,role"]
+        + [
+            f"page{i}_{unique},page{i}_{unique}@example.com,{PASSWORD},M {i},{role}"
+            for i, role in enumerate(roles)
+        ]
+    )
+    client.post(
+        "/organization/members/import",
+        content=body,
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+
+    def collect(url, params):
+        items, cursor, pages = [], None, 0
+        while True:
+            response = client.get(
+                url,
+                params={**params, "cursor": cursor} if cursor else params,
+                headers=headers,
+            )
+            assert response.status_code == 200, response.text
+            page = response.json()
+            items.extend(page["items"])
+            pages += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return items, pages
+
+    members, pages = collect("/organization/members", {"limit": 2})
+    assert len(members) == 5 and pages == 3
+    assert len({member["id"] for member in members}) == 5
+
+    doctors, _ = collect("/organization/members", {"limit": 2, "role": "doctor"})
+    assert [member["role"] for member in doctors] == ["doctor"] * 3
+
+    bad_cursor = client.get(
+        "/organization/members", params={"cursor": "not-a-cursor"}, headers=headers
+    )
+    assert bad_cursor.status_code == 400
+
+    staff_email = f"page0_{unique}@example.com"
+    staff_id = next(m["id"] for m in members if m["email"] == staff_email)
+    patient_ids = []
+    for i in range(3):
+        patient = client.post(
+            "/auth/register",
+            json={
+                "account_type": "user",
+                "username": f"pagepatient{i}_{unique}",
+                "email": f"pagepatient{i}_{unique}@example.com",
+                "password": PASSWORD,
+                "full_name": f"Patient {i}",
+            },
+        )
+        patient_ids.append(patient.json()["user"]["id"])
+
+    async def assign():
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(User)
+                .where(User.id.in_(patient_ids))
+                .values(assigned_staff_id=staff_id)
+            )
+            await db.commit()
+
+    run_async(assign)
+
+    patients, pages = collect(
+        f"/organization/members/{staff_id}/patients", {"limit": 2}
+    )
+    assert sorted(patient["id"] for patient in patients) == sorted(patient_ids)
+    assert pages == 2
+
+    member_login = client.post(
+        "/auth/login",
+        json={
+            "email": staff_email,
+            "password": PASSWORD,
+            "login_context": "org_member",
+        },
+        headers={"X-Client-Type": "mobile"},
+    )
+    member_token = member_login.json()["access_token"]
+    memberships = client.get(
+        "/user/memberships", headers={"Authorization": f"Bearer {member_token}"}
+    )
+    assert memberships.status_code == 200, memberships.text
+    assert [item["id"] for item in memberships.json()["items"]] == [staff_id]
@@ -0,0 +1,210 @@
+"""Query Plan Tests
+
+Every org member CRUD query must be answerable from an index. Each query
+is captured as the CRUD function issues it against a seeded database, then
+EXPLAINed with sequential scans disabled: a plan that still contains one
+has no usable index.
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+
+import pytest
+from app.api.db.session import AsyncSessionLocal, async_engine
+from app.api.v1.auth.crud import (
+    bulk_create_org_members,
+    get_assigned_patients_page,
+    get_busiest_staff,
+    get_import_email_owners,
+    get_memberships_page,
+    get_org_member_by_email,
+    get_org_counts,
+    get_org_member_ids,
+    get_org_member_in_organization,
+    get_org_members_by_organization,
+    get_org_members_page,
+    get_user_organizations,
+    stream_org_member_export,
+)
+from app.api.v1.auth.crud.organization import get_organization_staff
+from app.api.v1.auth.crud.staff import _get_membership
+from app.api.v1.auth.models.user import User
+from lib.utils.enums import OrgRole
+from sqlalchemy import event, text, update
+from tests.api.app_test import client, run_async
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("DATABASE_URL", "").startswith("postgresql"),
+    reason="query plans are checked against PostgreSQL",
+)
+
+SEED_MEMBERS = 500
+PLANNED_TABLES = (
+    "org_members",
+    "users",
+    "org_dashboard_counts",
+    "org_staff_patient_counts",
+)
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    """Relations read by a sequential scan anywhere in a plan tree"""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def _seed() -> dict:
+    """An organization with members, a linked user and assigned patients"""
+    unique = uuid.uuid4().hex
+    org = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"PlanOrg_{unique}",
+            "email": f"plan_org_{unique}@example.com",
+            "password": "TestPassword1$",
+        },
+    )
+    user = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"plan_user_{unique}",
+            "email": f"plan_user_{unique}@example.com",
+            "password": "TestPassword1$",
+            "full_name": "Plan User",
+        },
+    )
+    seed = {
+        "org_id": org.json()["user"]["id"],
+        "user_id": user.json()["user"]["id"],
+        "email": f"plan_member_0_{unique}@example.com",
+    }
+
+    async def insert_members():
+        joined_at = datetime.now()
+        members = [
+            {
+                "id": str(uuid.uuid4()),
+                "organization_id": seed["org_id"],
+                "username": f"plan_member_{i}_{unique}",
+                "email": f"plan_member_{i}_{unique}@example.com",
+                "full_name": f"Plan Member {i}",
+                "role": OrgRole.STAFF,
+                "hashed_password": "x",
+                "joined_at": joined_at,
+            }
+            for i in range(SEED_MEMBERS)
+        ]
+        members[1]["user_id"] = seed["user_id"]
+        async with AsyncSessionLocal() as db:
+            await bulk_create_org_members(db, members, set())
+            await db.execute(
+                update(User)
+                .where(User.id == seed["user_id"])
+                .values(assigned_staff_id=members[0]["id"])
+            )
+            await db.commit()
+        seed["staff_id"] = members[0]["id"]
+        async with async_engine.connect() as conn:
+            await conn.execute(text("ANALYZE org_members"))
+            await conn.execute(text("ANALYZE users"))
+
+    run_async(insert_members)
+    return seed
+
+
+def _crud_calls(seed: dict) -> dict:
+    """Each CRUD query under test, as a coroutine function of a session"""
+    org_id, user_id, email = seed["org_id"], seed["user_id"], seed["email"]
+
+    async def export(db):
+        async for _ in stream_org_member_export(db, org_id):
+            pass
+
+    return {
+        "get_org_member_by_email": lambda db: get_org_member_by_email(db, email),
+        "get_org_member_in_organization": lambda db: get_org_member_in_organization(
+            db, email, org_id
+        ),
+        "_get_membership": lambda db: _get_membership(db, user_id, org_id),
+        "get_user_organizations": lambda db: get_user_organizations(db, user_id),
+        "get_org_members_by_organization": lambda db: get_org_members_by_organization(
+            db, org_id
+        ),
+        "get_organization_staff": lambda db: get_organization_staff(db, org_id),
+        "get_org_member_ids": lambda db: get_org_member_ids(db, org_id),
+        "get_import_email_owners": lambda db: get_import_email_owners(
+            db, org_id, [email]
+        ),
+        "get_org_members_page": lambda db: get_org_members_page(
+            db, org_id, 50, (datetime.now(), str(uuid.uuid4()))
+        ),
+        "get_org_members_page[role]": lambda db: get_org_members_page(
+            db, org_id, 50, role=OrgRole.DOCTOR
+        ),
+        "get_memberships_page[user_id]": lambda db: get_memberships_page(
+            db, 50, user_id=user_id
+        ),
+        "get_memberships_page[email]": lambda db: get_memberships_page(
+            db, 50, email=email
+        ),
+        "get_assigned_patients_page": lambda db: get_assigned_patients_page(
+            db, seed["staff_id"], 50
+        ),
+        "stream_org_member_export": export,
+        "get_org_counts": lambda db: get_org_counts(db, org_id),
+        "get_busiest_staff": lambda db: get_busiest_staff(db, org_id, 10),
+    }
+
+
+async def _explain_crud_queries(seed: dict) -> dict[str, list[str]]:
+    """Sequentially scanned relations, per CRUD query"""
+    scans: dict[str, list[str]] = {}
+    for name, call in _crud_calls(seed).items():
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if any(table in statement for table in PLANNED_TABLES):
+                statements.append((statement, parameters))
+
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            async with AsyncSessionLocal() as db:
+                await call(db)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+        assert statements, f"{name} issued no query"
+        scans[name] = []
+        async with async_engine.connect() as conn:
+            await conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                )
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                scans[name].extend(_seq_scans(plan[0]["Plan"]))
+            await conn.rollback()
+    return scans
+
+
+def test_crud_queries_use_indexes():
+    """No org member CRUD query needs a sequential scan"""
+    seed = _seed()
+    scans = run_async(_explain_crud_queries, seed)
+
+    offenders = {
+        name: tables
+        for name, tables in scans.items()
+        if any(table in PLANNED_TABLES for table in tables)
+    }
+    assert not offenders, f"sequential scans in: {offenders}"
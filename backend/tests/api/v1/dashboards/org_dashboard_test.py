@@ -0,0 +1,229 @@
+"""Organization Dashboard Tests"""
+
+import uuid
+
+from app.api.db.session import AsyncSessionLocal
+from app.api.v1.auth.crud import (
+    delete_user,
+    rebuild_org_counts,
+    remove_user_from_org,
+    update_user,
+)
+from app.api.v1.dashboards.services.user_dashboard_service import reading_buffer
+from tests.api.app_test import client, run_async
+
+PASSWORD = "TestPassword1$"
+
+
+def _login(email: str, context: str) -> dict:
+    """Log in with a mobile client and return the response body"""
+    login = client.post(
+        "/auth/login",
+        json={"email": email, "password": PASSWORD, "login_context": context},
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert login.status_code == 200, login.text
+    return login.json()
+
+
+def _register_org(unique: str) -> tuple[str, dict]:
+    """Register an organization and return (org_id, auth headers)"""
+    email = f"dash_org_{unique}@example.com"
+    response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "organization",
+            "name": f"DashOrg_{unique}",
+            "email": email,
+            "password": PASSWORD,
+        },
+    )
+    assert response.status_code == 201, response.text
+    token = _login(email, "organization")["access_token"]
+    return response.json()["user"]["id"], {"Authorization": f"Bearer {token}"}
+
+
+def _register_patient(org_id: str, name: str) -> tuple[str, dict]:
+    """Register a patient of an organization; return (user_id, auth headers)"""
+    email = f"{name}@example.com"
+    response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": name,
+            "email": email,
+            "password": PASSWORD,
+            "full_name": "Org Patient",
+            "organization_id": org_id,
+        },
+    )
+    assert response.status_code == 201, response.text
+    token = _login(email, "user")["access_token"]
+    return response.json()["user"]["id"], {"Authorization": f"Bearer {token}"}
+
+
+def test_org_dashboard_follows_members_patients_and_alerts():
+    """Counts move with imports, assignments and alerts, and match a recount"""
+    unique = uuid.uuid4().hex
+    org_id, headers = _register_org(unique)
+
+    body = "\n".join(
+        ["username,email,password,full_name,role"]
+        + [
+            f"od{i}_{unique},od{i}_{unique}@example.com,{PASSWORD},Member {i},{role}"
+            for i, role in enumerate(["doctor", "doctor", "nurse"])
+        ]
+    )
+    report = client.post(
+        "/organization/members/import",
+        content=body,
+        headers={**headers, "Content-Type": "text/csv"},
+    ).json()
+    doctor_id, _, nurse_id = [result["id"] for result in report["results"]]
+
+    patients = [_register_patient(org_id, f"odp{i}_{unique}") for i in range(3)]
+    for (patient_id, _), staff_id in zip(patients, [doctor_id, doctor_id, nurse_id]):
+        response = client.put(
+            f"/organization/patients/{patient_id}/staff",
+            json={"staff_id": staff_id},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+    client.put(
+        f"/organization/patients/{patients[2][0]}/staff",
+        json={"staff_id": None},
+        headers=headers,
+    )
+
+    patient_headers = patients[0][1]
+    batch = {"readings": [{"metric": "heart_rate", "value": 150}]}
+    client.post("/dashboard/metrics/readings", json=batch, headers=patient_headers)
+    run_async(reading_buffer.flush)
+
+    dashboard = client.get("/organization/dashboard", headers=headers)
+    assert dashboard.status_code == 200, dashboard.text
+    summary = dashboard.json()
+    assert summary["staff"] == {"org_admin": 0, "doctor": 2, "nurse": 1, "staff": 0}
+    assert (summary["staff_total"], summary["patients"]) == (3, 3)
+    assert summary["unassigned_patients"] == 1
+    assert [
+        (staff["member_id"], staff["patients"]) for staff in summary["busiest_staff"]
+    ] == [(doctor_id, 2)]
+    # 150 bpm is both tachycardia and severe tachycardia
+    assert summary["active_alerts"] == {"warning": 1, "critical": 1}
+
+    async def recount():
+        async with AsyncSessionLocal() as db:
+            await rebuild_org_counts(db, org_id)
+
+    run_async(recount)
+    assert client.get("/organization/dashboard", headers=headers).json() == summary
+
+    alerts = client.get("/dashboard/alerts", headers=patient_headers).json()
+    alert_id = alerts["items"][0]["id"]
+    # Resolving twice counts once
+    for _ in range(2):
+        client.post(f"/dashboard/alerts/{alert_id}/resolve", headers=patient_headers)
+    summary = client.get("/organization/dashboard", headers=headers).json()
+    assert summary["active_alerts_total"] == 1
+
+
+def test_org_dashboard_matches_recount_after_departures():
+    """Deleting and moving patients and removing staff keep counts exact"""
+    unique = uuid.uuid4().hex
+    org_id, headers = _register_org(f"from_{unique}")
+    other_org_id, other_headers = _register_org(f"to_{unique}")
+
+    # A staff member linked to a user account
+    staff_email = f"ods_{unique}@example.com"
+    user_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"ods_{unique}",
+            "email": staff_email,
+            "password": PASSWORD,
+            "full_name": "Linked Staff",
+        },
+    )
+    assert user_response.status_code == 201, user_response.text
+    staff_user_id = user_response.json()["user"]["id"]
+    member_response = client.post(
+        "/auth/register",
+        json={
+            "account_type": "org_member",
+            "username": f"odm_{unique}",
+            "email": staff_email,
+            "password": PASSWORD,
+            "full_name": "Linked Staff",
+            "organization_id": org_id,
+            "role": "doctor",
+        },
+    )
+    assert member_response.status_code == 201, member_response.text
+    member_id = member_response.json()["user"]["id"]
+
+    moved, deleted, kept = [
+        _register_patient(org_id, f"od{name}_{unique}")
+        for name in ("moved", "deleted", "kept")
+    ]
+    response = client.put(
+        f"/organization/patients/{kept[0]}/staff",
+        json={"staff_id": member_id},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    batch = {"readings": [{"metric": "heart_rate", "value": 150}]}
+    for _, patient_headers in (moved, deleted):
+        client.post("/dashboard/metrics/readings", json=batch, headers=patient_headers)
+    run_async(reading_buffer.flush)
+    assert (
+        client.get("/organization/dashboard", headers=headers).json()[
+            "active_alerts_total"
+        ]
+        == 4
+    )
+
+    async def depart():
+        async with AsyncSessionLocal() as db:
+            await update_user(db, moved[0], organization_id=other_org_id)
+            await delete_user(db, deleted[0])
+            await remove_user_from_org(db, staff_user_id, org_id)
+
+    run_async(depart)
+    summary = client.get("/organization/dashboard", headers=headers).json()
+    other_summary = client.get("/organization/dashboard", headers=other_headers).json()
+    assert (summary["patients"], summary["unassigned_patients"]) == (1, 1)
+    assert (summary["staff_total"], summary["active_alerts_total"]) == (0, 0)
+    assert other_summary["patients"] == 1
+    assert other_summary["active_alerts"] == {"warning": 1, "critical": 1}
+
+    async def recount():
+        async with AsyncSessionLocal() as db:
+            await rebuild_org_counts(db, org_id)
+            await rebuild_org_counts(db, other_org_id)
+
+    run_async(recount)
+    assert client.get("/organization/dashboard", headers=headers).json() == summary
+    assert (
+        client.get("/organization/dashboard", headers=other_headers).json()
+        == other_summary
+    )
+
+
+def test_org_dashboard_is_for_org_admins():
+    """Patients cannot read it, and only the org's own patients are assigned"""
+    unique = uuid.uuid4().hex
+    org_id, headers = _register_org(unique)
+    _, patient_headers = _register_patient(org_id, f"odx_{unique}")
+    other_id, _ = _register_org(f"other_{unique}")
+    outsider_id, _ = _register_patient(other_id, f"ody_{unique}")
+
+    forbidden = client.get("/organization/dashboard", headers=patient_headers)
+    assert forbidden.status_code == 403
+    outsider = client.put(
+        f"/organization/patients/{outsider_id}/staff",
+        json={"staff_id": None},
+        headers=headers,
+    )
+    assert outsider.status_code == 404
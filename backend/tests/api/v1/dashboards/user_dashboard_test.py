@@ -0,0 +1,431 @@
+"""User Dashboard Tests"""
+
+import uuid
+from datetime import date
+
+from app.api.db.session import AsyncSessionLocal, async_engine
+from app.api.v1.auth.crud import delete_user, get_user_dashboard_by_user_id
+from app.api.v1.auth.crud.users.user_dashboard import _readings_insert, merge_insert
+from app.api.v1.dashboards.models.individual_users.user_dashboard import (
+    HealthAlert,
+    HealthReading,
+    HealthRollup,
+)
+from app.api.v1.dashboards.services.derived_fields_job import (
+    recompute_derived_fields,
+)
+from app.api.v1.dashboards.services.user_dashboard_service import reading_buffer
+from sqlalchemy import func, select
+from sqlalchemy.dialects import mysql
+from tests.api.app_test import client, run_async
+
+PASSWORD = "TestPassword1$"
+
+
+def _login(prefix: str = "dash") -> dict:
+    """Register a user and return their mobile login response"""
+    unique = uuid.uuid4().hex
+    email = f"{prefix}_{unique}@example.com"
+    client.post(
+        "/auth/register",
+        json={
+            "account_type": "user",
+            "username": f"{prefix}_{unique}",
+            "email": email,
+            "password": PASSWORD,
+            "full_name": "Dashboard User",
+        },
+    )
+    login = client.post(
+        "/auth/login",
+        json={"email": email, "password": PASSWORD, "login_context": "user"},
+        headers={"X-Client-Type": "mobile"},
+    )
+    assert login.status_code == 200, login.text
+    return login.json()
+
+
+def _user_token(prefix: str = "dash") -> str:
+    """Register a user and return a mobile access token"""
+    return _login(prefix)["access_token"]
+
+
+def test_readings_batch_and_latest_value():
+    """Batched readings are stored; the latest one of each metric is served"""
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+    batch = {
+        "readings": [
+            {"metric": "heart_rate", "value": 70, "ts": "2026-10-18T08:00:00Z"},
+            {"metric": "heart_rate", "value": 95, "ts": "2026-10-18T09:00:00Z"},
+            {"metric": "heart_rate", "value": 80, "ts": "2026-10-18T08:30:00Z"},
+            {"metric": "blood_glucose", "value": 5.4, "ts": "2026-10-18T08:00:00Z"},
+        ]
+    }
+    response = client.post("/dashboard/metrics/readings", json=batch, headers=headers)
+    assert response.status_code == 202, response.text
+    assert response.json()["accepted"] == 4
+
+    # Resending the same batch stores nothing twice
+    repeat = client.post("/dashboard/metrics/readings", json=batch, headers=headers)
+    assert repeat.status_code == 202
+    run_async(reading_buffer.flush)
+
+    latest = client.get("/dashboard/metrics", headers=headers).json()
+    assert latest["heart_rate"] == 95
+    assert latest["blood_glucose"] == 5.4
+    assert latest["body_temperature"] is None
+    assert latest["measured_at"]["heart_rate"].startswith("2026-10-18T09:00:00")
+
+
+def test_health_metrics_snapshot():
+    """Snapshots split into readings and dashboard details"""
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+    response = client.put(
+        "/dashboard/metrics",
+        json={"heart_rate": 72, "blood_pressure": "120/80", "sleep_quality": "good"},
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    metrics = response.json()
+    assert metrics["heart_rate"] == 72
+    assert metrics["blood_pressure"] == "120/80"
+
+    client.put("/dashboard/metrics", json={"sleep_quality": "poor"}, headers=headers)
+    metrics = client.get("/dashboard/metrics", headers=headers).json()
+    assert (metrics["blood_pressure"], metrics["sleep_quality"]) == ("120/80", "poor")
+    assert metrics["heart_rate"] == 72
+
+
+def test_readings_are_validated():
+    """Unknown metrics and empty batches are rejected"""
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+    bad_metric = client.post(
+        "/dashboard/metrics/readings",
+        json={"readings": [{"metric": "mood", "value": 1}]},
+        headers=headers,
+    )
+    assert bad_metric.status_code == 422
+    empty = client.post(
+        "/dashboard/metrics/readings", json={"readings": []}, headers=headers
+    )
+    assert empty.status_code == 422
+
+
+def test_saturated_buffer_returns_429():
+    """Readings that do not fit in the buffer are refused with Retry-After"""
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+    batch = {"readings": [{"metric": "heart_rate", "value": 70}] * 3}
+    max_rows = reading_buffer.max_rows
+    reading_buffer.max_rows = reading_buffer.pending + 2
+    try:
+        response = client.post(
+            "/dashboard/metrics/readings", json=batch, headers=headers
+        )
+    finally:
+        reading_buffer.max_rows = max_rows
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+
+
+def test_metric_series_reads_rollups():
+    """Series come from rollups at a resolution that fits max_points"""
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+    batch = {
+        "readings": [
+            {"metric": "heart_rate", "value": 60, "ts": "2026-10-01T08:00:00Z"},
+            {"metric": "heart_rate", "value": 80, "ts": "2026-10-01T08:00:30Z"},
+            {"metric": "heart_rate", "value": 100, "ts": "2026-10-01T09:15:00Z"},
+            {"metric": "heart_rate", "value": 90, "ts": "2026-10-02T12:00:00Z"},
+        ]
+    }
+    client.post("/dashboard/metrics/readings", json=batch, headers=headers)
+    # Duplicates are not counted into the rollups twice
+    client.post("/dashboard/metrics/readings", json=batch, headers=headers)
+    run_async(reading_buffer.flush)
+
+    url = "/dashboard/metrics/heart_rate/series"
+    minutes = client.get(
+        url,
+        params={"start": "2026-10-01T08:00:00Z", "end": "2026-10-01T10:00:00Z"},
+        headers=headers,
+    )
+    assert minutes.status_code == 200, minutes.text
+    series = minutes.json()
+    assert series["resolution"] == "minute"
+    assert [(p["count"], p["min"], p["max"]) for p in series["points"]] == [
+        (2, 60, 80),
+        (1, 100, 100),
+    ]
+    assert series["points"][0]["avg"] == 70
+
+    days = client.get(
+        url,
+        params={
+            "start": "2026-09-01T00:00:00Z",
+            "end": "2026-10-31T00:00:00Z",
+            "max_points": 100,
+        },
+        headers=headers,
+    ).json()
+    assert days["resolution"] == "day"
+    assert [p["count"] for p in days["points"]] == [3, 1]
+    assert days["points"][0]["ts"].startswith("2026-10-01T00:00:00")
+
+    backwards = client.get(
+        url,
+        params={"start": "2026-10-02T00:00:00Z", "end": "2026-10-01T00:00:00Z"},
+        headers=headers,
+    )
+    assert backwards.status_code == 400
+
+
+def test_resent_readings_are_rolled_up_once_without_returning(monkeypatch):
+    """Where executemany cannot return inserted rows, stored readings are
+    looked up so a resent batch is not rolled up again"""
+    monkeypatch.setattr(
+        async_engine.sync_engine.dialect, "insert_executemany_returning", False
+    )
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+    batch = {
+        "readings": [
+            {"metric": "heart_rate", "value": 60, "ts": "2026-10-03T08:00:00Z"},
+            {"metric": "heart_rate", "value": 80, "ts": "2026-10-03T08:00:30Z"},
+        ]
+    }
+    for _ in range(2):
+        client.post("/dashboard/metrics/readings", json=batch, headers=headers)
+        run_async(reading_buffer.flush)
+
+    series = client.get(
+        "/dashboard/metrics/heart_rate/series",
+        params={"start": "2026-10-03T08:00:00Z", "end": "2026-10-03T09:00:00Z"},
+        headers=headers,
+    ).json()
+    assert [(p["count"], p["min"], p["max"]) for p in series["points"]] == [(2, 60, 80)]
+
+
+def test_upserts_compile_for_mysql():
+    """MySQL merges rows with ON DUPLICATE KEY UPDATE"""
+    rollups = merge_insert(
+        "mysql",
+        HealthRollup,
+        ["user_id", "metric", "resolution", "bucket"],
+        lambda new: {
+            "count": HealthRollup.count + new.count,
+            "max": func.greatest(HealthRollup.max, new.max),
+        },
+    )
+    sql = str(rollups.compile(dialect=mysql.dialect()))
+    assert (
+        "ON DUPLICATE KEY UPDATE count = (health_rollups.count + VALUES(count))" in sql
+    )
+    assert "max = greatest(health_rollups.max, VALUES(max))" in sql
+
+    readings = str(_readings_insert("mysql").compile(dialect=mysql.dialect()))
+    assert readings.endswith("ON DUPLICATE KEY UPDATE value = health_readings.value")
+
+
+def test_readings_raise_alerts_until_resolved():
+    """Alerting readings show up in alert_warnings until resolved"""
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+    batch = {
+        "readings": [
+            {"metric": "heart_rate", "value": 110, "ts": "2026-10-18T08:00:00Z"},
+            {"metric": "heart_rate", "value": 118, "ts": "2026-10-18T08:00:30Z"},
+            {"metric": "blood_glucose", "value": 5.6, "ts": "2026-10-18T08:00:00Z"},
+        ]
+    }
+    client.post("/dashboard/metrics/readings", json=batch, headers=headers)
+    run_async(reading_buffer.flush)
+
+    alerts = client.get("/dashboard/alerts", headers=headers)
+    assert alerts.status_code == 200, alerts.text
+    items = alerts.json()["items"]
+    assert [(item["rule"], item["value"], item["count"]) for item in items] == [
+        ("tachycardia", 118, 2)
+    ]
+    metrics = client.get("/dashboard/metrics", headers=headers).json()
+    assert metrics["alert_warnings"]["alerts"] == [items[0]["message"]]
+
+    # Snapshots are checked too
+    client.put("/dashboard/metrics", json={"body_temperature": 38.6}, headers=headers)
+    rules = {
+        item["rule"]
+        for item in client.get("/dashboard/alerts", headers=headers).json()["items"]
+    }
+    assert rules == {"tachycardia", "fever"}
+
+    resolved = client.post(
+        f"/dashboard/alerts/{items[0]['id']}/resolve", headers=headers
+    )
+    assert resolved.status_code == 200, resolved.text
+    assert resolved.json()["resolved_at"] is not None
+    remaining = client.get("/dashboard/alerts", headers=headers).json()["items"]
+    assert [item["rule"] for item in remaining] == ["fever"]
+
+    other = {"Authorization": f"Bearer {_user_token()}"}
+    foreign = client.post(f"/dashboard/alerts/{items[0]['id']}/resolve", headers=other)
+    assert foreign.status_code == 404
+
+
+def test_deleting_a_user_removes_their_health_data():
+    """Readings, rollups and alerts go with the user they belong to"""
+    login = _login("deleted")
+    user_id = login["user"]["id"]
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    batch = {
+        "readings": [
+            {"metric": "heart_rate", "value": 120, "ts": "2026-10-18T08:00:00Z"},
+            {"metric": "heart_rate", "value": 125, "ts": "2026-10-18T08:00:30Z"},
+        ]
+    }
+    client.post("/dashboard/metrics/readings", json=batch, headers=headers)
+    run_async(reading_buffer.flush)
+
+    async def health_rows():
+        async with AsyncSessionLocal() as db:
+            return [
+                await db.scalar(
+                    select(func.count())
+                    .select_from(model)
+                    .where(model.user_id == user_id)
+                )
+                for model in (HealthReading, HealthRollup, HealthAlert)
+            ]
+
+    assert all(run_async(health_rows))
+
+    async def delete():
+        async with AsyncSessionLocal() as db:
+            await delete_user(db, user_id)
+
+    run_async(delete)
+    assert run_async(health_rows) == [0, 0, 0]
+
+
+def test_alerts_are_deduplicated_and_cool_down():
+    """Repeat firings fold into the active alert; resolved ones cool down"""
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+
+    def send(value, ts):
+        client.post(
+            "/dashboard/metrics/readings",
+            json={"readings": [{"metric": "heart_rate", "value": value, "ts": ts}]},
+            headers=headers,
+        )
+        run_async(reading_buffer.flush)
+        return client.get("/dashboard/alerts", headers=headers).json()["items"]
+
+    send(72, "2026-10-18T10:00:00Z")
+    # A jump across two flushes is caught from the rolling state
+    alerts = send(112, "2026-10-18T10:00:30Z")
+    assert sorted(alert["rule"] for alert in alerts) == [
+        "heart_rate_jump",
+        "tachycardia",
+    ]
+
+    alerts = send(108, "2026-10-18T10:01:30Z")
+    tachycardia = next(alert for alert in alerts if alert["rule"] == "tachycardia")
+    assert (tachycardia["count"], tachycardia["value"]) == (2, 108)
+    assert len(alerts) == 2
+
+    for alert in alerts:
+        client.post(f"/dashboard/alerts/{alert['id']}/resolve", headers=headers)
+    assert send(115, "2026-10-18T10:02:30Z") == []
+
+
+def test_bio_data_derives_age_and_bmi():
+    """Bio data is stored in kg and cm, with age and BMI derived"""
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+    response = client.patch(
+        "/dashboard/bio-data",
+        json={
+            "gender": "female",
+            "dob": "1990-01-15",
+            "weight": 154.3,
+            "weight_unit": "lb",
+            "height": 68.9,
+            "height_unit": "in",
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    bio_data = response.json()
+    assert (bio_data["weight"], bio_data["height"]) == (69.99, 175.01)
+    assert bio_data["bmi"] == 22.9
+    assert bio_data["age"] >= 36
+
+    client.patch("/dashboard/bio-data", json={"weight": 80}, headers=headers)
+    bio_data = client.get("/dashboard/bio-data", headers=headers).json()
+    assert (bio_data["bmi"], bio_data["gender"]) == (26.1, "female")
+
+    wrong_unit = client.patch(
+        "/dashboard/bio-data", json={"weight": 80, "weight_unit": "cm"}, headers=headers
+    )
+    assert wrong_unit.status_code == 422
+
+
+def test_readings_in_other_units_are_converted():
+    """Glucose in mg/dL and temperature in F are stored as mmol/L and C"""
+    headers = {"Authorization": f"Bearer {_user_token()}"}
+    batch = {
+        "readings": [
+            {"metric": "blood_glucose", "value": 99, "unit": "mg/dL"},
+            {"metric": "body_temperature", "value": 98.6, "unit": "F"},
+        ]
+    }
+    response = client.post("/dashboard/metrics/readings", json=batch, headers=headers)
+    assert response.status_code == 202, response.text
+    run_async(reading_buffer.flush)
+    metrics = client.get("/dashboard/metrics", headers=headers).json()
+    assert metrics["blood_glucose"] == 5.5
+    assert round(metrics["body_temperature"], 6) == 37
+
+    bad = client.post(
+        "/dashboard/metrics/readings",
+        json={"readings": [{"metric": "heart_rate", "value": 70, "unit": "F"}]},
+        headers=headers,
+    )
+    assert bad.status_code == 422
+
+
+def test_derived_fields_job_recomputes_due_dashboards():
+    """Only dashboards past a birthday or with new inputs are rederived"""
+    login = _login()
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+    user_id = login["user"]["id"]
+    client.patch(
+        "/dashboard/bio-data",
+        json={"dob": "1990-01-15", "weight": 70, "height": 175},
+        headers=headers,
+    )
+
+    async def dashboard():
+        async with AsyncSessionLocal() as db:
+            return await get_user_dashboard_by_user_id(db, user_id)
+
+    assert run_async(dashboard).derived_due_on == date(2027, 1, 15)
+
+    run_async(recompute_derived_fields, date(2027, 1, 14), 2)
+    assert client.get("/dashboard/bio-data", headers=headers).json()["age"] == 36
+
+    summary = run_async(recompute_derived_fields, date(2027, 1, 15), 2)
+    assert summary["updated"] >= 1 and summary["lag_days"] >= 0
+    updated = run_async(dashboard)
+    assert (updated.bio_data["age"], updated.derived_due_on) == (
+        37,
+        date(2028, 1, 15),
+    )
+
+    async def write_weight_directly():
+        async with AsyncSessionLocal() as db:
+            stored = await get_user_dashboard_by_user_id(db, user_id)
+            stored.bio_data = {**stored.bio_data, "weight": 80}
+            stored.derived_due_on = date(2027, 1, 16)
+            await db.commit()
+
+    run_async(write_weight_directly)
+    run_async(recompute_derived_fields, date(2027, 1, 16), 2)
+    bio_data = client.get("/dashboard/bio-data", headers=headers).json()
+    assert (bio_data["bmi"], bio_data["age"]) == (26.1, 37)
+    assert run_async(dashboard).derived_due_on == date(2028, 1, 15)
@@ -0,0 +1,212 @@
+"""Alert Engine Tests"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+from lib.userlib.user_dashboard import METRIC_CODES, AlertEngine, AlertRule
+from lib.utils.alert_state import MetricState
+from lib.utils.enums import AlertKind, AlertSeverity, HealthMetric
+from pydantic import ValidationError
+
+T0 = datetime(2026, 10, 18, 8, 0, tzinfo=timezone.utc)
+HR = HealthMetric.HEART_RATE
+GLUCOSE = HealthMetric.BLOOD_GLUCOSE
+
+
+def _reading(user_id: str, metric: HealthMetric, minutes: float, value: float):
+    return {
+        "user_id": user_id,
+        "metric": metric,
+        "ts": T0 + timedelta(minutes=minutes),
+        "value": value,
+    }
+
+
+def _fired(alerts: list[dict]) -> set[tuple[str, str]]:
+    return {(alert["user_id"], alert["rule"]) for alert in alerts}
+
+
+def test_threshold_rules_keep_latest_reading_per_user():
+    """One alert per user and rule, carrying the latest reading that met it"""
+    engine = AlertEngine(
+        [AlertRule(name="tachycardia", metric=HR, above=100, message="fast")]
+    )
+    readings = [
+        _reading("a", HR, 2, 120),
+        _reading("b", HR, 0, 80),
+        _reading("a", HR, 0, 110),
+        _reading("a", HR, 1, 90),
+        _reading("b", GLUCOSE, 0, 150),
+    ]
+    alerts = engine.alerts(readings)
+    assert len(alerts) == 1
+    alert = alerts[0]
+    assert (alert["user_id"], alert["value"], alert["count"]) == ("a", 120, 2)
+    assert alert["ts"] == T0 + timedelta(minutes=2)
+    assert alert["severity"] is AlertSeverity.WARNING
+
+
+def test_rate_and_trend_rules_stay_within_each_user():
+    """Changes are measured against the same user's earlier readings only"""
+    engine = AlertEngine(
+        [
+            AlertRule(
+                name="jump",
+                metric=HR,
+                kind=AlertKind.RATE,
+                above=40,
+                message="jump",
+            ),
+            AlertRule(
+                name="dropping",
+                metric=GLUCOSE,
+                kind=AlertKind.TREND,
+                window=2,
+                below=-1.5,
+                message="dropping",
+            ),
+        ]
+    )
+    readings = [
+        # 30 bpm in 30 seconds is 60 bpm per minute
+        _reading("a", HR, 0, 70),
+        _reading("a", HR, 0.5, 100),
+        # 30 bpm over 5 minutes is not
+        _reading("b", HR, 0, 60),
+        _reading("b", HR, 5, 90),
+        # user c's first reading must not be compared with b's last
+        _reading("c", HR, 6, 160),
+        _reading("a", GLUCOSE, 0, 7.0),
+        _reading("a", GLUCOSE, 5, 6.5),
+        _reading("a", GLUCOSE, 10, 5.2),
+        _reading("b", GLUCOSE, 0, 7.0),
+        _reading("b", GLUCOSE, 10, 5.0),
+    ]
+    assert _fired(engine.alerts(readings)) == {("a", "jump"), ("a", "dropping")}
+
+
+def test_evaluate_matches_per_reading_loop():
+    """Vectorized evaluation agrees with checking readings one by one"""
+    rng = np.random.default_rng(7)
+    count = 5000
+    users = rng.integers(0, 50, count)
+    metrics = rng.integers(0, len(METRIC_CODES), count)
+    ts = rng.permutation(count).astype(np.float64) * 30
+    values = rng.normal(80, 25, count)
+    engine = AlertEngine(
+        [
+            AlertRule(name="high", metric=HR, above=120, message="high"),
+            AlertRule(name="low", metric=HR, below=40, message="low"),
+            AlertRule(
+                name="rate", metric=HR, kind=AlertKind.RATE, above=50, message="r"
+            ),
+            AlertRule(
+                name="trend",
+                metric=HR,
+                kind=AlertKind.TREND,
+                window=3,
+                below=-60,
+                message="t",
+            ),
+        ]
+    )
+    fired_rules, fired_readings, counts = engine.evaluate(users, metrics, ts, values)
+    fired = {
+        (int(rule), int(users[reading])): (int(reading), int(n))
+        for rule, reading, n in zip(fired_rules, fired_readings, counts)
+    }
+
+    expected = {}
+    history: dict[int, list[int]] = {}
+    for i in sorted(range(count), key=lambda i: ts[i]):
+        if metrics[i] != METRIC_CODES[HR]:
+            continue
+        previous = history.setdefault(int(users[i]), [])
+        checks = [values[i] > 120, values[i] < 40]
+        checks.append(
+            bool(previous)
+            and (values[i] - values[previous[-1]]) * 60 / (ts[i] - ts[previous[-1]])
+            > 50
+        )
+        checks.append(len(previous) >= 3 and values[i] - values[previous[-3]] < -60)
+        for rule, hit in enumerate(checks):
+            if hit:
+                key = (rule, int(users[i]))
+                expected[key] = (i, expected.get(key, (0, 0))[1] + 1)
+        previous.append(i)
+    assert fired == expected
+
+
+def test_rules_need_a_bound():
+    """A rule without above or below is rejected"""
+    with pytest.raises(ValidationError):
+        AlertRule(name="empty", metric=HR, message="nothing")
+
+
+def test_streaming_batches_match_one_pass():
+    """Evaluating chunks with rolling state finds what one pass over all does"""
+    rng = np.random.default_rng(11)
+    count = 3000
+    readings = [
+        _reading(f"u{user}", HR, minutes, value)
+        for user, minutes, value in zip(
+            rng.integers(0, 20, count).tolist(),
+            np.sort(rng.uniform(0, 600, count)).tolist(),
+            rng.normal(80, 25, count).tolist(),
+        )
+    ]
+    engine = AlertEngine(
+        [
+            AlertRule(name="high", metric=HR, above=120, message="high"),
+            AlertRule(
+                name="rate", metric=HR, kind=AlertKind.RATE, above=50, message="r"
+            ),
+            AlertRule(
+                name="trend",
+                metric=HR,
+                kind=AlertKind.TREND,
+                window=3,
+                below=-60,
+                message="t",
+            ),
+        ]
+    )
+    whole = {
+        (alert["user_id"], alert["rule"]): alert["count"]
+        for alert in engine.alerts(readings)
+    }
+
+    states = {
+        (f"u{user}", HR): MetricState(engine.window_sizes[HR]) for user in range(20)
+    }
+    streamed: dict[tuple[str, str], int] = {}
+    for start in range(0, count, 250):
+        for alert in engine.alerts(readings[start : start + 250], states):
+            key = (alert["user_id"], alert["rule"])
+            streamed[key] = streamed.get(key, 0) + alert["count"]
+    assert streamed == whole
+
+
+def test_deviation_rules_use_the_baseline():
+    """Deviations are measured from the EWMA of earlier batches"""
+    engine = AlertEngine(
+        [
+            AlertRule(
+                name="above_usual",
+                metric=HR,
+                kind=AlertKind.DEVIATION,
+                above=30,
+                message="above usual",
+            )
+        ]
+    )
+    states = {("a", HR): MetricState(1)}
+    usual = [_reading("a", HR, minute, 60) for minute in range(20)]
+    assert engine.alerts(usual, states) == []
+    assert states[("a", HR)].ewma == pytest.approx(60)
+
+    spike = [_reading("a", HR, 21, 95)]
+    assert _fired(engine.alerts(spike, states)) == {("a", "above_usual")}
+    # Without state there is no baseline to deviate from
+    assert engine.alerts(spike) == []
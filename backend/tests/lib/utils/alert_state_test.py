@@ -0,0 +1,71 @@
+"""Alert State Tests"""
+
+import asyncio
+
+import pytest
+import redis
+from lib.utils.alert_state import AlertStateStore, MetricState
+from lib.utils.enums import HealthMetric
+from lib.utils.redis_client import CircuitBreaker, GuardedRedis, InMemoryRedis
+
+HR = HealthMetric.HEART_RATE
+
+
+def test_metric_state_rolls_forward():
+    """Only newer readings are folded in; the window keeps the last few"""
+    state = MetricState(2)
+    assert state.update(1.0, 60, alpha=0.5)
+    assert state.update(2.0, 80, alpha=0.5)
+    assert not state.update(2.0, 99, alpha=0.5)
+    assert state.update(3.0, 100, alpha=0.5)
+    assert list(state.readings) == [(2.0, 80), (3.0, 100)]
+    assert (state.ewma, state.count) == (85.0, 3)
+
+    restored = MetricState.loads(state.dumps(), 1)
+    assert list(restored.readings) == [(3.0, 100)]
+    assert (restored.ewma, restored.count) == (85.0, 3)
+
+
+def test_store_round_trips_state_and_cooldowns():
+    """States and cooldowns are kept per user in Redis"""
+    client = GuardedRedis(InMemoryRedis(), CircuitBreaker(), "memory")
+    store = AlertStateStore(ttl_seconds=60)
+
+    async def run():
+        states = await store.load(client, [("u", HR)], {HR: 3})
+        states[("u", HR)].update(1.0, 70)
+        await store.save(client, states)
+        loaded = await store.load(client, [("u", HR), ("v", HR)], {HR: 3})
+        await store.start_cooldowns(client, {("u", "tachycardia"): 60, ("u", "x"): 0})
+        cooling = await store.cooling(
+            client, [("u", "tachycardia"), ("u", "x"), ("v", "tachycardia")]
+        )
+        return loaded, cooling
+
+    loaded, cooling = asyncio.run(run())
+    assert list(loaded[("u", HR)].readings) == [(1.0, 70)]
+    assert loaded[("v", HR)].count == 0
+    assert cooling == {("u", "tachycardia")}
+    assert (store.loaded, store.missing, store.saved) == (1, 2, 1)
+
+
+def test_store_falls_back_without_redis():
+    """An open circuit yields fresh states and no cooldowns"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+    client = GuardedRedis(InMemoryRedis(), breaker, "memory")
+    store = AlertStateStore()
+
+    async def refuse():
+        raise redis.ConnectionError("connection refused")
+
+    async def run():
+        with pytest.raises(redis.ConnectionError):
+            await breaker.call(refuse)
+        states = await store.load(client, [("u", HR)], {HR: 3})
+        await store.save(client, states)
+        return states, await store.cooling(client, [("u", "tachycardia")])
+
+    states, cooling = asyncio.run(run())
+    assert states[("u", HR)].count == 0
+    assert cooling == set()
+    assert store.failures == 3
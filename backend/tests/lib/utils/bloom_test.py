@@ -0,0 +1,71 @@
+"""Bloom Filter Tests"""
+
+import asyncio
+import uuid
+
+import pytest
+from lib.utils.redis_client import InMemoryRedis
+from lib.utils.bloom import BloomFilter
+from lib.utils.revocation import RevocationFilter
+
+
+def test_no_false_negatives():
+    """Every added item is reported as present"""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [str(uuid.uuid4()) for _ in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+
+
+def test_false_positive_rate_near_target():
+    """At capacity, unseen items hit at roughly the configured rate"""
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    for _ in range(2000):
+        bloom.add(str(uuid.uuid4()))
+
+    probes = 20000
+    false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(probes))
+
+    assert false_positives / probes < 0.03
+
+
+def test_memory_ceiling_caps_size():
+    """The bit array never exceeds max_bytes"""
+    bloom = BloomFilter(capacity=1_000_000, error_rate=0.0001, max_bytes=4096)
+
+    assert bloom.nbytes <= 4096
+
+
+def test_rejects_invalid_parameters():
+    """Capacity and error rate are validated"""
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=0)
+    with pytest.raises(ValueError):
+        BloomFilter(capacity=10, error_rate=1.5)
+
+
+def test_revocation_filter_syncs_from_sorted_set():
+    """Synced revocations are hits; unknown jtis skip the blacklist lookup"""
+    client = InMemoryRedis()
+    revocations = RevocationFilter(capacity=100, sync_seconds=60)
+
+    async def run():
+        pipe = client.pipeline()
+        RevocationFilter(capacity=100).record(pipe, "revoked-jti")
+        await pipe.execute()
+        return (
+            await revocations.might_be_revoked(client, "revoked-jti"),
+            await revocations.might_be_revoked(client, "live-jti"),
+        )
+
+    assert asyncio.run(run()) == (True, False)
+    assert revocations.stats()["syncs"] == 1
+
+
+def test_disabled_revocation_filter_falls_through():
+    """A disabled filter sends every jti to the Redis blacklist"""
+    revocations = RevocationFilter(capacity=100, enabled=False)
+
+    assert asyncio.run(revocations.might_be_revoked(InMemoryRedis(), "any-jti"))
@@ -0,0 +1,50 @@
+"""Daily Job Tests"""
+
+import asyncio
+from datetime import date, datetime, timezone
+
+from lib.utils.daily_job import DailyJob
+from lib.utils.redis_client import InMemoryRedis
+
+
+def test_one_run_per_day_across_workers():
+    """Only the first worker to claim a day runs the job"""
+    days = []
+
+    async def run(day):
+        days.append(day)
+        return {"updated": len(days)}
+
+    client = InMemoryRedis()
+    workers = [DailyJob("nightly", run), DailyJob("nightly", run)]
+
+    async def main():
+        for worker in workers:
+            await worker.run_once(client, date(2026, 10, 18))
+        await workers[1].run_once(client, date(2026, 10, 19))
+
+    asyncio.run(main())
+    assert days == [date(2026, 10, 18), date(2026, 10, 19)]
+    assert workers[0].stats()["runs"] == 1
+    assert workers[1].stats()["skipped"] == 1
+    assert workers[1].stats()["updated"] == 2
+
+
+def test_failed_runs_are_counted():
+    """A failing run is logged and counted, not raised"""
+
+    async def run(day):
+        raise RuntimeError("database unavailable")
+
+    job = DailyJob("nightly", run)
+    assert asyncio.run(job.run_once(InMemoryRedis())) is None
+    assert (job.stats()["runs"], job.stats()["failures"]) == (0, 1)
+
+
+def test_next_run_at_the_hour():
+    """Runs are due at the configured UTC hour, today or tomorrow"""
+    job = DailyJob("nightly", None, hour=2)
+    early = datetime(2026, 10, 18, 1, 30, tzinfo=timezone.utc)
+    late = datetime(2026, 10, 18, 2, 0, tzinfo=timezone.utc)
+    assert job.next_run_at(early) == datetime(2026, 10, 18, 2, tzinfo=timezone.utc)
+    assert job.next_run_at(late) == datetime(2026, 10, 19, 2, tzinfo=timezone.utc)
@@ -0,0 +1,47 @@
+"""Password Hasher Tests"""
+
+import asyncio
+import threading
+
+import pytest
+from lib.errorlib.auth import PasswordHasherBusyException
+from lib.utils.password_hasher import PasswordHasher
+from lib.utils.user import hash_password, verify_password
+
+
+def test_hash_and_verify_on_pool():
+    """Hashing on the pool round-trips with verification"""
+    hasher = PasswordHasher(workers=2, max_pending=4)
+
+    async def run():
+        hashed = await hasher.run(hash_password, "TestPassword1$")
+        return await hasher.run(verify_password, "TestPassword1$", hashed)
+
+    try:
+        assert asyncio.run(run()) is True
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_rejects_when_queue_is_full():
+    """Work beyond max_pending fails fast with a 503"""
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def run():
+        blocked = asyncio.ensure_future(hasher.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusyException) as exc_info:
+            await hasher.run(hash_password, "TestPassword1$")
+        release.set()
+        await blocked
+        return exc_info.value
+
+    try:
+        exc = asyncio.run(run())
+        assert exc.status_code == 503
+        assert hasher.rejected == 1
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
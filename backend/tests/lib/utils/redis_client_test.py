@@ -0,0 +1,76 @@
+"""Redis Client Tests"""
+
+import asyncio
+
+import pytest
+import redis
+from lib.utils.redis_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    GuardedRedis,
+    InMemoryRedis,
+)
+
+
+class _UnreachableRedis:
+    """Client whose every command fails like a dead server"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def exists(self, *names):
+        self.calls += 1
+        raise redis.ConnectionError("connection refused")
+
+
+def test_in_memory_backend_commands():
+    """The in-memory backend honours expiry, pipelines and sorted sets"""
+    client = InMemoryRedis()
+
+    async def run():
+        pipe = client.pipeline()
+        pipe.setex("jti", 60, "true")
+        pipe.zadd("revoked", {"a": 1, "b": 2, "c": 3})
+        await pipe.execute()
+        await client.set("gone", "1", ex=-1)
+        return (
+            await client.exists("jti", "gone"),
+            await client.zrangebyscore("revoked", "(1", "+inf"),
+            await client.zremrangebyscore("revoked", "-inf", 2),
+            await client.zcard("revoked"),
+        )
+
+    assert asyncio.run(run()) == (1, ["b", "c"], 2, 1)
+
+
+def test_circuit_opens_after_repeated_failures():
+    """Once open, calls fail fast without reaching Redis"""
+    backend = _UnreachableRedis()
+    client = GuardedRedis(backend, CircuitBreaker(failure_threshold=2), "redis")
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(redis.ConnectionError):
+                await client.exists("jti")
+        with pytest.raises(CircuitOpenError):
+            await client.exists("jti")
+
+    asyncio.run(run())
+    assert backend.calls == 2
+    assert client.stats()["breaker"]["state"] == "open"
+
+
+def test_circuit_closes_after_successful_trial():
+    """After the reset pause a successful call closes the circuit"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    client = GuardedRedis(_UnreachableRedis(), breaker, "redis")
+    healthy = GuardedRedis(InMemoryRedis(), breaker, "memory")
+
+    async def run():
+        with pytest.raises(redis.ConnectionError):
+            await client.exists("jti")
+        assert breaker.state == "half_open"
+        await healthy.exists("jti")
+
+    asyncio.run(run())
+    assert breaker.state == "closed"
@@ -0,0 +1,49 @@
+"""Rollup Tests"""
+
+from datetime import datetime, timedelta, timezone
+
+from lib.utils.enums import HealthMetric, RollupResolution
+from lib.utils.rollups import aggregate_readings, bucket_start, pick_resolution
+
+T0 = datetime(2026, 10, 18, 8, 59, 30, tzinfo=timezone.utc)
+
+
+def test_bucket_start_truncates_to_resolution():
+    """Buckets start on the minute, hour or day"""
+    assert bucket_start(T0, RollupResolution.MINUTE) == T0.replace(second=0)
+    assert bucket_start(T0, RollupResolution.HOUR) == T0.replace(minute=0, second=0)
+    assert bucket_start(T0, RollupResolution.DAY) == datetime(
+        2026, 10, 18, tzinfo=timezone.utc
+    )
+
+
+def test_aggregate_readings_per_bucket():
+    """Each reading counts once in each resolution's bucket"""
+    readings = [
+        {"user_id": "u", "metric": HealthMetric.HEART_RATE, "ts": ts, "value": value}
+        for ts, value in (
+            (T0, 70.0),
+            (T0 + timedelta(seconds=10), 90.0),
+            (T0 + timedelta(seconds=40), 60.0),
+        )
+    ]
+    rollups = {
+        (row["resolution"], row["bucket"]): row for row in aggregate_readings(readings)
+    }
+    # The last reading crosses into the next minute and the next hour
+    assert len(rollups) == 5
+
+    first_minute = rollups[(RollupResolution.MINUTE, T0.replace(second=0))]
+    assert (first_minute["count"], first_minute["sum"]) == (2, 160.0)
+    assert (first_minute["min"], first_minute["max"]) == (70.0, 90.0)
+
+    day = rollups[(RollupResolution.DAY, datetime(2026, 10, 18, tzinfo=timezone.utc))]
+    assert (day["count"], day["sum"], day["min"], day["max"]) == (3, 220.0, 60.0, 90.0)
+
+
+def test_pick_resolution_fits_point_budget():
+    """The finest resolution within max_points is used, else days"""
+    assert pick_resolution(T0, T0 + timedelta(hours=2), 500) is RollupResolution.MINUTE
+    assert pick_resolution(T0, T0 + timedelta(days=7), 500) is RollupResolution.HOUR
+    assert pick_resolution(T0, T0 + timedelta(days=90), 500) is RollupResolution.DAY
+    assert pick_resolution(T0, T0 + timedelta(days=900), 10) is RollupResolution.DAY
@@ -0,0 +1,84 @@
+"""Token Cache Tests"""
+
+import time
+
+from lib.utils.token_cache import TokenCache
+
+
+def _payload(jti: str = "jti-1", ttl: float = 60) -> dict:
+    return {"sub": "user-id", "jti": jti, "exp": time.time() + ttl}
+
+
+def test_hit_after_put():
+    """A cached token is returned without revalidation"""
+    cache = TokenCache(max_entries=10, revalidate_seconds=30)
+    payload = _payload()
+
+    assert cache.get("token") is None
+    cache.put("token", payload)
+
+    assert cache.get("token") == (payload, False)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_token_is_a_miss():
+    """Entries are dropped once the token's exp has passed"""
+    cache = TokenCache(max_entries=10)
+    cache.put("token", _payload(ttl=-1))
+
+    assert cache.get("token") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_is_evicted():
+    """The cache never grows past max_entries"""
+    cache = TokenCache(max_entries=2)
+    cache.put("a", _payload("a"))
+    cache.put("b", _payload("b"))
+    cache.get("a")
+    cache.put("c", _payload("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_local_revocation_is_honoured():
+    """A jti revoked in this process is rejected without a blacklist lookup"""
+    cache = TokenCache(max_entries=10)
+    payload = _payload()
+    cache.put("token", payload)
+
+    cache.revoke(payload["jti"], payload["exp"])
+
+    assert cache.is_revoked(payload["jti"])
+    assert cache.get("token") is None
+
+
+def test_stale_entry_needs_revalidation():
+    """Entries older than revalidate_seconds are flagged for a blacklist check"""
+    cache = TokenCache(max_entries=10, revalidate_seconds=0)
+    payload = _payload()
+    cache.put("token", payload)
+
+    assert cache.get("token") == (payload, True)
+
+
+def test_local_revocations_are_bounded():
+    """Past max_entries the revocation expiring soonest is forgotten"""
+    cache = TokenCache(max_entries=2)
+    now = time.time()
+    cache.revoke("expired", now - 1)
+    cache.revoke("late", now + 300)
+    cache.revoke("soon", now + 60)
+    # Revoking again with a later expiry outlives the earlier heap entry
+    cache.revoke("soon", now + 600)
+    cache.revoke("latest", now + 900)
+
+    assert cache.stats()["revoked_local"] == 2
+    assert not cache.is_revoked("expired")
+    assert not cache.is_revoked("late")
+    assert cache.is_revoked("soon")
+    assert cache.is_revoked("latest")
@@ -0,0 +1,77 @@
+"""Dashboard Utility Tests"""
+
+from datetime import date
+
+import numpy as np
+import pytest
+from lib.utils.enums import Unit
+from lib.utils.user_dashboard import (
+    calculate_age,
+    calculate_bmi,
+    next_birthday,
+    parse_date,
+    unit_converter,
+)
+
+
+def test_unit_converter_converts_columns():
+    """Whole columns convert between units of one quantity"""
+    np.testing.assert_allclose(
+        unit_converter([32, 98.6, 212], Unit.FAHRENHEIT, Unit.CELSIUS), [0, 37, 100]
+    )
+    np.testing.assert_allclose(
+        unit_converter([90, 180], Unit.MG_PER_DL, Unit.MMOL_PER_L), [5, 10]
+    )
+    np.testing.assert_allclose(
+        unit_converter([100], Unit.KILOGRAM, Unit.POUND), [220.462], rtol=1e-5
+    )
+    np.testing.assert_allclose(unit_converter([10], Unit.INCH, Unit.CENTIMETER), [25.4])
+    assert np.isnan(unit_converter([None], Unit.POUND, Unit.KILOGRAM)[0])
+    with pytest.raises(ValueError):
+        unit_converter([1], Unit.KILOGRAM, Unit.CENTIMETER)
+
+
+def test_calculate_bmi_per_row():
+    """BMI is kg/m2 to one decimal, NaN where inputs are missing"""
+    bmi = calculate_bmi([70, None, 80, 0], [175, 170, None, 160])
+    assert bmi[0] == 22.9
+    assert np.isnan(bmi[1:]).all()
+    assert calculate_bmi([154.3], [68.9], Unit.POUND, Unit.INCH)[0] == 22.9
+
+
+def test_parse_date_and_age():
+    """Ages count completed years, including leap day birthdays"""
+    dobs = ["2000-02-29", "1990-10-18", "1990-10-19", None, "not a date"]
+    parsed = parse_date(dobs)
+    assert parsed[0] == np.datetime64("2000-02-29")
+    assert np.isnat(parsed[3:]).all()
+
+    ages = calculate_age(dobs + [date(2030, 1, 1)], on=date(2026, 10, 18))
+    assert ages[:3].tolist() == [26, 36, 35]
+    assert np.isnan(ages[3:]).all()
+    assert calculate_age(["2000-02-29"], on=date(2025, 2, 28))[0] == 24
+    assert calculate_age(["2000-02-29"], on=date(2025, 3, 1))[0] == 25
+
+
+def test_next_birthday_is_when_age_changes():
+    """The next birthday is the first day after `on` that the age goes up"""
+    on = date(2026, 10, 18)
+    birthdays = next_birthday(
+        ["1990-10-18", "1990-10-19", "2000-02-29", "2030-01-01", None], on
+    )
+    assert birthdays.tolist() == [
+        date(2027, 10, 18),
+        date(2026, 10, 19),
+        date(2027, 3, 1),
+        date(2030, 1, 1),
+        None,
+    ]
+    for dob, birthday in zip(["1990-10-18", "2000-02-29"], birthdays[[0, 2]].tolist()):
+        before = birthday.toordinal() - 1
+        assert (
+            calculate_age([dob], birthday)
+            == calculate_age([dob], date.fromordinal(before)) + 1
+        )
+    assert next_birthday(["2000-02-29"], date(2028, 1, 1))[0] == np.datetime64(
+        "2028-02-29"
+    )
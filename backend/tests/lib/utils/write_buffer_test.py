@@ -0,0 +1,115 @@
+"""Write Buffer Tests"""
+
+import asyncio
+
+import pytest
+from lib.utils.write_buffer import BufferFullError, WriteBuffer
+
+
+class _Sink:
+    """Flush target recording each batch, optionally failing first"""
+
+    def __init__(self, failures: int = 0):
+        self.batches: list[list[dict]] = []
+        self.failures = failures
+
+    async def __call__(self, rows: list[dict]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(rows)
+
+
+class _PoisonSink:
+    """Flush target refusing every batch that holds the poison row"""
+
+    def __init__(self, poison: int):
+        self.rows: list[dict] = []
+        self.poison = poison
+
+    async def __call__(self, rows: list[dict]) -> None:
+        if any(row["n"] == self.poison for row in rows):
+            raise RuntimeError("foreign key violation")
+        self.rows.extend(rows)
+
+
+def _rows(count: int, start: int = 0) -> list[dict]:
+    return [{"n": i} for i in range(start, start + count)]
+
+
+def test_flushes_on_size_in_batches():
+    """A full batch wakes the flusher; rows go out flush_rows at a time"""
+    sink = _Sink()
+    buffer = WriteBuffer(sink, max_rows=100, flush_rows=10, flush_seconds=60)
+
+    async def run():
+        buffer.start()
+        buffer.add(_rows(25))
+        await asyncio.sleep(0.05)
+        await buffer.stop()
+
+    asyncio.run(run())
+    assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+    assert buffer.stats()["flushed"] == 25
+
+
+def test_flushes_on_age():
+    """A partial batch is written once its oldest row is flush_seconds old"""
+    sink = _Sink()
+    buffer = WriteBuffer(sink, max_rows=100, flush_rows=10, flush_seconds=0.05)
+
+    async def run():
+        buffer.start()
+        buffer.add(_rows(3))
+        await asyncio.sleep(0.2)
+        written = sum(len(batch) for batch in sink.batches)
+        await buffer.stop()
+        return written
+
+    assert asyncio.run(run()) == 3
+
+
+def test_rejects_rows_past_capacity():
+    """Rows that would overflow max_rows are refused, not queued"""
+    buffer = WriteBuffer(_Sink(), max_rows=10, flush_rows=100)
+    buffer.add(_rows(8))
+
+    with pytest.raises(BufferFullError):
+        buffer.add(_rows(3))
+    assert buffer.stats()["pending"] == 8
+    assert buffer.stats()["rejected"] == 3
+
+
+def test_failed_flush_is_retried_in_order():
+    """A failed batch goes back ahead of newer rows"""
+    sink = _Sink(failures=1)
+    buffer = WriteBuffer(sink, max_rows=100, flush_rows=10)
+
+    async def run():
+        buffer.add(_rows(5))
+        await buffer.flush()
+        buffer.add(_rows(2, start=5))
+        await buffer.flush()
+
+    asyncio.run(run())
+    assert buffer.stats()["flush_failures"] == 1
+    assert [row["n"] for row in sink.batches[0]] == list(range(7))
+
+
+def test_poison_row_is_dropped_after_max_attempts():
+    """A row that always fails is dropped alone; the rest of its batch is written"""
+    sink = _PoisonSink(poison=3)
+    buffer = WriteBuffer(sink, max_rows=100, flush_rows=10, max_attempts=2)
+
+    async def run():
+        buffer.add(_rows(10))
+        await buffer.flush()
+        assert buffer.stats()["pending"] == 10
+        await buffer.flush()
+        buffer.add(_rows(5, start=10))
+        await buffer.flush()
+
+    asyncio.run(run())
+    stats = buffer.stats()
+    assert sorted(row["n"] for row in sink.rows) == [n for n in range(15) if n != 3]
+    assert (stats["pending"], stats["flushed"], stats["dropped"]) == (0, 14, 1)